@@ -0,0 +1,83 @@
+"""Compare memory and traversal time of the JobGraph backends.
+
+Usage: python benchmarks/bench_graph_backends.py [--nodes N] [--width W]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from hashlib import sha256
+
+from hyrun.job.graph import JobGraph
+
+
+def gen_labels(n):
+    """Generate job-hash-like node labels."""
+    return [sha256(str(i).encode()).hexdigest() for i in range(n)]
+
+
+def build(backend, labels, width):
+    """Build layered workflow, each node depends on one of the layer above."""
+    g = JobGraph(backend=backend)
+    for i, label in enumerate(labels):
+        g.graph.add_node(label, hash=label, status=None, db_id=i)
+    for i in range(width, len(labels)):
+        g.graph.add_edge(labels[i - width], labels[i], weight=1.0)
+    return g
+
+
+def measure_memory(backend, labels, width):
+    """Measure memory of graph after build and a first traversal."""
+    gc.collect()
+    tracemalloc.start()
+    g = build(backend, labels, width)
+    g.descendants(labels[-1])
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del g
+    return memory
+
+
+def bench(backend, labels, width):
+    """Measure memory of the graph and time of some traversals."""
+    memory = measure_memory(backend, labels, width)
+    gc.collect()
+    t0 = time.perf_counter()
+    g = build(backend, labels, width)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    g.topological
+    t_topo = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for root in labels[:width]:
+        g.descendants(root)
+    t_desc = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    g.ready_nodes()
+    t_ready = time.perf_counter() - t0
+    return {'build [s]': t_build, 'memory [MB]': memory / 2**20,
+            'topological [s]': t_topo, 'descendants [s]': t_desc,
+            'ready_nodes [s]': t_ready}
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=100_000)
+    parser.add_argument('--width', type=int, default=100)
+    args = parser.parse_args()
+    labels = gen_labels(args.nodes)
+    print(f'{args.nodes} nodes, {args.nodes - args.width} edges')
+    results = {b: bench(b, labels, args.width)
+               for b in ('networkx', 'compact')}
+    print(f'{"":<18}' + ''.join(f'{b:>12}' for b in results))
+    for key in results['networkx']:
+        print(f'{key:<18}'
+              + ''.join(f'{r[key]:>12.3f}' for r in results.values()))
+
+
+if __name__ == '__main__':
+    main()
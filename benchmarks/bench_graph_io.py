@@ -0,0 +1,46 @@
+"""Compare size, write and read time of the JobGraph file formats.
+
+Usage: python benchmarks/bench_graph_io.py [--nodes N] [--width W]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_graph_backends import build, gen_labels
+
+from hyrun.job import get_workflow
+
+files = ['workflow.json', 'workflow.json.gz', 'workflow.jsonl',
+         'workflow.jsonl.gz', 'workflow.msgpack', 'workflow.msgpack.gz',
+         'workflow.msgpack.zst']
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=100_000)
+    parser.add_argument('--width', type=int, default=100)
+    args = parser.parse_args()
+    g = build('networkx', gen_labels(args.nodes), args.width)
+    print(f'{args.nodes} nodes, {args.nodes - args.width} edges')
+    print(f'{"":<22}{"size [MB]":>12}{"write [s]":>12}{"read [s]":>12}')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in files:
+            filename = Path(tmpdir) / name
+            try:
+                t0 = time.perf_counter()
+                g.write(filename)
+                t_write = time.perf_counter() - t0
+            except ImportError as e:
+                print(f'{name:<22}{str(e)}')
+                continue
+            t0 = time.perf_counter()
+            get_workflow(filename)
+            t_read = time.perf_counter() - t0
+            size = filename.stat().st_size / 2**20
+            print(f'{name:<22}{size:>12.2f}{t_write:>12.3f}{t_read:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
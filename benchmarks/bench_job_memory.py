@@ -0,0 +1,64 @@
+"""Compare memory and creation time of Job and CompactJob.
+
+Usage: python benchmarks/bench_job_memory.py [--jobs N] [--outputs]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from bench_graph_backends import gen_labels
+
+from hyrun.job import CompactJob, CompactOutput, Job, Output
+
+variants = {'Job': (Job, Output), 'CompactJob': (CompactJob, CompactOutput)}
+
+
+def build(variant, labels, outputs):
+    """Create one job per label as a sweep would."""
+    job_cls, output_cls = variants[variant]
+    jobs = []
+    for i, label in enumerate(labels):
+        # statuses parsed from scheduler output are distinct str objects
+        status = ''.join(['COMP', 'LETED'])
+        job = job_cls(job_id=i, hash=label, status=status)
+        if outputs:
+            job.outputs = [output_cls(returncode=0)]
+        jobs.append(job)
+    return jobs
+
+
+def bench(variant, labels, outputs):
+    """Measure memory and creation time of the jobs."""
+    gc.collect()
+    tracemalloc.start()
+    jobs = build(variant, labels, outputs)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    gc.collect()
+    t0 = time.perf_counter()
+    build(variant, labels, outputs)
+    t_build = time.perf_counter() - t0
+    return {'build [s]': t_build, 'memory [MB]': memory / 2**20,
+            'per job [B]': memory / len(labels)}
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--outputs', action='store_true',
+                        help='give every job one output')
+    args = parser.parse_args()
+    labels = gen_labels(args.jobs)
+    print(f'{args.jobs} jobs' + (' with one output' if args.outputs else ''))
+    results = {v: bench(v, labels, args.outputs) for v in variants}
+    print(f'{"":<14}' + ''.join(f'{v:>12}' for v in results))
+    for key in results['Job']:
+        print(f'{key:<14}'
+              + ''.join(f'{r[key]:>12.3f}' for r in results.values()))
+
+
+if __name__ == '__main__':
+    main()
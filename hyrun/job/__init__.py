@@ -1,9 +1,9 @@
 from .get_workflow import get_workflow
 from .graph import JobGraph
-from .job import Job, get_job
-from .output import Output
+from .job import CompactJob, Job, get_job
+from .output import CompactOutput, Output
 from .status import JobStatus, job_status_map
 
-__all__ = ['Job', 'get_job', 'Output',
+__all__ = ['Job', 'get_job', 'Output', 'CompactJob', 'CompactOutput',
            'JobGraph', 'get_workflow',
            'JobStatus', 'job_status_map']
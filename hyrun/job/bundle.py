@@ -0,0 +1,334 @@
+import json
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from .job import Job, get_job
+from .serialize import encode_content
+from .status import job_status_map
+
+signature_attr = ['scheduler', 'connection', 'database',
+                  'memory_per_cpu', 'cpus_per_task', 'ntasks']
+# ssh settings of a task, shared with SlurmScheduler
+ssh_kws = ['host', 'user', 'port', 'config', 'gateway', 'forward_agent',
+           'connect_timeout', 'connect_kwargs', 'inline_ssh_env']
+# attributes checked by check_common_dataclass and
+# SlurmScheduler.check_job_params
+group_attr = signature_attr + [
+    'slurm_account', 'submit_dir_remote', 'work_dir_remote'] + ssh_kws
+
+
+def task_signature(task, attrs: Iterable[str] = signature_attr) -> str:
+    """Get signature of the attributes `attrs` of a task.
+
+    Values are encoded like the content of a job hash, other objects by
+    their type and attributes. Objects without attributes and values with
+    circular references only match themselves.
+    """
+    values = [_task_value(task, attr) for attr in attrs]
+    try:
+        return json.dumps(values, sort_keys=True, default=_encode_signature)
+    except ValueError:
+        return json.dumps(values, sort_keys=True, default=_identity)
+
+
+def _encode_signature(obj: Any) -> Any:
+    """Encode object for `task_signature`."""
+    try:
+        return encode_content(obj)
+    except TypeError:
+        pass
+    if hasattr(obj, '__dict__'):
+        return [type(obj).__qualname__, vars(obj)]
+    return _identity(obj)
+
+
+def _identity(obj: Any) -> str:
+    """Encode object by its identity."""
+    return f'{type(obj).__qualname__}@{id(obj)}'
+
+
+def resource_signature(job) -> str:
+    """Get signature of the resources a job requests.
+
+    Jobs with the same signature run on the same scheduler, connection and
+    database with the same resources, account and remote directories, i.e.
+    their tasks pass `SlurmScheduler.check_job_params` in one job.
+    """
+    task = job.tasks[0] if getattr(job, 'tasks', None) else None
+    return task_signature(task, group_attr)
+
+
+def group_tasks(tasks: Iterable, max_tasks: int = 0,
+                max_time: Optional[float] = None) -> List[Job]:
+    """Group tasks into as few valid jobs as possible.
+
+    Tasks with the same signature of the `group_attr` share a job, in input
+    order. The tasks of a job run one after another, so groups are split
+    into jobs of at most `max_tasks` tasks (if given) whose summed
+    `job_time` stays within `max_time` seconds (if given). Tasks with
+    unknown `job_time` get a job of their own then. Grouped jobs keep the
+    number of tasks in `metadata['grouped']`.
+    """
+    groups: Dict[str, list] = {}
+    for task in tasks:
+        groups.setdefault(task_signature(task, group_attr), []).append(task)
+    jobs = []
+    for group in groups.values():
+        chunks: List[list] = []
+        load = 0.0
+        for task in group:
+            time = _task_time(task) if max_time is not None else 0.0
+            if (not chunks or time is None or load is None
+                    or len(chunks[-1]) == max_tasks
+                    or (max_time is not None and load + time > max_time)):
+                chunks.append([])
+                load = 0.0
+            chunks[-1].append(task)
+            load = None if time is None else load + time
+        jobs.extend(Job(tasks=chunk, metadata={'grouped': len(chunk)})
+                    for chunk in chunks)
+    return jobs
+
+
+def _task_value(task, attr: str) -> Any:
+    """Get attribute of a task given as dataclass or dict."""
+    return (task.get(attr) if isinstance(task, dict)
+            else getattr(task, attr, None))
+
+
+def node_job(attrs) -> Job:
+    """Get job of a JobGraph node from its attributes."""
+    job = attrs.get('job')
+    if job is not None:
+        return job
+    return get_job(dict(attrs))
+
+
+def job_time(job) -> Optional[float]:
+    """Get requested walltime of a job in seconds, None if unknown.
+
+    Tasks of a job run one after another, their `job_time` adds up.
+    """
+    total = 0.0
+    for task in getattr(job, 'tasks', None) or []:
+        value = _task_time(task)
+        if value is None:
+            return None
+        total += value
+    return total
+
+
+def _task_time(task) -> Optional[float]:
+    """Get requested walltime of a task in seconds, None if unknown."""
+    value = _task_value(task, 'job_time')
+    if value is None:
+        return None
+    return (value.total_seconds() if isinstance(value, timedelta)
+            else float(value))
+
+
+def _fusable_requirements(graph) -> bool:
+    """Check if run requirements are `status == 'COMPLETED'`.
+
+    Tasks in a job script run one after another and stop at the first
+    failure, which is only equivalent to this requirement.
+    """
+    requirements = list(graph._requirements)
+    return (len(requirements) == 1 and requirements[0].element == 'node'
+            and requirements[0].prop == 'status'
+            and requirements[0].op == '=='
+            and requirements[0].value == 'COMPLETED')
+
+
+def find_chains(graph,
+                signature: Callable[[Any], Any] = resource_signature,
+                min_length: int = 2) -> List[list]:
+    """Find maximal linear chains of fusable nodes in a JobGraph.
+
+    Consecutive nodes u -> v belong to a chain if u has no other
+    successor, v has no other predecessor, neither has started and both
+    jobs have the same `signature`.
+    """
+    g = graph.graph
+    graph_nodes = g.nodes
+    signatures: Dict[Any, Any] = {}
+
+    def fusable(n) -> bool:
+        attrs = graph_nodes[n]
+        if job_status_map.get(attrs.get('status'), 0) != 0:
+            return False
+        if n not in signatures:
+            job = node_job(attrs)
+            signatures[n] = signature(job) if job.tasks else None
+        return signatures[n] is not None
+
+    def linked(u, v) -> bool:
+        return (g.out_degree(u) == 1 and g.in_degree(v) == 1
+                and fusable(u) and fusable(v)
+                and signatures[u] == signatures[v])
+
+    chains = []
+    for node in graph.topological:
+        preds = list(g.predecessors(node))
+        if len(preds) == 1 and linked(preds[0], node):
+            continue
+        chain = [node]
+        while g.out_degree(chain[-1]) == 1:
+            v = next(iter(g.successors(chain[-1])))
+            if not linked(chain[-1], v):
+                break
+            chain.append(v)
+        if len(chain) >= min_length:
+            chains.append(chain)
+    return chains
+
+
+def fuse_chains(graph,
+                signature: Callable[[Any], Any] = resource_signature,
+                min_length: int = 2) -> Dict[Any, list]:
+    """Fuse linear chains of a JobGraph into single multi-task jobs.
+
+    Every chain found by `find_chains` is replaced in place by one node
+    holding a Job with the tasks of the chain in order. This saves one
+    queue wait and one file transfer per fused edge. The fused job keeps
+    the original nodes in `metadata['fused']`.
+
+    Returns
+    -------
+    dict
+        Mapping from fused node to the nodes it replaces.
+
+    """
+    if not _fusable_requirements(graph):
+        graph.logger.debug('Run requirements do not allow chain fusion')
+        return {}
+    g = graph.graph
+    fused = {}
+    for chain in find_chains(graph, signature, min_length):
+        jobs = [node_job(g.nodes[n]) for n in chain]
+        try:
+            job = Job(tasks=[t for j in jobs for t in j.tasks],
+                      metadata={'fused': list(chain)})
+        except ValueError as e:
+            graph.logger.debug(f'Can not fuse chain {chain}: {e}')
+            continue
+        fused[_replace(graph, chain, chain[:1], chain[-1:], job)] = chain
+    graph.logger.debug(f'Fused {len(fused)} chains')
+    return fused
+
+
+def _replace(graph, nodes: list, sources: list, sinks: list, job) -> Any:
+    """Replace nodes of a JobGraph by a node holding job.
+
+    The new node takes over the incoming edges of `sources` and the
+    outgoing edges of `sinks`.
+    """
+    g = graph.graph
+    replaced = set(nodes)
+    in_edges = {u: dict(g.edges[u, n]) for n in sources
+                for u in g.predecessors(n) if u not in replaced}
+    out_edges = {v: dict(g.edges[n, v]) for n in sinks
+                 for v in g.successors(n) if v not in replaced}
+    for n in nodes:
+        graph.remove_node(n)
+    node = graph.add_nodes_from([job])[0]
+    graph.add_edges_from(
+        [(u, node, attrs) for u, attrs in in_edges.items()]
+        + [(node, v, attrs) for v, attrs in out_edges.items()])
+    return node
+
+
+def pack_nodes(graph,
+               nodes: Optional[Iterable] = None,
+               target_time: float = 3600.0,
+               runtimes: Optional[Mapping[Any, float]] = None,
+               signature: Callable[[Any], Any] = resource_signature,
+               ) -> Dict[Any, list]:
+    """Bin-pack independent nodes of a JobGraph into multi-task jobs.
+
+    Nodes are grouped by `signature` and packed first-fit decreasing into
+    jobs whose summed runtime stays within `target_time` seconds, so that
+    many short tasks share one queue wait. Runtimes come from `runtimes`
+    (e.g. measured in earlier runs, keyed by node) or else from the
+    `job_time` of the tasks. Nodes with unknown runtime or longer than
+    `target_time` are left alone. Packed jobs keep the original nodes in
+    `metadata['packed']`.
+
+    Parameters
+    ----------
+    nodes : iterable, optional
+        Nodes that do not depend on each other, defaults to the ready
+        nodes of the graph.
+
+    Returns
+    -------
+    dict
+        Mapping from packed node to the nodes it replaces.
+
+    Raises
+    ------
+    ValueError
+        If a node to pack depends on another one, before the graph is
+        changed.
+
+    """
+    if not _fusable_requirements(graph):
+        graph.logger.debug('Run requirements do not allow packing')
+        return {}
+    g = graph.graph
+    runtimes = runtimes or {}
+    groups: Dict[Any, list] = {}
+    for n in (graph.ready_nodes() if nodes is None else nodes):
+        job = node_job(g.nodes[n])
+        if not job.tasks:
+            continue
+        time = runtimes.get(n)
+        time = job_time(job) if time is None else time
+        if time is None or time > target_time:
+            continue
+        groups.setdefault(signature(job), []).append((time, n, job))
+    if not _independent(g, [n for items in groups.values()
+                            for _, n, _ in items]):
+        raise ValueError('Nodes to pack depend on each other')
+    packed = {}
+    for items in groups.values():
+        bins: List[list] = []
+        loads: List[float] = []
+        for time, n, job in sorted(items, key=lambda item: -item[0]):
+            for i, load in enumerate(loads):
+                if load + time <= target_time:
+                    bins[i].append((n, job))
+                    loads[i] += time
+                    break
+            else:
+                bins.append([(n, job)])
+                loads.append(time)
+        for members in bins:
+            if len(members) < 2:
+                continue
+            chunk = [n for n, _ in members]
+            try:
+                job = Job(tasks=[t for _, j in members for t in j.tasks],
+                          metadata={'packed': chunk})
+            except ValueError as e:
+                graph.logger.debug(f'Can not pack nodes {chunk}: {e}')
+                continue
+            packed[_replace(graph, chunk, chunk, chunk, job)] = chunk
+    graph.logger.debug(f'Packed {sum(map(len, packed.values()))} nodes '
+                       f'into {len(packed)} jobs')
+    return packed
+
+
+def _independent(g, nodes: Iterable) -> bool:
+    """Check if none of `nodes` is a descendant of another one."""
+    nodes = set(nodes)
+    stack = [v for n in nodes for v in g.successors(n)]
+    seen = set()
+    while stack:
+        v = stack.pop()
+        if v in nodes:
+            return False
+        if v not in seen:
+            seen.add(v)
+            stack.extend(g.successors(v))
+    return True
@@ -0,0 +1,765 @@
+"""Array-backed graph backend of JobGraph.
+
+Provides `DiGraph` and the graph algorithms used by JobGraph under the same
+names as networkx, so that this module can be used in place of `networkx`.
+"""
+from array import array
+from collections import deque
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional
+
+import networkx as nx
+
+_MISSING = object()
+_REMOVED = object()
+# traversals rebuild the CSR arrays once the edges added since the last
+# build exceed this fraction of all edges
+_pending_fraction = 0.25
+_pending_min = 1024
+
+
+class _Attributes(MutableMapping):
+    """Attribute dictionary of a single node or edge."""
+
+    __slots__ = ('_graph', '_columns', '_index')
+
+    def __init__(self, graph, columns: Dict[str, list], index: int):
+        """Initialize."""
+        self._graph = graph
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        """Get attribute."""
+        column = self._columns.get(key)
+        value = _MISSING if column is None else column[self._index]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        """Get attribute with default."""
+        column = self._columns.get(key)
+        if column is None:
+            return default
+        value = column[self._index]
+        return default if value is _MISSING else value
+
+    def __setitem__(self, key, value):
+        """Set attribute."""
+        column = self._columns.get(key)
+        if column is None:
+            column = self._graph._new_column(self._columns)
+            self._columns[key] = column
+        column[self._index] = value
+        self._graph._version += 1
+
+    def __delitem__(self, key):
+        """Delete attribute."""
+        self[key]
+        self._columns[key][self._index] = _MISSING
+        self._graph._version += 1
+
+    def __contains__(self, key) -> bool:
+        """Check if attribute is set."""
+        column = self._columns.get(key)
+        return column is not None and column[self._index] is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over attribute names."""
+        return (k for k, column in self._columns.items()
+                if column[self._index] is not _MISSING)
+
+    def __len__(self) -> int:
+        """Get number of attributes."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return repr(dict(self))
+
+
+class _NodeView(Mapping):
+    """View of the nodes of a :class:`CompactDiGraph`."""
+
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        """Initialize."""
+        self._graph = graph
+
+    def __getitem__(self, node) -> _Attributes:
+        """Get node attributes."""
+        g = self._graph
+        return _Attributes(g, g._node_columns, g._node_id(node))
+
+    def __iter__(self):
+        """Iterate over nodes."""
+        return (n for n in self._graph._labels if n is not _REMOVED)
+
+    def __len__(self) -> int:
+        """Get number of nodes."""
+        return len(self._graph._ids)
+
+    def __contains__(self, node) -> bool:
+        """Check if node is in graph."""
+        try:
+            return node in self._graph._ids
+        except TypeError:
+            return False
+
+    def __call__(self, data=False, default=None):
+        """Get nodes, optionally with data."""
+        return self if data is False else self.data(data, default)
+
+    def data(self, data=True, default=None):
+        """Iterate over nodes with (some of) their attributes."""
+        for n in self:
+            attrs = self[n]
+            yield (n, dict(attrs) if data is True
+                   else attrs.get(data, default))
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return f'NodeView({tuple(self)})'
+
+
+class _EdgeView(Mapping):
+    """View of the edges of a :class:`CompactDiGraph`."""
+
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        """Initialize."""
+        self._graph = graph
+
+    def __getitem__(self, edge) -> _Attributes:
+        """Get edge attributes."""
+        u, v = edge
+        g = self._graph
+        eid = g._edge_id(u, v)
+        if eid is None:
+            raise KeyError(f'The edge {u}-{v} is not in the graph.')
+        return _Attributes(g, g._edge_columns, eid)
+
+    def __iter__(self):
+        """Iterate over edges ordered by source node."""
+        g = self._graph
+        g._maybe_build_csr()
+        labels, dst = g._labels, g._dst
+        for i, u in enumerate(labels):
+            if u is _REMOVED:
+                continue
+            for eid in g._out_eids(i):
+                yield (u, labels[dst[eid]])
+
+    def __len__(self) -> int:
+        """Get number of edges."""
+        return self._graph._n_edges
+
+    def __contains__(self, edge) -> bool:
+        """Check if edge is in graph."""
+        try:
+            u, v = edge
+            return self._graph._edge_id(u, v) is not None
+        except (TypeError, ValueError):
+            return False
+
+    def __call__(self, data=False, default=None):
+        """Get edges, optionally with data."""
+        return self if data is False else self.data(data, default)
+
+    def data(self, data=True, default=None):
+        """Iterate over edges with (some of) their attributes."""
+        for u, v in self:
+            attrs = self[u, v]
+            yield (u, v, dict(attrs) if data is True
+                   else attrs.get(data, default))
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return f'EdgeView({list(self)})'
+
+
+class _AdjacencyView(Mapping):
+    """Mapping node -> {neighbor: edge attributes} (`succ` or `pred`)."""
+
+    __slots__ = ('_graph', '_incoming')
+
+    def __init__(self, graph, incoming: bool):
+        """Initialize."""
+        self._graph = graph
+        self._incoming = incoming
+
+    def __getitem__(self, node) -> '_Neighbors':
+        """Get neighbors of node."""
+        return _Neighbors(self._graph, self._graph._node_id(node),
+                          self._incoming)
+
+    def __iter__(self):
+        """Iterate over nodes."""
+        return iter(self._graph.nodes)
+
+    def __len__(self) -> int:
+        """Get number of nodes."""
+        return len(self._graph.nodes)
+
+
+class _Neighbors(Mapping):
+    """Mapping neighbor -> edge attributes of a single node."""
+
+    __slots__ = ('_graph', '_id', '_incoming')
+
+    def __init__(self, graph, node_id: int, incoming: bool):
+        """Initialize."""
+        self._graph = graph
+        self._id = node_id
+        self._incoming = incoming
+
+    def _eids(self):
+        g = self._graph
+        g._maybe_build_csr()
+        return (g._in_eids(self._id) if self._incoming
+                else g._out_eids(self._id))
+
+    def _neighbor(self, eid: int):
+        g = self._graph
+        return g._labels[(g._src if self._incoming else g._dst)[eid]]
+
+    def __getitem__(self, node) -> _Attributes:
+        """Get attributes of edge to/from neighbor."""
+        for eid in self._eids():
+            if self._neighbor(eid) == node:
+                return _Attributes(self._graph, self._graph._edge_columns,
+                                   eid)
+        raise KeyError(node)
+
+    def __iter__(self):
+        """Iterate over neighbors."""
+        return (self._neighbor(eid) for eid in self._eids())
+
+    def __len__(self) -> int:
+        """Get number of neighbors."""
+        return sum(1 for _ in self._eids())
+
+    def items(self):
+        """Iterate over neighbors and edge attributes."""
+        g = self._graph
+        return ((self._neighbor(eid), _Attributes(g, g._edge_columns, eid))
+                for eid in self._eids())
+
+    def values(self):
+        """Iterate over edge attributes."""
+        g = self._graph
+        return (_Attributes(g, g._edge_columns, eid) for eid in self._eids())
+
+
+class CompactDiGraph:
+    """Directed graph with integer node ids and CSR adjacency arrays.
+
+    Mimics the subset of the `networkx.DiGraph` API used by JobGraph. Nodes
+    are mapped to integer ids, adjacency is stored in CSR (compressed sparse
+    row) arrays and attributes are stored column-wise, i.e. one list per
+    attribute name instead of one dict per node and edge. Edges added after
+    the last CSR build are kept in small pending lists until the next build.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self._ids: Dict[Hashable, int] = {}
+        self._labels: list = []
+        self._node_columns: Dict[str, list] = {}
+        self._src = array('i')
+        self._dst = array('i')
+        self._alive = bytearray()
+        self._edge_columns: Dict[str, list] = {}
+        self._n_edges = 0
+        self._version = 0
+        self._nx_cache: Optional[tuple] = None
+        self._reset_csr()
+
+    def _reset_csr(self):
+        """Drop CSR arrays, all edges are kept as pending."""
+        self._csr_nodes = 0
+        self._out_ptr = array('i', [0])
+        self._out_idx = array('i')
+        self._in_ptr = array('i', [0])
+        self._in_idx = array('i')
+        self._pending_out: Dict[int, list] = {}
+        self._pending_in: Dict[int, list] = {}
+        self._n_pending = 0
+
+    def _add_pending(self, eid: int):
+        self._pending_out.setdefault(self._src[eid], []).append(eid)
+        self._pending_in.setdefault(self._dst[eid], []).append(eid)
+        self._n_pending += 1
+
+    def _build_csr(self):
+        """Merge pending edges into the CSR arrays."""
+        n = len(self._labels)
+        out_ptr, out_idx = self._csr(self._src, n)
+        in_ptr, in_idx = self._csr(self._dst, n)
+        self._csr_nodes = n
+        self._out_ptr, self._out_idx = out_ptr, out_idx
+        self._in_ptr, self._in_idx = in_ptr, in_idx
+        self._pending_out, self._pending_in = {}, {}
+        self._n_pending = 0
+
+    def _csr(self, keys: array, n: int):
+        """Sort alive edge ids by key node with a counting sort."""
+        alive = self._alive
+        ptr = array('i', [0]) * (n + 1)
+        for eid, key in enumerate(keys):
+            if alive[eid]:
+                ptr[key + 1] += 1
+        for i in range(n):
+            ptr[i + 1] += ptr[i]
+        fill = array('i', ptr)
+        idx = array('i', [0]) * ptr[n]
+        for eid, key in enumerate(keys):
+            if alive[eid]:
+                idx[fill[key]] = eid
+                fill[key] += 1
+        return ptr, idx
+
+    def _maybe_build_csr(self):
+        limit = max(_pending_min, _pending_fraction * self._n_edges)
+        if self._n_pending > limit:
+            self._build_csr()
+
+    def _out_eids(self, i: int) -> Iterator[int]:
+        """Iterate over ids of alive edges leaving node id `i`."""
+        alive = self._alive
+        if i < self._csr_nodes:
+            for eid in self._out_idx[self._out_ptr[i]:self._out_ptr[i + 1]]:
+                if alive[eid]:
+                    yield eid
+        for eid in self._pending_out.get(i, ()):
+            if alive[eid]:
+                yield eid
+
+    def _in_eids(self, i: int) -> Iterator[int]:
+        """Iterate over ids of alive edges entering node id `i`."""
+        alive = self._alive
+        if i < self._csr_nodes:
+            for eid in self._in_idx[self._in_ptr[i]:self._in_ptr[i + 1]]:
+                if alive[eid]:
+                    yield eid
+        for eid in self._pending_in.get(i, ()):
+            if alive[eid]:
+                yield eid
+
+    def _degree(self, i: int, incoming: bool) -> int:
+        """Get upper bound of degree (dead edges included) of node id."""
+        ptr, pending = ((self._in_ptr, self._pending_in) if incoming
+                        else (self._out_ptr, self._pending_out))
+        d = ptr[i + 1] - ptr[i] if i < self._csr_nodes else 0
+        return d + len(pending.get(i, ()))
+
+    def _node_id(self, node) -> int:
+        try:
+            return self._ids[node]
+        except KeyError:
+            raise KeyError(f'The node {node} is not in the digraph.')
+
+    def _edge_id(self, u, v) -> Optional[int]:
+        """Get id of edge u -> v by scanning the shorter adjacency list."""
+        i, j = self._ids.get(u), self._ids.get(v)
+        if i is None or j is None:
+            return None
+        if self._degree(i, False) <= self._degree(j, True):
+            dst = self._dst
+            return next((eid for eid in self._out_eids(i) if dst[eid] == j),
+                        None)
+        src = self._src
+        return next((eid for eid in self._in_eids(j) if src[eid] == i), None)
+
+    def _new_column(self, columns: Dict[str, list]) -> list:
+        size = (len(self._labels) if columns is self._node_columns
+                else len(self._alive))
+        return [_MISSING] * size
+
+    @staticmethod
+    def _set_attrs(columns: Dict[str, list], index: int, size: int,
+                   attrs: dict):
+        for key, value in attrs.items():
+            column = columns.get(key)
+            if column is None:
+                column = [_MISSING] * size
+                columns[key] = column
+            column[index] = value
+
+    @property
+    def nodes(self) -> _NodeView:
+        """Get node view."""
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        """Get edge view."""
+        return _EdgeView(self)
+
+    @property
+    def succ(self) -> _AdjacencyView:
+        """Get successor adjacency."""
+        return _AdjacencyView(self, incoming=False)
+
+    @property
+    def pred(self) -> _AdjacencyView:
+        """Get predecessor adjacency."""
+        return _AdjacencyView(self, incoming=True)
+
+    adj = succ
+
+    def add_node(self, node, **attr):
+        """Add node or update its attributes."""
+        self._add_node(node, attr)
+
+    def _add_node(self, node, attr: dict):
+        i = self._ids.get(node)
+        if i is None:
+            i = len(self._labels)
+            self._ids[node] = i
+            self._labels.append(node)
+            for column in self._node_columns.values():
+                column.append(_MISSING)
+        self._set_attrs(self._node_columns, i, len(self._labels), attr)
+        self._version += 1
+
+    def add_nodes_from(self, nodes: Iterable, **attr):
+        """Add nodes given as labels or (label, attributes) tuples."""
+        add_node = self._add_node
+        for n in nodes:
+            if (isinstance(n, (tuple, list)) and len(n) == 2
+                    and isinstance(n[1], dict)):
+                add_node(n[0], {**attr, **n[1]} if attr else n[1])
+            else:
+                add_node(n, attr)
+
+    def add_edge(self, u, v, **attr):
+        """Add edge (and missing nodes) or update edge attributes."""
+        self._add_edge(u, v, attr)
+
+    def _add_edge(self, u, v, attr: dict):
+        for n in (u, v):
+            if n not in self._ids:
+                self._add_node(n, {})
+        eid = self._edge_id(u, v)
+        if eid is None:
+            eid = len(self._alive)
+            self._src.append(self._ids[u])
+            self._dst.append(self._ids[v])
+            self._alive.append(1)
+            for column in self._edge_columns.values():
+                column.append(_MISSING)
+            self._add_pending(eid)
+            self._n_edges += 1
+        self._set_attrs(self._edge_columns, eid, len(self._alive), attr)
+        self._version += 1
+
+    def add_edges_from(self, edges: Iterable, **attr):
+        """Add edges given as (u, v) or (u, v, attributes) tuples."""
+        add_edge = self._add_edge
+        for e in edges:
+            add_edge(e[0], e[1], {**attr, **e[2]} if len(e) > 2 else attr)
+
+    def remove_node(self, node):
+        """Remove node and its edges."""
+        i = self._ids.pop(node, None)
+        if i is None:
+            raise nx.NetworkXError(f'The node {node} is not in the digraph.')
+        self._maybe_build_csr()
+        for eid in list(self._out_eids(i)) + list(self._in_eids(i)):
+            self._kill_edge(eid)
+        self._labels[i] = _REMOVED
+        for column in self._node_columns.values():
+            column[i] = _MISSING
+        self._version += 1
+
+    def remove_edge(self, u, v):
+        """Remove edge."""
+        eid = self._edge_id(u, v)
+        if eid is None:
+            raise nx.NetworkXError(f'The edge {u}-{v} not in graph.')
+        self._kill_edge(eid)
+        self._version += 1
+
+    def _kill_edge(self, eid: int):
+        if not self._alive[eid]:
+            return
+        self._alive[eid] = 0
+        for column in self._edge_columns.values():
+            column[eid] = _MISSING
+        self._n_edges -= 1
+
+    def has_node(self, node) -> bool:
+        """Check if node is in graph."""
+        return node in self.nodes
+
+    def has_edge(self, u, v) -> bool:
+        """Check if edge is in graph."""
+        return self._edge_id(u, v) is not None
+
+    def successors(self, node) -> Iterator:
+        """Iterate over direct successors of node."""
+        i = self._node_id(node)
+        self._maybe_build_csr()
+        labels, dst = self._labels, self._dst
+        return (labels[dst[eid]] for eid in self._out_eids(i))
+
+    def predecessors(self, node) -> Iterator:
+        """Iterate over direct predecessors of node."""
+        i = self._node_id(node)
+        self._maybe_build_csr()
+        labels, src = self._labels, self._src
+        return (labels[src[eid]] for eid in self._in_eids(i))
+
+    neighbors = successors
+
+    def out_edges(self, node) -> list:
+        """Get edges leaving node."""
+        return [(node, v) for v in self.successors(node)]
+
+    def in_edges(self, node) -> list:
+        """Get edges entering node."""
+        return [(u, node) for u in self.predecessors(node)]
+
+    def in_degree(self, node) -> int:
+        """Get number of predecessors."""
+        return sum(1 for _ in self._in_eids(self._node_id(node)))
+
+    def out_degree(self, node) -> int:
+        """Get number of successors."""
+        return sum(1 for _ in self._out_eids(self._node_id(node)))
+
+    def number_of_nodes(self) -> int:
+        """Get number of nodes."""
+        return len(self._ids)
+
+    def number_of_edges(self) -> int:
+        """Get number of edges."""
+        return self._n_edges
+
+    def is_directed(self) -> bool:
+        """Graph is directed."""
+        return True
+
+    def __len__(self) -> int:
+        """Get number of nodes."""
+        return len(self._ids)
+
+    def __iter__(self):
+        """Iterate over nodes."""
+        return iter(self.nodes)
+
+    def __contains__(self, node) -> bool:
+        """Check if node is in graph."""
+        return node in self.nodes
+
+    def compact(self):
+        """Drop removed nodes and edges and rebuild the CSR arrays.
+
+        Node and edge ids are renumbered, views obtained before are invalid.
+        """
+        g = self.subgraph(self.nodes)
+        self.__dict__.update(g.__dict__)
+        self._build_csr()
+
+    def copy(self) -> 'CompactDiGraph':
+        """Copy graph, attribute values are not copied."""
+        g = CompactDiGraph.__new__(CompactDiGraph)
+        g.__dict__.update(self.__dict__)
+        g._ids = dict(self._ids)
+        g._labels = list(self._labels)
+        g._node_columns = {k: list(c) for k, c in self._node_columns.items()}
+        g._edge_columns = {k: list(c) for k, c in self._edge_columns.items()}
+        for attr in ('_src', '_dst', '_out_ptr', '_out_idx', '_in_ptr',
+                     '_in_idx'):
+            setattr(g, attr, array('i', getattr(self, attr)))
+        g._alive = bytearray(self._alive)
+        g._pending_out = {k: list(v) for k, v in self._pending_out.items()}
+        g._pending_in = {k: list(v) for k, v in self._pending_in.items()}
+        g._nx_cache = None
+        return g
+
+    def subgraph(self, nodes: Iterable) -> 'CompactDiGraph':
+        """Get new graph induced by `nodes`."""
+        keep = {self._ids[n] for n in nodes if n in self._ids}
+        g = CompactDiGraph()
+        columns = self._node_columns
+        for i in sorted(keep):
+            g.add_node(self._labels[i],
+                       **{k: c[i] for k, c in columns.items()
+                          if c[i] is not _MISSING})
+        columns = self._edge_columns
+        for eid, alive in enumerate(self._alive):
+            if (alive and self._src[eid] in keep and self._dst[eid] in keep):
+                g._append_edge(self._labels[self._src[eid]],
+                               self._labels[self._dst[eid]],
+                               {k: c[eid] for k, c in columns.items()
+                                if c[eid] is not _MISSING})
+        g._build_csr()
+        return g
+
+    def _append_edge(self, u, v, attrs: dict):
+        """Append edge known not to exist yet, skipping the lookup."""
+        eid = len(self._alive)
+        self._src.append(self._ids[u])
+        self._dst.append(self._ids[v])
+        self._alive.append(1)
+        for column in self._edge_columns.values():
+            column.append(_MISSING)
+        self._set_attrs(self._edge_columns, eid, eid + 1, attrs)
+        self._add_pending(eid)
+        self._n_edges += 1
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Get networkx view of graph, cached until the next change."""
+        if self._nx_cache and self._nx_cache[0] == self._version:
+            return self._nx_cache[1]
+        g = nx.DiGraph()
+        g.add_nodes_from(self.nodes(data=True))
+        g.add_edges_from(self.edges(data=True))
+        self._nx_cache = (self._version, g)
+        return g
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return (f'{self.__class__.__name__}(nodes={len(self)}, '
+                f'edges={self._n_edges})')
+
+
+DiGraph = CompactDiGraph
+
+
+def from_networkx(graph: nx.DiGraph) -> CompactDiGraph:
+    """Convert networkx graph to compact graph."""
+    g = CompactDiGraph()
+    for n, attrs in graph.nodes(data=True):
+        g.add_node(n, **attrs)
+    for u, v, attrs in graph.edges(data=True):
+        g._append_edge(u, v, attrs)
+    g._build_csr()
+    return g
+
+
+def _traverse(G: CompactDiGraph, source, incoming: bool) -> set:
+    """Collect all nodes reachable from source."""
+    start = G._node_id(source)
+    G._maybe_build_csr()
+    ends = G._src if incoming else G._dst
+    eids = G._in_eids if incoming else G._out_eids
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        i = queue.popleft()
+        for eid in eids(i):
+            j = ends[eid]
+            if j not in seen:
+                seen.add(j)
+                queue.append(j)
+    seen.discard(start)
+    labels = G._labels
+    return {labels[i] for i in seen}
+
+
+def ancestors(G: CompactDiGraph, source) -> set:
+    """Get all nodes having a path to source."""
+    if source not in G:
+        raise nx.NetworkXError(f'The node {source} is not in the digraph.')
+    return _traverse(G, source, incoming=True)
+
+
+def descendants(G: CompactDiGraph, source) -> set:
+    """Get all nodes reachable from source."""
+    if source not in G:
+        raise nx.NetworkXError(f'The node {source} is not in the digraph.')
+    return _traverse(G, source, incoming=False)
+
+
+def topological_generations(G: CompactDiGraph) -> Iterator[list]:
+    """Iterate over generations (layers) of a directed acyclic graph."""
+    G._build_csr()
+    labels, dst, alive = G._labels, G._dst, G._alive
+    ptr, idx = G._out_ptr, G._out_idx
+    indegree = array('i', G._in_ptr)
+    indegree = array('i', (indegree[i + 1] - indegree[i]
+                           for i in range(len(labels))))
+    layer = [i for i, n in enumerate(labels)
+             if n is not _REMOVED and indegree[i] == 0]
+    seen = 0
+    while layer:
+        yield [labels[i] for i in layer]
+        seen += len(layer)
+        next_layer = []
+        for i in layer:
+            for eid in idx[ptr[i]:ptr[i + 1]]:
+                if not alive[eid]:
+                    continue
+                j = dst[eid]
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    next_layer.append(j)
+        layer = next_layer
+    if seen != len(G):
+        raise nx.NetworkXUnfeasible('Graph contains a cycle.')
+
+
+def topological_sort(G: CompactDiGraph) -> Iterator:
+    """Iterate over nodes in topological order."""
+    for generation in topological_generations(G):
+        yield from generation
+
+
+def relabel_nodes(G: CompactDiGraph, mapping: Any) -> CompactDiGraph:
+    """Get copy of graph with relabeled nodes."""
+    get = mapping if callable(mapping) else (lambda n: mapping.get(n, n))
+    g = G.copy()
+    g._labels = [n if n is _REMOVED else get(n) for n in G._labels]
+    g._ids = {n: i for i, n in enumerate(g._labels) if n is not _REMOVED}
+    if len(g._ids) != len(G._ids):
+        return from_networkx(nx.relabel_nodes(G.to_networkx(), mapping))
+    return g
+
+
+def subgraph_view(G: CompactDiGraph,
+                  filter_node: Optional[Callable] = None,
+                  filter_edge: Optional[Callable] = None) -> CompactDiGraph:
+    """Get graph with nodes and edges passing the filters."""
+    g = G.subgraph(n for n in G.nodes
+                   if filter_node is None or filter_node(n))
+    if filter_edge is not None:
+        for u, v in list(g.edges):
+            if not filter_edge(u, v):
+                g.remove_edge(u, v)
+    return g
+
+
+def compose(G: CompactDiGraph, H: CompactDiGraph) -> CompactDiGraph:
+    """Get union of two graphs, attributes of H take precedence."""
+    g = G.copy()
+    for n, attrs in H.nodes(data=True):
+        g.add_node(n, **attrs)
+    for u, v, attrs in H.edges(data=True):
+        g.add_edge(u, v, **attrs)
+    return g
+
+
+def difference(G: CompactDiGraph, H: CompactDiGraph) -> CompactDiGraph:
+    """Get graph with the nodes of G and the edges of G not in H."""
+    g = CompactDiGraph()
+    g.add_nodes_from(G.nodes)
+    for u, v in G.edges:
+        if (u, v) not in H.edges:
+            g._append_edge(u, v, {})
+    return g
+
+
+def node_link_graph(data: dict, edges: str = 'edges') -> CompactDiGraph:
+    """Create compact graph from node-link data."""
+    return from_networkx(nx.node_link_graph(data, edges=edges))
+
+
+def generate_network_text(G: CompactDiGraph, **kwargs) -> Iterator[str]:
+    """Generate lines of a text representation of the graph."""
+    return nx.generate_network_text(G.to_networkx(), **kwargs)
@@ -0,0 +1,30 @@
+from hashlib import sha256
+from typing import Any, Dict, Iterable
+
+from .requirements import get_property
+
+
+def merkle_fingerprints(graph, order: Iterable) -> Dict[Any, str]:
+    """Get Merkle fingerprints of the nodes of a DAG.
+
+    The fingerprint of a node is the sha256 of its own hash (the `hash`
+    property, or the node itself) and the sorted fingerprints of its
+    parents. It changes if the node or anything upstream of it changes.
+
+    Parameters
+    ----------
+    graph : graph
+        networkx.DiGraph-like graph.
+    order : iterable
+        Topological order of the nodes.
+
+    """
+    pred = graph.pred
+    graph_nodes = graph.nodes
+    fingerprints: Dict[Any, str] = {}
+    for n in order:
+        own = get_property(graph_nodes[n], 'hash') or n
+        parents = sorted(fingerprints[u] for u in pred[n])
+        fingerprints[n] = sha256(
+            '\n'.join([str(own), *parents]).encode()).hexdigest()
+    return fingerprints
@@ -1,7 +1,8 @@
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from .job import get_job
+from .bundle import group_tasks
+from .job import CompactJob, Job, get_job
 from .graph import JobGraph
 
 
@@ -14,6 +15,9 @@ def get_workflow(*args, **kwargs) -> JobGraph:
     Parameters
     ----------
         *args: Variable number of job definitions.
+        bundle: Group the given tasks into jobs, see `normalize_input`.
+        max_tasks: Maximum number of tasks per grouped job.
+        max_time: Maximum summed `job_time` in seconds per grouped job.
         **kwargs: Additional keyword arguments to pass to JobGraph.
 
     Returns
@@ -28,6 +32,9 @@ def get_workflow(*args, **kwargs) -> JobGraph:
     if len(args) == 0:
         raise ValueError('No arguments provided')
 
+    bundle = kwargs.pop('bundle', False)
+    limits = {'max_tasks': kwargs.pop('max_tasks', 0),
+              'max_time': kwargs.pop('max_time', None)}
     if isinstance(args[0], JobGraph):
         # If the first argument is already a JobGraph, return it directly
         return args[0]
@@ -35,17 +42,38 @@ def get_workflow(*args, **kwargs) -> JobGraph:
     if isinstance(args[0], (str, Path)):
         try:
             if Path(args[0]).exists():
-                workflow = JobGraph()
+                workflow = JobGraph(**kwargs)
                 workflow.read(filename=args[0])
                 return workflow
         except Exception as e:
             raise ValueError(f'Error reading workflow from {args[0]}: {e}')
 
-    jobs = normalize_input(*args)
+    jobs = normalize_input(args[0] if len(args) == 1 else list(args),
+                           bundle=bundle, **limits)
     return JobGraph(jobs=jobs, **kwargs)
 
 
-def normalize_input(jobs: Any) -> list:
-    """Normalize input to a list of lists."""
+def normalize_input(jobs: Any, bundle: bool = False, max_tasks: int = 0,
+                    max_time: Optional[float] = None) -> list:
+    """Normalize input to a list of jobs.
+
+    A list inside the input is a bundle of tasks to run in one job. It is
+    split into the largest groups of tasks that can share a job, i.e. that
+    use the same connection and resources (see `bundle.group_tasks`). With
+    `bundle`, the single tasks of the input are grouped the same way. Jobs
+    (`Job`, `CompactJob`) and job dicts already hold their tasks, hash and
+    status and are kept as they are instead of becoming tasks of a new job.
+    Grouped jobs hold at most `max_tasks` tasks taking at most `max_time`
+    seconds in total, if given.
+    """
     jobs = [jobs] if not isinstance(jobs, list) else jobs
-    return [get_job(job) for job in jobs]
+    result = []
+    tasks = []
+    for job in jobs:
+        if isinstance(job, list):
+            result.extend(group_tasks(job, max_tasks, max_time) or [Job()])
+        elif bundle and not isinstance(job, (Job, CompactJob, dict)):
+            tasks.append(job)
+        else:
+            result.append(get_job(job))
+    return result + group_tasks(tasks, max_tasks, max_time)
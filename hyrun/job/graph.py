@@ -1,17 +1,45 @@
+import heapq
+import io
 import json
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Callable, List, Optional, Union
-import operator
+from types import MappingProxyType
+from typing import (Any, Callable, Collection, Dict, Iterable, List, Mapping,
+                    Optional, Union)
 import networkx as nx
 from dataclasses import fields
 from hytools.graph import Graph
 from hytools.logger import LoggerDummy
 
+from . import compact, serialize
+from .fingerprint import merkle_fingerprints
+from .output import Output
+from .requirements import (RunRequirements, compile_requirements,
+                           get_property, has_property)
+from .reachability import ReachabilityIndex
+from .render import render as render_graph
+from .status import job_status_map
+from .topology import TopologyCache
+from .views import NodeSetView
+
 edge_keys = ['edge', 'edges', 'dependencies', 'dependency', 'dependencies']
 node_keys = ['node', 'nodes', 'jobs', 'job', 'tasks', 'task']
 weight_keys = ['weight', 'weights', 'weighting', 'weighting']
 edge_attr = ['weight']
-node_attr = ['hash', 'status', 'db_id']
+node_attr = ['hash', 'status', 'db_id', 'job_id']
+unique_attr = ['db_id', 'job_id']
+index_attr = ['status'] + unique_attr
+reuse_attr = ['status', 'db_id', 'job_id', 'outputs']
+graph_backends = {'networkx': nx, 'compact': compact}
+
+
+@lru_cache(maxsize=None)
+def job_fields() -> List[str]:
+    """Get names of the Job fields copied by `JobGraph.add_node`."""
+    from hyrun.job import Job
+    return [f.name for f in fields(Job)]
+
 
 class JobGraph(Graph):
     """Class to create a job graph."""
@@ -19,7 +47,13 @@ class JobGraph(Graph):
     def __init__(self, **kwargs):
         """Initialize job graph."""
         self.logger = kwargs.get('logger') or LoggerDummy()
-        self.graph = nx.DiGraph()
+        self.backend = kwargs.get('backend') or 'networkx'
+        if self.backend not in graph_backends:
+            raise ValueError(f'Invalid backend: {self.backend}. '
+                             'Available backends: '
+                             f'{list(graph_backends.keys())}')
+        self._backend = graph_backends[self.backend]
+        self.graph = self._backend.DiGraph()
         self._nodes = self.make_list(
             self.get_from_kwargs(kwargs, node_keys) or [])
         self._edges = self.make_list(
@@ -28,81 +62,420 @@ class JobGraph(Graph):
                                   'property': 'status',
                                  'operator': '==',
                                  'value': 'COMPLETED'}
+        self._unmet: Optional[dict] = None
+        self._ready: dict = {}
+        self._duplicates: Dict[str, list] = {}
+        self._generators: Dict[Any, Callable] = {}
+        self._indexes: Optional[Dict[str, dict]] = None
+        self.reachability = bool(kwargs.get('reachability'))
+        self._reach: Optional[ReachabilityIndex] = None
+        self._topo: Optional[TopologyCache] = None
+        self._topo_map: Optional[tuple] = None
+        self._version = 0
+        self._priority_version: Optional[int] = None
+        self._default_weight = 1.0
+        self._skip_causes: Dict[Any, set] = {}
+        self._skipped_status: dict = {}
+        self._propagating = False
         self.run_requirements = (kwargs.get('run_requirements')
                                or [default_run_requirements])
         self.weights = self.make_list(kwargs.get('weights') or [])
+        self.add_nodes_from(self._nodes)
         self.set_weights(self.weights)
-        for n in self._nodes:
-            self.add_node(n)
-        for e in self._edges + self.weights:
-            if isinstance(e, (tuple, list)):
-                u, v = e[0], e[1]
-                attr_dict = {}
-                for i, attr in enumerate(edge_attr, start=2):
-                    if len(e) > i:
-                        attr_dict[attr] = e[i]
-                self.add_edge(u, v, **attr_dict)
-            elif isinstance(e, dict):
-                u, v = list(e.keys())[0], list(e.values())[0]
-                attr_dict = {k: v for k, v in e.items() if k in edge_attr}
-                self.add_edge(u, v, **attr_dict)
+        self.add_edges_from(self._edges + self.weights)
 
     def set_weights(self, weights: List[Union[tuple, list, dict]]):
-        """Set weights for edges in the graph."""
+        """Set weights for edges in the graph.
+
+        Missing edges are added with `add_edges_from`, so weights that
+        would close a cycle raise ValueError before anything is changed.
+        """
         if not weights:
             return
+        new: dict = {}
         for w in weights:
             if isinstance(w, (tuple, list)):
-                u, v = w[0], w[1]
-                weight = w[2] if len(w) > 2 else 1.0
-                self.graph.add_edge(u, v, weight=weight)
+                new[w[0], w[1]] = w[2] if len(w) > 2 else 1.0
             elif isinstance(w, dict):
-                for (u, v), weight in w.items():
-                    self.graph.add_edge(u, v, weight=weight)
+                new.update(w)
             else:
                 raise ValueError(f'Unsupported weight format: {w}')
+        graph_edges = self.graph.edges
+        existing = [edge for edge in new if edge in graph_edges]
+        self.add_edges_from([(u, v, {'weight': weight})
+                             for (u, v), weight in new.items()
+                             if (u, v) not in graph_edges])
+        for u, v in existing:
+            self.update_edge_attrs(u, v, weight=new[u, v])
+
+    @property
+    def run_requirements(self) -> List[dict]:
+        """Get run requirements."""
+        return [r.to_dict() for r in self._requirements]
+
+    @run_requirements.setter
+    def run_requirements(self, requirements):
+        """Set and compile run requirements."""
+        self._requirements: RunRequirements = compile_requirements(
+            requirements)
+        self._reset_ready_index()
 
     def is_ready_to_run(self, node: str) -> bool:
         """Check if node will run based on run conditions."""
-        ops = {
-            '==': operator.eq,
-            '!=': operator.ne,
-            '<': operator.lt,
-            '<=': operator.le,
-            '>': operator.gt,
-            '>=': operator.ge,
-        }
         if node not in self.graph.nodes:
             self.logger.error(f'Node {node} does not exist in graph')
             return False
+        return self._check_ready(node)
 
-        for cond in self.run_requirements:
-            elem = cond.get('element', 'node')
-            prop = cond.get('property', 'status')
-            op_str = cond.get('operator', '==')
-            value = cond.get('value')
-            op_func = ops.get(op_str)
-            if op_func is None:
-                raise ValueError(f"Unsupported operator: {op_str}")
-
-            # Check node property
-            if (elem == 'node'
-                and op_func(self.graph.nodes[node].get(prop), value)):
-                return False
-            elif (elem == 'node' and prop not in self.graph.nodes[node]):
-                self.logger.error(f'Property {prop} not found in node {node}')
-                return True if prop == 'status' else False
-
-            # Check ancestors
-            for n in self.direct_ancestors(node):
-                val = (self.graph.nodes[n].get(prop, None)
-                    if elem == 'node'
-                    else self.graph.edges[(n, node)].get(prop, None))
-                if not op_func(val, value):
+    def are_ready_to_run(self,
+                         nodes: Optional[Iterable] = None
+                         ) -> Dict[str, bool]:
+        """Check run conditions for many nodes in one pass.
+
+        Parameters
+        ----------
+        nodes : iterable, optional
+            Nodes to check, defaults to all nodes in the graph.
+
+        Returns
+        -------
+        dict
+            Mapping of node to result of `is_ready_to_run`.
+
+        """
+        nodes = self.graph.nodes if nodes is None else nodes
+        graph_nodes = self.graph.nodes
+        check = self._check_ready
+        result = {}
+        for node in nodes:
+            if node not in graph_nodes:
+                self.logger.error(f'Node {node} does not exist in graph')
+                result[node] = False
+                continue
+            result[node] = check(node)
+        return result
+
+    def _check_ready(self, node) -> bool:
+        """Evaluate compiled run requirements for an existing node."""
+        graph_nodes = self.graph.nodes
+        attrs = graph_nodes[node]
+        pred = self.graph.pred[node]
+        for req in self._requirements:
+            if req.element == 'node':
+                # Check node property
+                if req(attrs):
                     return False
+                if not has_property(attrs, req.prop):
+                    self.logger.error(
+                        f'Property {req.prop} not found in node {node}')
+                    return req.prop == 'status'
+                # Check ancestors
+                if not all(req(graph_nodes[n]) for n in pred):
+                    return False
+            elif not all(req(edge) for edge in pred.values()):
+                return False
+        return True
+
+    def _node_fulfilled(self, node) -> bool:
+        """Check if a node itself already meets the run requirements."""
+        return self._requirements.node_fulfilled(self.graph.nodes[node])
+
+    def _edge_fulfilled(self, u, v) -> bool:
+        """Check if dependency u -> v meets the run requirements."""
+        return self._requirements.edge_fulfilled(self.graph.nodes[u],
+                                                 self.graph.edges[u, v])
+
+    def _is_runnable(self, node) -> bool:
+        """Check if node has no unmet dependencies and has not run yet."""
+        status = self.graph.nodes[node].get('status')
+        return (self._unmet[node] == 0
+                and job_status_map.get(status, 0) == 0
+                and not self._node_fulfilled(node))
+
+    def _refresh_ready(self, node):
+        """Add node to or remove node from the ready queue."""
+        if self._is_runnable(node):
+            self._ready[node] = None
+        else:
+            self._ready.pop(node, None)
+
+    def _build_ready_index(self):
+        """Count unmet dependencies of all nodes and fill ready queue."""
+        self._unmet = {}
+        self._ready = {}
+        graph_nodes, pred = self.graph.nodes, self.graph.pred
+        edge_fulfilled = self._requirements.edge_fulfilled
+        for node in graph_nodes:
+            self._unmet[node] = sum(
+                1 for u, edge in pred[node].items()
+                if not edge_fulfilled(graph_nodes[u], edge))
+            self._refresh_ready(node)
+
+    def _reset_ready_index(self):
+        """Drop ready queue, it is rebuilt on next access."""
+        self._unmet = None
+        self._ready = {}
+
+    def update_node_attrs(self, node, **attrs):
+        """Update node attributes, the ready queue and the status index.
+
+        Only the direct descendants of the node are re-evaluated, i.e. the
+        cost is proportional to the out-degree of the node.
+        """
+        if node not in self.graph.nodes:
+            self.logger.error(f'Node {node} does not exist in graph')
+            return
+        old_status = self.graph.nodes[node].get('status')
+        if self._indexes is not None:
+            self._reindex(node, attrs, self.graph.nodes[node])
+        if self._unmet is None:
+            self.graph.nodes[node].update(attrs)
+        else:
+            successors = list(self.graph.successors(node))
+            before = [self._edge_fulfilled(node, v) for v in successors]
+            self.graph.nodes[node].update(attrs)
+            for v, was_fulfilled in zip(successors, before):
+                is_fulfilled = self._edge_fulfilled(node, v)
+                if is_fulfilled == was_fulfilled:
+                    continue
+                self._unmet[v] += -1 if is_fulfilled else 1
+                self._refresh_ready(v)
+            self._refresh_ready(node)
+        self._fan_out(node, attrs)
+        if ('status' in attrs and attrs['status'] != old_status
+                and not self._propagating):
+            self._propagate_skip(node)
+            if attrs['status'] == 'COMPLETED' and node in self._generators:
+                self._expand(node)
+
+    def _propagate_skip(self, node):
+        """Mark or unmark nodes that can never run as SKIPPED.
+
+        A node is skipped if a finished parent does not fulfill the run
+        requirements of their edge, e.g. the parent FAILED. Skipping
+        propagates down the graph. The parents causing the skip are
+        recorded, so that it is undone once they are resubmitted. Only
+        the affected subgraph is visited.
+        """
+        graph_nodes = self.graph.nodes
+        finished = job_status_map['COMPLETED']
+        self._propagating = True
+        try:
+            stack = [node]
+            while stack:
+                u = stack.pop()
+                level = job_status_map.get(graph_nodes[u].get('status'), 0)
+                for v in list(self.graph.successors(u)):
+                    causes = self._skip_causes.get(v)
+                    if level >= finished and not self._edge_fulfilled(u, v):
+                        if causes is not None:
+                            causes.add(u)
+                            continue
+                        status = graph_nodes[v].get('status')
+                        if job_status_map.get(status, 0) != 0:
+                            continue
+                        self._skip_causes[v] = {u}
+                        self._skipped_status[v] = status
+                        self.update_node_attrs(v, status='SKIPPED')
+                        stack.append(v)
+                    elif causes is not None and u in causes:
+                        if self._release_skip(u, v):
+                            stack.append(v)
+        finally:
+            self._propagating = False
+
+    def _propagate_finished(self, nodes: Iterable):
+        """Propagate skips from the finished nodes among nodes."""
+        graph_nodes = self.graph.nodes
+        finished = job_status_map['COMPLETED']
+        for u in dict.fromkeys(nodes):
+            if (job_status_map.get(graph_nodes[u].get('status'), 0)
+                    >= finished):
+                self._propagate_skip(u)
+
+    def _restore_skips(self):
+        """Rebuild skip causes of a graph that was filled directly.
 
+        SKIPPED nodes with a finished parent whose edge is not fulfilled
+        get these parents as causes, so that they are unskipped once the
+        parents are resubmitted. Their status before the skip is unknown
+        and restored as None. Skips are then propagated from all finished
+        nodes.
+        """
+        self._skip_causes = {}
+        self._skipped_status = {}
+        graph_nodes = self.graph.nodes
+        finished = job_status_map['COMPLETED']
+        done = [n for n in graph_nodes
+                if job_status_map.get(graph_nodes[n].get('status'), 0)
+                >= finished]
+        for u in done:
+            for v in self.graph.successors(u):
+                if (graph_nodes[v].get('status') == 'SKIPPED'
+                        and not self._edge_fulfilled(u, v)):
+                    self._skip_causes.setdefault(v, set()).add(u)
+                    self._skipped_status[v] = None
+        self._propagate_finished(done)
+
+    def _release_skip(self, u, v) -> bool:
+        """Remove u from the skip causes of v, return True if unskipped."""
+        causes = self._skip_causes[v]
+        causes.discard(u)
+        if causes:
+            return False
+        del self._skip_causes[v]
+        status = self._skipped_status.pop(v, None)
+        if self.graph.nodes[v].get('status') == 'SKIPPED':
+            self.update_node_attrs(v, status=status)
         return True
 
+    def skipped_by(self, node) -> set:
+        """Get parents whose failure caused node to be skipped."""
+        return set(self._skip_causes.get(node, ()))
+
+    def _get_index(self, attr: str) -> dict:
+        """Get secondary index of node attribute, built on first access.
+
+        The status index maps each status to a dict of nodes (used as an
+        ordered set), the indexes of `unique_attr` map str(value) to node.
+        """
+        if self._indexes is None:
+            self._indexes = {a: {} for a in index_attr}
+            graph_nodes = self.graph.nodes
+            for n in graph_nodes:
+                self._reindex(n, graph_nodes[n])
+        return self._indexes[attr]
+
+    def _reindex(self, node, attrs: Optional[Mapping],
+                 old: Optional[Mapping] = None):
+        """Update indexes for changed attributes of node.
+
+        `old` are the attributes before the change (None for new nodes),
+        `attrs=None` removes the node from all indexes.
+        """
+        for attr, index in self._indexes.items():
+            unique = attr in unique_attr
+            if old is not None and (attrs is None or attr in attrs):
+                value = old.get(attr)
+                if not unique:
+                    index.get(value, {}).pop(node, None)
+                elif value is not None and index.get(str(value)) == node:
+                    del index[str(value)]
+            if attrs is None or not (old is None or attr in attrs):
+                continue
+            value = attrs.get(attr)
+            if not unique:
+                index.setdefault(value, {})[node] = None
+            elif value is not None:
+                index[str(value)] = node
+
+    def lookup(self, attr: str, value) -> Optional[Any]:
+        """Get node by a unique attribute (`db_id` or `job_id`)."""
+        if attr not in unique_attr:
+            raise ValueError(f'No unique index for {attr}, '
+                             f'available: {unique_attr}')
+        return self._get_index(attr).get(str(value))
+
+    def reconcile(self, report) -> list:
+        """Apply a scheduler status report to the graph.
+
+        Parameters
+        ----------
+        report : mapping or iterable
+            Mapping from job_id to status, or JobStatus-like objects with
+            `job_id` and `status` attributes.
+
+        Returns
+        -------
+        list
+            Nodes whose status changed.
+
+        """
+        if isinstance(report, Mapping):
+            items = report.items()
+        else:
+            items = ((r.job_id, r.status) for r in report)
+        index = self._get_index('job_id')
+        graph_nodes = self.graph.nodes
+        changed = []
+        for job_id, status in items:
+            node = index.get(str(job_id))
+            if node is None:
+                self.logger.debug(f'Job {job_id} is not in graph')
+                continue
+            if graph_nodes[node].get('status') != status:
+                self.mark_status(node, status)
+                changed.append(node)
+        return changed
+
+    def nodes_with_status(self, *statuses) -> NodeSetView:
+        """Get live read-only view of the nodes with any of the statuses.
+
+        The view is backed by the status index, creating it is O(1) and
+        iterating it is proportional to the number of matching nodes. Use
+        `.with_descendants()` to include all descendants of the nodes.
+        """
+        def buckets():
+            index = self._get_index('status')
+            return [index[s] for s in statuses if s in index]
+        return NodeSetView(buckets, self)
+
+    def frontier(self) -> NodeSetView:
+        """Get live read-only view of the ready queue (see `ready_nodes`)."""
+        def buckets():
+            if self._unmet is None:
+                self._build_ready_index()
+            return (self._ready,)
+        return NodeSetView(buckets, self)
+
+    def duplicates(self, node) -> list:
+        """Get jobs that were deduplicated into node."""
+        return list(self._duplicates.get(node, []))
+
+    def _fan_out(self, node, attrs: dict):
+        """Copy updated attributes of node to its job and duplicates."""
+        ref = self.graph.nodes[node].get('job')
+        jobs = self._duplicates.get(node, [])
+        for job in ([ref] if ref is not None else []) + jobs:
+            for key, value in attrs.items():
+                if key != 'job' and hasattr(job, key):
+                    setattr(job, key, value)
+
+    def update_edge_attrs(self, u, v, **attrs):
+        """Update edge attributes and the ready queue."""
+        if (u, v) not in self.graph.edges:
+            self.logger.error(f'Edge {u} -> {v} does not exist in graph')
+            return
+        if 'weight' in attrs:
+            self._priority_version = None
+        if self._unmet is None:
+            self.graph.edges[u, v].update(attrs)
+            return
+        was_fulfilled = self._edge_fulfilled(u, v)
+        self.graph.edges[u, v].update(attrs)
+        is_fulfilled = self._edge_fulfilled(u, v)
+        if is_fulfilled != was_fulfilled:
+            self._unmet[v] += -1 if is_fulfilled else 1
+            self._refresh_ready(v)
+
+    def mark_status(self, node, status: Optional[str]):
+        """Set status of node and update the ready queue."""
+        self.update_node_attrs(node, status=status)
+
+    def ready_nodes(self, by_priority: bool = False) -> list:
+        """Get nodes with all dependencies met which have not run yet.
+
+        With `by_priority`, nodes are sorted by their `priority` attribute
+        (see `prioritize`), highest first.
+        """
+        if self._unmet is None:
+            self._build_ready_index()
+        if not by_priority:
+            return list(self._ready)
+        self._refresh_priorities()
+        nodes = self.graph.nodes
+        return sorted(self._ready, key=lambda n: -nodes[n]['priority'])
+
     def get_from_kwargs(self, kwargs, keys):
         """Get value from kwargs."""
         for key in keys:
@@ -118,29 +491,260 @@ class JobGraph(Graph):
 
     def relabel_nodes(self, mapping):
         """Relabel nodes in graph."""
-        self.graph = nx.relabel_nodes(self.graph, mapping)
+        self.graph = self._backend.relabel_nodes(self.graph, mapping)
+        get = mapping if callable(mapping) else (lambda n: mapping.get(n, n))
+        self._duplicates = {get(n): jobs
+                            for n, jobs in self._duplicates.items()}
+        self._generators = {get(n): expand
+                            for n, expand in self._generators.items()}
+        self._skip_causes = {get(n): {get(u) for u in causes}
+                             for n, causes in self._skip_causes.items()}
+        self._skipped_status = {get(n): status for n, status
+                                in self._skipped_status.items()}
+        self._reset_ready_index()
+        self._indexes = None
+        self._changed()
 
     def add_node(self, node, keys: Optional[List[str]] = None):
         """Add node to graph."""
-        idx = getattr(node, 'hash', None) or len(self.graph.nodes)
+        idx = getattr(node, 'hash', None) or self._free_index()
         self.logger.debug(f'Adding node {idx} to graph')
+        if (idx in self.graph.nodes and getattr(node, 'hash', None)
+                and self.graph.nodes[idx].get('hash') == idx):
+            self._add_duplicate(idx, node)
+            return
         if idx in self.graph.nodes:
             self.logger.error(f'Node {idx} already exists in graph')
+        else:
+            if self._unmet is not None:
+                self._unmet[idx] = 0
+            if self._indexes is not None:
+                self._reindex(idx, {})
         self.graph.add_node(idx)
-        if not keys:
-            from hyrun.job import Job
-            node_attr = [f.name for f in fields(Job)]
-        keys = keys or node_attr
-        for attr in keys:
-            if hasattr(node, attr):
-                self.graph.nodes[idx][attr] = getattr(node, attr, None)
+        keys = keys or job_fields()
+        self._changed('add_node', idx)
+        self.update_node_attrs(idx, **{attr: getattr(node, attr, None)
+                                       for attr in keys
+                                       if hasattr(node, attr)})
+
+    def _free_index(self, taken: Collection = ()) -> int:
+        """Get integer label of a new node without hash.
+
+        Starts at the number of nodes and skips labels in `taken` or still
+        used by the graph, e.g. after nodes were removed.
+        """
+        graph_nodes = self.graph.nodes
+        idx = len(graph_nodes) + len(taken)
+        while idx in graph_nodes or idx in taken:
+            idx += 1
+        return idx
+
+    def add_nodes_from(self, jobs: Iterable,
+                       keys: Optional[List[str]] = None) -> list:
+        """Add jobs to graph in bulk.
+
+        Unlike `add_node`, only the `keys` (default `node_attr`) are copied
+        into the node attributes, together with a reference `job` to the
+        job itself. Run requirements on other properties are looked up on
+        the referenced job. Returns the node of every job.
+        """
+        keys = tuple(keys or node_attr)
+        getter = attrgetter(*keys)
+        graph_nodes = self.graph.nodes
+        new: dict = {}
+        nodes = []
+        duplicates = []
+        with serialize.paused_gc():
+            for job in jobs:
+                idx = getattr(job, 'hash', None)
+                if idx is None:
+                    idx = self._free_index(new)
+                elif idx in new or (idx in graph_nodes
+                                    and graph_nodes[idx].get('hash') == idx):
+                    duplicates.append((idx, job))
+                    nodes.append(idx)
+                    continue
+                nodes.append(idx)
+                try:
+                    values = getter(job)
+                except AttributeError:
+                    attrs = {k: getattr(job, k) for k in keys
+                             if hasattr(job, k)}
+                else:
+                    attrs = dict(zip(keys, values if len(keys) > 1
+                                     else (values,)))
+                attrs['job'] = job
+                new[idx] = attrs
+            self.logger.debug(f'Adding {len(new)} nodes to graph')
+            existing = any(idx in graph_nodes for idx in new)
+            if self._indexes is not None:
+                for idx, attrs in new.items():
+                    self._reindex(idx, attrs, graph_nodes[idx]
+                                  if idx in graph_nodes else None)
+            self.graph.add_nodes_from(new.items())
+        for idx in new:
+            self._changed('add_node', idx)
+        for idx, job in duplicates:
+            self._add_duplicate(idx, job)
+        if self._unmet is not None and existing:
+            self._reset_ready_index()
+        elif self._unmet is not None:
+            for idx in new:
+                self._unmet[idx] = 0
+                self._refresh_ready(idx)
+        return nodes
+
+    def add_edges_from(self, edges: Iterable):
+        """Add edges given as (u, v[, weight]) tuples or dicts in bulk.
+
+        Existing edges are left unchanged, as in `add_edge`. If the new
+        edges close a cycle, none of them is added and ValueError is raised.
+        """
+        graph_edges = self.graph.edges
+        new: dict = {}
+        for e in edges:
+            if isinstance(e, (tuple, list)):
+                u, v = e[0], e[1]
+                if len(e) == 2:
+                    attrs = {}
+                elif len(e) == 3 and isinstance(e[2], dict):
+                    attrs = {k: e[2][k] for k in edge_attr if k in e[2]}
+                else:
+                    attrs = {attr: e[i] for i, attr in
+                             enumerate(edge_attr, start=2) if len(e) > i}
+            elif isinstance(e, dict):
+                u, v = next(iter(e.items()))
+                attrs = {k: v for k, v in e.items() if k in edge_attr}
+            else:
+                raise ValueError(f'Unsupported edge format: {e}')
+            if (u, v) not in new and (u, v) not in graph_edges:
+                new[u, v] = attrs
+        graph_nodes = self.graph.nodes
+        created = {n for edge in new for n in edge if n not in graph_nodes}
+        if self._indexes is not None:
+            for n in created:
+                self._reindex(n, {})
+        self.logger.debug(f'Adding {len(new)} edges to graph')
+        if self._unmet is not None:
+            self._reset_ready_index()
+        if not new:
+            return
+        added = []
+        try:
+            if self._topo is not None and self._topo.graph is self.graph:
+                # keep the cached order, checking edge by edge
+                for (u, v), attrs in new.items():
+                    self._topo.insert_edge(u, v)
+                    self.graph.add_edge(u, v, **attrs)
+                    added.append((u, v))
+                    self._changed('add_edge', u, v)
+            else:
+                with serialize.paused_gc():
+                    self.graph.add_edges_from(
+                        (u, v, attrs) for (u, v), attrs in new.items())
+                added = list(new)
+                self._changed()
+                try:
+                    self._get_topo().order()
+                except nx.NetworkXUnfeasible:
+                    raise ValueError('Edges would create a cycle') from None
+        except ValueError:
+            self._remove_added(added, created)
+            raise
+        self._propagate_finished(u for u, _ in new)
+
+    def _remove_added(self, edges: list, created: set):
+        """Remove edges and nodes added by a failed `add_edges_from`."""
+        for u, v in edges:
+            self.graph.remove_edge(u, v)
+        for n in created:
+            if n not in self.graph.nodes:
+                continue
+            if self._indexes is not None:
+                self._reindex(n, None, self.graph.nodes[n])
+            self.graph.remove_node(n)
+        self._changed()
+
+    def _add_duplicate(self, idx, node):
+        """Register job with the same content hash as an existing node.
+
+        The duplicate is not executed again, it receives the attributes
+        (status, outputs, ...) of the existing node instead. If the
+        duplicate is further than the node, e.g. it was loaded from a
+        database, the node takes over its `reuse_attr` that are not None.
+        """
+        self.logger.debug(f'Node {idx} already exists in graph, '
+                          'deduplicating')
+        jobs = self._duplicates.setdefault(idx, [])
+        if any(job is node for job in jobs):
+            return
+        jobs.append(node)
+        attrs = self.graph.nodes[idx]
+        if (job_status_map.get(getattr(node, 'status', None), 0)
+                > job_status_map.get(attrs.get('status'), 0)):
+            self.update_node_attrs(idx, **{
+                k: getattr(node, k) for k in reuse_attr
+                if getattr(node, k, None) is not None})
+        self._fan_out(idx, attrs)
+
+    def add_generator(self, node, expand: Callable[[Any, dict], Any]):
+        """Let node expand into child nodes when it completes.
+
+        `expand(node, attrs)` is called once, when the status of node
+        becomes 'COMPLETED', and returns the new jobs, or a tuple of the
+        new jobs and the (u, v) edges between them. The roots of the new jobs
+        become children of node, and the former children of node depend on
+        the sinks of the new jobs. New jobs that can run enter the ready
+        queue right away.
+        """
+        if node not in self.graph.nodes:
+            raise ValueError(f'Node {node} does not exist in graph')
+        self._generators[node] = expand
+        if self.graph.nodes[node].get('status') == 'COMPLETED':
+            self._expand(node)
+
+    def _expand(self, node) -> list:
+        """Add the children of a completed generator node."""
+        expand = self._generators.pop(node)
+        result = expand(node, self.graph.nodes[node])
+        jobs, edges = (result if isinstance(result, tuple)
+                       else (result, []))
+        nodes = list(dict.fromkeys(self.add_nodes_from(jobs)))
+        for u, v in edges:
+            self.add_edge(u, v)
+        new = set(nodes)
+        succ, pred = self.graph.succ, self.graph.pred
+        children = [v for v in succ[node] if v not in new]
+        for n in nodes:
+            if not any(u in new for u in pred[n]):
+                self.add_edge(node, n)
+            if not any(v in new for v in succ[n]):
+                for v in children:
+                    self.add_edge(n, v)
+        self.logger.debug(f'Expanded node {node} into {len(nodes)} nodes')
+        return nodes
 
     def add_edge(self, u, v, **kwargs):
-        """Add edge to graph."""
+        """Add edge to graph, raise ValueError if it closes a cycle."""
         self.logger.debug(f'Adding edge {u} -> {v} to graph')
         if (u, v) in self.graph.edges:
             return
+        # raises before anything is changed if the edge closes a cycle
+        self._get_topo().insert_edge(u, v)
+        if self._indexes is not None:
+            for n in (u, v):
+                if n not in self.graph.nodes:
+                    self._reindex(n, {})
         self.graph.add_edge(u, v)
+        self._changed('add_edge', u, v)
+        if self._unmet is not None:
+            for n in (u, v):
+                self._unmet.setdefault(n, 0)
+            if not self._edge_fulfilled(u, v):
+                self._unmet[v] += 1
+            self._refresh_ready(u)
+            self._refresh_ready(v)
+        self._propagate_finished([u])
         for key, value in kwargs.items():
             if key not in self.graph.edges[u, v]:
                 self.logger.error(
@@ -211,7 +815,29 @@ class JobGraph(Graph):
         if node not in self.graph.nodes:
             self.logger.error(f'Node {node} does not exist in graph')
             return
+        if self._unmet is not None:
+            for v in self.graph.successors(node):
+                if not self._edge_fulfilled(node, v):
+                    self._unmet[v] -= 1
+            successors = list(self.graph.successors(node))
+            self._unmet.pop(node, None)
+            self._ready.pop(node, None)
+        self._duplicates.pop(node, None)
+        self._generators.pop(node, None)
+        self._skip_causes.pop(node, None)
+        self._skipped_status.pop(node, None)
+        released = [v for v in self.graph.successors(node)
+                    if node in self._skip_causes.get(v, ())]
+        if self._indexes is not None:
+            self._reindex(node, None, self.graph.nodes[node])
         self.graph.remove_node(node)
+        self._changed('remove_node', node)
+        for v in released:
+            if self._release_skip(node, v):
+                self._propagate_skip(v)
+        if self._unmet is not None:
+            for v in successors:
+                self._refresh_ready(v)
 
     def remove_edge(self, u, v, remove_descendants=False):
         """Remove edge from graph."""
@@ -219,13 +845,22 @@ class JobGraph(Graph):
         if (u, v) not in self.graph.edges:
             self.logger.error(f'Edge {u} -> {v} does not exist in graph')
             return
-        descendants = list(nx.descendants(self.graph, v))
+        descendants = self.descendants(v) if remove_descendants else []
+        if self._unmet is not None and not self._edge_fulfilled(u, v):
+            self._unmet[v] -= 1
+        released = u in self._skip_causes.get(v, ())
         self.graph.remove_edge(u, v)
+        self._changed('remove_edge', u, v)
         if remove_descendants:
             self.logger.debug(f'Removing descendants of {v} from graph')
-            self.graph.remove_node(v)
+            self.remove_node(v)
             for d in descendants:
-                self.graph.remove_node(d)
+                self.remove_node(d)
+            return
+        if released and self._release_skip(u, v):
+            self._propagate_skip(v)
+        if self._unmet is not None:
+            self._refresh_ready(v)
 
     def subgraph(self,
                  filter_node: Optional[Callable] = None,
@@ -233,33 +868,132 @@ class JobGraph(Graph):
         """Create subgraph."""
         if filter_node is None and filter_edge is None:
             return self.graph
-        subgraph = JobGraph()
+        subgraph = self._new_graph()
+        subgraph_view = self._backend.subgraph_view
         if filter_node:
-            s = nx.subgraph_view(self.graph, filter_node=filter_node).nodes()
+            s = subgraph_view(self.graph, filter_node=filter_node).nodes()
         if filter_edge:
-            s = nx.subgraph_view(self.graph, filter_edge=filter_edge).edges()
+            s = subgraph_view(self.graph, filter_edge=filter_edge).edges()
         if filter_node and filter_edge:
-            s = nx.subgraph_view(self.graph, filter_node=filter_node,
-                                 filter_edge=filter_edge).nodes()
+            s = subgraph_view(self.graph, filter_node=filter_node,
+                              filter_edge=filter_edge).nodes()
         subgraph.graph = self.graph.subgraph(s)
         return subgraph
 
+    def merge(self, other: 'JobGraph') -> list:
+        """Merge other graph into this graph in place.
+
+        Nodes are matched by key, i.e. by job hash. New nodes and edges are
+        added with all their attributes. Shared nodes are executed once,
+        the job of `other` becomes a duplicate. They take the attributes
+        of `other` that are not None if its status is strictly more
+        advanced, and keep their own otherwise. Indexes, the ready queue
+        and the topological order are updated incrementally, so the cost
+        is proportional to the size of `other`, not of this graph.
+
+        Returns
+        -------
+        list
+            Nodes added to this graph.
+
+        Raises
+        ------
+        ValueError
+            If an edge of `other` closes a cycle. Nodes and edges merged
+            before stay in the graph.
+
+        """
+        if not isinstance(other, JobGraph):
+            raise ValueError('Can only merge JobGraph objects.')
+        graph_nodes, graph_edges = self.graph.nodes, self.graph.edges
+        other_nodes, other_edges = other.graph.nodes, other.graph.edges
+        added = []
+        for n in other_nodes:
+            attrs = dict(other_nodes[n])
+            if n not in graph_nodes:
+                self._insert_node(n, attrs)
+                added.append(n)
+                continue
+            job = attrs.pop('job', None)
+            if (job_status_map.get(attrs.get('status'), 0)
+                    > job_status_map.get(graph_nodes[n].get('status'), 0)):
+                self.update_node_attrs(n, **{k: v for k, v in attrs.items()
+                                             if v is not None})
+            if job is not None and job is not graph_nodes[n].get('job'):
+                self._add_duplicate(n, job)
+        for u, v in other_edges:
+            if (u, v) not in graph_edges:
+                self.add_edge(u, v)
+            attrs = other_edges[u, v]
+            if attrs:
+                self.update_edge_attrs(u, v, **attrs)
+        for n, jobs in other._duplicates.items():
+            for job in jobs:
+                self._add_duplicate(n, job)
+        for n, expand in other._generators.items():
+            self._generators.setdefault(n, expand)
+        self.logger.debug(f'Merged {len(added)} new nodes into graph')
+        return added
+
+    def _insert_node(self, node, attrs: dict):
+        """Add new node with attributes, keeping all indexes."""
+        if self._indexes is not None:
+            self._reindex(node, attrs)
+        self.graph.add_node(node, **attrs)
+        if self._unmet is not None:
+            self._unmet[node] = 0
+            self._refresh_ready(node)
+        self._changed('add_node', node)
+
+    def difference_update(self, other: 'JobGraph') -> list:
+        """Remove the edges of other graph from this graph in place.
+
+        Nodes and their attributes are kept. The cost is proportional to
+        the number of edges of the smaller graph.
+
+        Returns
+        -------
+        list
+            Removed edges.
+
+        """
+        if not isinstance(other, JobGraph):
+            raise ValueError('Can only subtract JobGraph objects.')
+        graph_edges, other_edges = self.graph.edges, other.graph.edges
+        if len(other_edges) < len(graph_edges):
+            removed = [e for e in other_edges if e in graph_edges]
+        else:
+            removed = [e for e in graph_edges if e in other_edges]
+        for u, v in removed:
+            self.remove_edge(u, v)
+        return removed
+
     def __add__(self, other):
         """Add two graphs."""
         if not isinstance(other, JobGraph):
             raise ValueError('Can only add JobGraph objects.')
-        new_graph = JobGraph()
-        new_graph.graph = nx.compose(self.graph, other.graph)
+        new_graph = self.__copy__()
+        new_graph.merge(other)
         return new_graph
 
+    def __iadd__(self, other):
+        """Merge other graph into this graph."""
+        self.merge(other)
+        return self
+
     def __sub__(self, other):
         """Subtract two graphs."""
         if not isinstance(other, JobGraph):
             raise ValueError('Can only subtract JobGraph objects.')
-        new_graph = JobGraph()
-        new_graph.graph = nx.difference(self.graph, other.graph)
+        new_graph = self.__copy__()
+        new_graph.difference_update(other)
         return new_graph
 
+    def __isub__(self, other):
+        """Remove edges of other graph from this graph."""
+        self.difference_update(other)
+        return self
+
     # def subgraph_with_node_prop(self, **kwargs):
     #     """Return subgraph with nodes matching all filters."""
     #     def filter_node(n):
@@ -274,21 +1008,43 @@ class JobGraph(Graph):
     #                    for k, v in kwargs.items())
     #     return self.subgraph(filter_edge=filter_edge)
 
+    def _new_graph(self) -> 'JobGraph':
+        """Create empty graph with the settings of this graph."""
+        return JobGraph(backend=self.backend, logger=self.logger,
+                        run_requirements=self.run_requirements,
+                        reachability=self.reachability)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Get graph as networkx.DiGraph, built on demand if compact."""
+        if isinstance(self.graph, nx.DiGraph):
+            return self.graph
+        return self.graph.to_networkx()
+
     def __iter__(self):
         """Iterate over graph."""
         return iter(self.graph.nodes)
 
     def __copy__(self):
         """Copy graph."""
-        new_graph = JobGraph()
+        new_graph = self._new_graph()
         new_graph.graph = self.graph.copy()
+        new_graph._duplicates = {n: list(jobs)
+                                 for n, jobs in self._duplicates.items()}
+        new_graph._generators = dict(self._generators)
+        new_graph._skip_causes = {n: set(causes)
+                                  for n, causes in self._skip_causes.items()}
+        new_graph._skipped_status = dict(self._skipped_status)
         return new_graph
 
     def __getitem__(self, item):
-        """Get item from graph."""
+        """Get read-only attributes of a node or an edge (u, v).
+
+        Change them with `update_node_attrs` or `mark_status` and
+        `update_edge_attrs`, which keep the ready queue and indexes in sync.
+        """
         if isinstance(item, tuple):
-            return self.graph.edges[list(item)]
-        return self.graph.nodes[item]
+            return MappingProxyType(self.graph.edges[list(item)])
+        return MappingProxyType(self.graph.nodes[item])
 
     def __len__(self):
         """Get length of graph."""
@@ -298,24 +1054,95 @@ class JobGraph(Graph):
         """Check if item is in graph."""
         return item in self.graph.nodes
 
-    def write(self, filename=None) -> Optional[str]:
-        """Dump graph to file."""
-        graph_str = json.dumps(nx.node_link_data(self.graph, edges='edges'),
-                               indent=4)
+    def write(self,
+              filename=None,
+              file_format: Optional[str] = None,
+              compression: Optional[str] = None
+              ) -> Optional[Union[str, bytes]]:
+        """Dump graph to file.
+
+        Parameters
+        ----------
+        filename : str or Path, optional
+            File to write to. If not given, the dump is returned.
+        file_format : str, optional
+            'json' (node-link data), 'jsonl' or 'msgpack'. The latter two
+            are written node by node. Defaults to the file suffix, e.g.
+            `workflow.msgpack.zst`, or 'json'.
+        compression : str, optional
+            'gzip' or 'zstd'. Defaults to the file suffix (`.gz`, `.zst`).
+
+        """
+        if filename is not None:
+            inferred_format, inferred_compression = serialize.infer_format(
+                filename)
+            file_format = file_format or inferred_format
+            compression = compression or inferred_compression
+        file_format = file_format or 'json'
+        if file_format == 'json':
+            graph_str = json.dumps(nx.node_link_data(self.to_networkx(),
+                                                     edges='edges'),
+                                   indent=4, default=serialize.encode)
         if filename is None:
-            return graph_str
-        else:
+            if compression is not None:
+                raise ValueError('Compression requires a filename')
+            if file_format == 'json':
+                return graph_str
+            buffer = io.BytesIO()
+            serialize.dump_records(self._gen_records(), buffer, file_format)
+            data = buffer.getvalue()
+            return data if file_format == 'msgpack' else data.decode()
+        if file_format == 'json' and compression is None:
             Path(filename).write_text(graph_str)
+            return None
+        with serialize.open_file(filename, 'w', compression) as f:
+            if file_format == 'json':
+                f.write(graph_str.encode())
+            else:
+                serialize.dump_records(self._gen_records(), f, file_format)
         return None
 
-    def read(self, filename):
-        """Read graph from file."""
-        self.graph = nx.node_link_graph(json.load(open(filename, 'r')),
-                                        edges='edges')
+    def read(self,
+             filename,
+             file_format: Optional[str] = None,
+             compression: Optional[str] = None):
+        """Read graph from file written by `write`.
+
+        Format and compression default to the file suffix, compression is
+        also detected from the file content.
+        """
+        inferred_format, inferred_compression = serialize.infer_format(
+            filename)
+        file_format = file_format or inferred_format
+        compression = (compression or inferred_compression
+                       or serialize.sniff_compression(filename))
+        with serialize.open_file(filename, 'r', compression) as f:
+            if file_format == 'json':
+                self.graph = self._backend.node_link_graph(json.load(f),
+                                                           edges='edges')
+            else:
+                self._load_records(serialize.load_records(f, file_format))
+        self._reset_ready_index()
+        self._indexes = None
+        self._changed()
+        self._restore_skips()
+
+    def _gen_records(self):
+        """Generate records for streamed serialization."""
+        return serialize.gen_records(self.graph,
+                                     run_requirements=self.run_requirements)
+
+    def _load_records(self, records):
+        """Build graph from streamed records."""
+        graph = self._backend.DiGraph()
+        header = serialize.read_graph(records, graph)
+        if header.get('run_requirements'):
+            self.run_requirements = header['run_requirements']
+        self.graph = graph
 
     def __str__(self) -> str:
         """Get string representation of graph."""
-        return '\n'.join(nx.generate_network_text(self.graph))
+        return '\n'.join(self._backend.generate_network_text(self.graph))
     
     def direct_ancestors(self, node):
         """Get direct dependencies of a node."""
@@ -327,11 +1154,56 @@ class JobGraph(Graph):
 
     def ancestors(self, node):
         """Get all dependencies of a node."""
-        return list(nx.ancestors(self.graph, node))
+        if self.reachability:
+            return self._get_reach().ancestors(node)
+        return list(self._backend.ancestors(self.graph, node))
 
     def descendants(self, node):
         """Get all dependents of a node."""
-        return list(nx.descendants(self.graph, node))
+        if self.reachability:
+            return self._get_reach().descendants(node)
+        return list(self._backend.descendants(self.graph, node))
+
+    def is_ancestor(self, u, v) -> bool:
+        """Check if v depends (indirectly) on u."""
+        if self.reachability:
+            return self._get_reach().is_ancestor(u, v)
+        return u in self._backend.ancestors(self.graph, v)
+
+    def _changed(self, event: Optional[str] = None, *args):
+        """Record a change of the graph structure.
+
+        Bumps `version` and applies the edit `event` ('add_node',
+        'add_edge', 'remove_node' or 'remove_edge', called with the
+        affected nodes after the edit) to the reachability index and the
+        topology cache. Without event, both are dropped and rebuilt on
+        next access.
+        """
+        self._version += 1
+        if event is None:
+            self._reach = None
+            self._topo = None
+            return
+        for index in (self._reach, self._topo):
+            if index is not None:
+                getattr(index, event)(*args)
+
+    @property
+    def version(self) -> int:
+        """Get counter of changes of the graph structure."""
+        return self._version
+
+    def _get_topo(self) -> TopologyCache:
+        """Get topology cache, created on first access after edits."""
+        if self._topo is None or self._topo.graph is not self.graph:
+            self._topo = TopologyCache(self.graph, self._backend)
+        return self._topo
+
+    def _get_reach(self) -> ReachabilityIndex:
+        """Get reachability index, built on first access after edits."""
+        if self._reach is None:
+            self._reach = ReachabilityIndex(self.graph)
+        return self._reach
 
     @property
     def nodes(self):
@@ -345,33 +1217,197 @@ class JobGraph(Graph):
 
     @property
     def topological(self):
-        """Get topological order of graph."""
-        return list(nx.topological_sort(self.graph))
+        """Get topological order of graph.
+
+        The order is cached and updated incrementally on edits through
+        the JobGraph methods, which reject edges closing a cycle.
+        """
+        return list(self._get_topo().order())
 
     @property
     def map_topology(self):
-        """Get map of topology."""
-        node_to_index = {n: i for i, n in enumerate(self._nodes)}
-        return {node_to_index[node]: i
-                for i, node in enumerate(self.topological)}
+        """Get map from node index (insertion order) to topological index."""
+        key = (self._version, id(self.graph))
+        if self._topo_map is None or self._topo_map[0] != key:
+            node_to_index = {n: i for i, n in enumerate(self.graph.nodes)}
+            self._topo_map = (key, {node_to_index[node]: i for i, node
+                                    in enumerate(self._get_topo().order())})
+        return dict(self._topo_map[1])
+
+    def critical_path_priorities(self,
+                                 default_weight: float = 1.0
+                                 ) -> Dict[str, float]:
+        """Get length of the longest weighted path from each node to a sink.
+
+        Edges without `weight` count as `default_weight`. Nodes on the
+        critical path of the workflow get the highest values, submitting
+        them first minimizes the end-to-end time of the workflow.
+        """
+        priorities: Dict[str, float] = {}
+        succ = self.graph.succ
+        for node in reversed(self.topological):
+            longest = 0.0
+            for v, edge in succ[node].items():
+                weight = edge.get('weight')
+                weight = default_weight if weight is None else weight
+                longest = max(longest, weight + priorities[v])
+            priorities[node] = longest
+        return priorities
+
+    def prioritize(self, default_weight: float = 1.0) -> Dict[str, float]:
+        """Store critical-path priorities as node attribute `priority`.
+
+        The priorities are recomputed (with the same `default_weight`) by
+        `ready_nodes`, `submission_order` and `nice_values` once the graph
+        `version` changes or an edge weight is updated.
+        """
+        priorities = self.critical_path_priorities(default_weight)
+        for node, priority in priorities.items():
+            self.update_node_attrs(node, priority=priority)
+        self._priority_version = self._version
+        self._default_weight = default_weight
+        return priorities
+
+    def _refresh_priorities(self):
+        """Recompute priorities if the graph changed since `prioritize`."""
+        if self._priority_version != self._version:
+            self.prioritize(self._default_weight)
+
+    def submission_order(self, nodes: Optional[Iterable] = None) -> list:
+        """Get topological order preferring nodes with high priority.
+
+        Parameters
+        ----------
+        nodes : iterable, optional
+            Restrict order to these nodes, defaults to all nodes.
+
+        Returns
+        -------
+        list
+            Nodes such that every node comes after its ancestors and, among
+            the nodes that could come next, the one with the highest
+            `priority` attribute is picked first.
+
+        """
+        graph_nodes = self.graph.nodes
+        self._refresh_priorities()
+        subset = (set(graph_nodes) if nodes is None
+                  else {n for n in nodes if n in graph_nodes})
+        # insertion position breaks ties, keeping the order deterministic
+        position = {n: i for i, n in enumerate(graph_nodes) if n in subset}
+        indegree = {n: sum(1 for u in self.graph.predecessors(n)
+                           if u in subset)
+                    for n in subset}
+        heap = [(-graph_nodes[n]['priority'], position[n], n)
+                for n, d in indegree.items() if d == 0]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            order.append(node)
+            for v in self.graph.successors(node):
+                if v not in subset:
+                    continue
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    heapq.heappush(heap, (-graph_nodes[v]['priority'],
+                                          position[v], v))
+        if len(order) != len(subset):
+            raise ValueError('Graph contains a cycle')
+        return order
+
+    def nice_values(self, max_nice: int = 10000) -> Dict[str, int]:
+        """Map priorities to scheduler nice values (e.g. SLURM `--nice`).
+
+        Nodes on the critical path get 0, the least critical `max_nice`.
+        """
+        graph_nodes = self.graph.nodes
+        self._refresh_priorities()
+        priorities = {n: graph_nodes[n]['priority'] for n in graph_nodes}
+        top = max(priorities.values(), default=0.0)
+        if top <= 0:
+            return {n: 0 for n in priorities}
+        return {n: round(max_nice * (1.0 - p / top))
+                for n, p in priorities.items()}
+
+    def fingerprints(self) -> Dict[str, str]:
+        """Get Merkle fingerprints of all nodes in topological order."""
+        return merkle_fingerprints(self.graph, self._get_topo().order())
+
+    def reuse(self, previous: 'JobGraph') -> list:
+        """Take over results of unchanged nodes from a previous run.
+
+        A node is unchanged if its fingerprint equals the fingerprint of
+        the same node in `previous`, i.e. neither its job nor any job
+        upstream of it changed. Unchanged nodes that completed in
+        `previous` get its `reuse_attr` (status, ids and outputs) and are
+        not run again, like targets of `make`. Outputs read from a file
+        are converted back to `Output`. Nodes with `rerun` or
+        `force_recompute` set on a task are never reused, nor are nodes
+        with a parent that is run again.
+
+        Returns
+        -------
+        list
+            Reused nodes.
+
+        """
+        old = previous.fingerprints()
+        old_nodes = previous.graph.nodes
+        graph_nodes = self.graph.nodes
+        pred = self.graph.pred
+        reused: dict = {}
+        for node, fingerprint in self.fingerprints().items():
+            if old.get(node) != fingerprint:
+                continue
+            attrs = old_nodes[node]
+            if (get_property(attrs, 'status') != 'COMPLETED'
+                    or any(u not in reused for u in pred[node])
+                    or _forces_rerun(graph_nodes[node])):
+                continue
+            values = {k: get_property(attrs, k) for k in reuse_attr
+                      if has_property(attrs, k)}
+            if values.get('outputs'):
+                values['outputs'] = [Output().from_dict(o)
+                                     if isinstance(o, Mapping) else o
+                                     for o in values['outputs']]
+            self.update_node_attrs(node, **values)
+            reused[node] = None
+        self.logger.debug(f'Reusing {len(reused)} of {len(graph_nodes)} '
+                          'nodes from previous run')
+        return list(reused)
+
+    def render(self, filename=None, file_format: Optional[str] = None,
+               collapse: bool = True,
+               title: Optional[str] = None) -> Optional[str]:
+        """Render graph as SVG or DOT without matplotlib.
+
+        Nodes are collapsed into groups per topological layer and status
+        unless `collapse` is False, see `hyrun.job.render.render`.
+        """
+        return render_graph(self.graph, self._get_topo().generations(),
+                            filename=filename, file_format=file_format,
+                            collapse=collapse, title=title)
 
     def show(self, title=None, node_color=None, node_size=None,
              node_shape=None):
-        """Show graph."""
+        """Show graph with matplotlib, see `render` for large graphs."""
         title = title or 'Job Graph'
         node_color = node_color or 'white'
         node_size = node_size or 600
         node_shape = node_shape or 's'
         import matplotlib.pyplot as plt
-        for layer, nodes in enumerate(nx.topological_generations(self.graph)):
+        generations = self._get_topo().generations()
+        for layer, nodes in enumerate(generations):
             for node in nodes:
                 self.graph.nodes[node]['layer'] = layer
-        pos = nx.multipartite_layout(self.graph, subset_key='layer')
+        graph = self.to_networkx()
+        pos = nx.multipartite_layout(graph, subset_key='layer')
         fig, ax = plt.subplots()
         labels = {node: f'{node[0:7]}...'
                   if len(node) > 7 else node
-                  for node in self.graph.nodes}
-        nx.draw_networkx(self.graph, pos=pos, ax=ax, node_size=node_size,
+                  for node in graph.nodes}
+        nx.draw_networkx(graph, pos=pos, ax=ax, node_size=node_size,
                          node_color=node_color, with_labels=True,
                          node_shape=node_shape,
                          arrowsize=20, font_size=10, font_weight='bold',
@@ -379,3 +1415,14 @@ class JobGraph(Graph):
         ax.set_title(title)
         fig.tight_layout()
         plt.show()
+
+
+def _forces_rerun(attrs: Mapping) -> bool:
+    """Check if a task of the job of a node requests a rerun."""
+    for task in getattr(attrs.get('job'), 'tasks', None) or []:
+        for flag in ('rerun', 'force_recompute'):
+            value = (task.get(flag) if isinstance(task, dict)
+                     else getattr(task, flag, None))
+            if value:
+                return True
+    return False
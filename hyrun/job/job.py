@@ -1,4 +1,6 @@
 
+import json
+import sys
 from dataclasses import asdict, dataclass, field, fields
 from functools import singledispatch
 from hashlib import sha256
@@ -6,10 +8,13 @@ from typing import Any, List, Optional
 
 from hyset.v2 import RunSettings
 
-from .output import Output
+from .output import CompactOutput, Output
+from .serialize import encode_content
 
 # from tqdm import tqdm
 
+hash_exclude = ['logger']
+
 
 @dataclass
 class Job:
@@ -26,32 +31,143 @@ class Job:
 
     def __post_init__(self):
         """Post init."""
-        # self.set_hash()
         self.tasks = ([self.tasks]
                       if not isinstance(self.tasks, list) else self.tasks)
         check_common_dataclass(self.tasks,
                                keys=['database', 'scheduler', 'connection'])
-
-    # def set_hash(self):
-    #     """Get hash of the job."""
-    #     if self.hash:
-    #         return
-    #     txt = ''
-    #     if self.job_script:
-    #         txt += getattr(self.job_script, 'content', '') or ''
-    #     if self.tasks:
-    #         task = self.tasks[0]
-    #         for attr, keys in [
-    #             ('connection', ['host', 'user']),
-    #             ('scheduler', ['scheduler_type', 'slurm_account']),
-    #             ('database', ['database_type', 'database_name']),
-    #         ]:
-    #             obj = getattr(task, attr, None)
-    #             if obj:
-    #                 d = asdict(obj) if hasattr(obj, '__dataclass_fields__') else obj
-    #                 for key in keys:
-    #                     txt += d.get(key, '') or ''
-    #     self.hash = sha256(txt.encode()).hexdigest()
+        self.set_hash()
+
+    def set_hash(self):
+        """Set content hash of the job.
+
+        The hash only depends on what is executed (job script and tasks),
+        so that identical jobs get the same hash and are run only once.
+        Jobs without content keep `hash=None`. Task fields in
+        `hash_exclude` are ignored. Content that `serialize.encode_content`
+        can not convert (e.g. objects whose repr holds a memory address)
+        also leaves `hash=None`, such jobs are not deduplicated.
+        """
+        if self.hash or not (self.job_script or self.tasks):
+            return
+        script = getattr(self.job_script, 'content', self.job_script)
+        try:
+            txt = json.dumps([script, [_task_content(t) for t in self.tasks]],
+                             sort_keys=True, default=encode_content)
+        except (TypeError, ValueError):
+            return
+        self.hash = sha256(txt.encode()).hexdigest()
+
+
+def _task_content(task: Any) -> Any:
+    """Get hashable content of a task."""
+    if hasattr(task, '__dataclass_fields__'):
+        return {f.name: getattr(task, f.name) for f in fields(task)
+                if f.name not in hash_exclude}
+    if isinstance(task, dict):
+        return {k: v for k, v in task.items() if k not in hash_exclude}
+    return task
+
+
+class _FrozenList(list):
+    """Read-only list shared by all compact jobs without items."""
+
+    def _readonly(self, *args, **kwargs):
+        """Raise error on mutation."""
+        raise TypeError('Shared empty list is read-only, assign a new list')
+
+    append = extend = insert = pop = remove = clear = _readonly
+    sort = reverse = __setitem__ = __delitem__ = __iadd__ = _readonly
+    __imul__ = _readonly
+
+    def __reduce__(self):
+        """Copy and unpickle as the shared instance."""
+        return 'empty_list'
+
+
+class _FrozenDict(dict):
+    """Read-only dict shared by all compact jobs without metadata."""
+
+    def _readonly(self, *args, **kwargs):
+        """Raise error on mutation."""
+        raise TypeError('Shared empty dict is read-only, assign a new dict')
+
+    update = setdefault = pop = popitem = clear = _readonly
+    __setitem__ = __delitem__ = __ior__ = _readonly
+
+    def __reduce__(self):
+        """Copy and unpickle as the shared instance."""
+        return 'empty_dict'
+
+
+empty_list: List[Any] = _FrozenList()
+empty_dict: dict = _FrozenDict()
+
+
+@dataclass(init=False)
+class CompactJob:
+    """Job with slots, shared empty containers and interned status.
+
+    Has the same fields, hash and serialised form as `Job`, but no
+    instance dict. Empty `metadata`, `tasks` and `outputs` are the shared
+    read-only `empty_dict` and `empty_list`, so assign new containers
+    instead of mutating them. Status strings are interned.
+    """
+
+    __slots__ = tuple(Job.__annotations__)
+
+    job_id: Optional[int]
+    db_id: Optional[int]
+    job_script: Optional[str]
+    status: Optional[str]
+    hash: Optional[str]
+    metadata: Optional[dict]
+    tasks: Optional[List[Any]]
+    outputs: Optional[List[Any]]
+
+    def __init__(self, job_id=None, db_id=None, job_script=None,
+                 status=None, hash=None, metadata=None, tasks=None,
+                 outputs=None):
+        """Initialize job."""
+        if tasks is not None and not isinstance(tasks, list):
+            tasks = [tasks]
+        self.job_id = job_id
+        self.db_id = db_id
+        self.job_script = job_script
+        self.status = status
+        self.hash = hash
+        self.metadata = metadata or empty_dict
+        self.tasks = tasks or empty_list
+        self.outputs = outputs or empty_list
+        check_common_dataclass(self.tasks,
+                               keys=['database', 'scheduler', 'connection'])
+        self.set_hash()
+
+    def __setattr__(self, name, value):
+        """Set attribute, interning status strings."""
+        if name == 'status' and type(value) is str:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    set_hash = Job.set_hash
+
+    @classmethod
+    def from_job(cls, job: Job) -> 'CompactJob':
+        """Convert Job to CompactJob, outputs to CompactOutput."""
+        outputs = [CompactOutput.from_output(o) if isinstance(o, Output)
+                   else o for o in job.outputs or []]
+        return cls(job_id=job.job_id, db_id=job.db_id,
+                   job_script=job.job_script, status=job.status,
+                   hash=job.hash, metadata=job.metadata, tasks=job.tasks,
+                   outputs=outputs)
+
+    def to_job(self) -> Job:
+        """Convert to Job with its own containers."""
+        outputs = [o.to_output() if isinstance(o, CompactOutput) else o
+                   for o in self.outputs]
+        return Job(job_id=self.job_id, db_id=self.db_id,
+                   job_script=self.job_script, status=self.status,
+                   hash=self.hash, metadata=dict(self.metadata),
+                   tasks=list(self.tasks), outputs=outputs)
 
 @singledispatch
 def get_job(job: Any) -> Job:
@@ -68,6 +184,11 @@ def _(job: Job) -> Job:
     """Convert Job to Job."""
     return job
 
+@get_job.register(CompactJob)
+def _(job: CompactJob) -> CompactJob:
+    """Convert CompactJob to CompactJob."""
+    return job
+
 @get_job.register(dict)
 def _(job: dict) -> Job:
     """Convert dictionary to Job."""
@@ -26,3 +26,49 @@ class Output:
             if key in self.__annotations__:
                 setattr(self, key, value)
         return self
+
+
+@dataclass(init=False)
+class CompactOutput:
+    """Output with slots instead of an instance dict.
+
+    Has the same fields and serialised form as `Output`.
+    """
+
+    __slots__ = tuple(Output.__annotations__)
+
+    files_to_parse: Optional[PathLikeList]
+    output_file: Optional[PathLike]
+    output_folder: Optional[PathLike]
+    stdout: Optional[PathLike]
+    stderr: Optional[PathLike]
+    stdout_file: Optional[PathLike]
+    stderr_file: Optional[PathLike]
+    returncode: Optional[int]
+    error: Optional[Exception]
+
+    def __init__(self, files_to_parse=None, output_file=None,
+                 output_folder=None, stdout=None, stderr=None,
+                 stdout_file=None, stderr_file=None, returncode=None,
+                 error=None):
+        """Initialize output."""
+        self.files_to_parse = files_to_parse
+        self.output_file = output_file
+        self.output_folder = output_folder
+        self.stdout = stdout
+        self.stderr = stderr
+        self.stdout_file = stdout_file
+        self.stderr_file = stderr_file
+        self.returncode = returncode
+        self.error = error
+
+    from_dict = Output.from_dict
+
+    @classmethod
+    def from_output(cls, output: Output) -> 'CompactOutput':
+        """Convert Output to CompactOutput."""
+        return cls(**{k: getattr(output, k) for k in cls.__slots__})
+
+    def to_output(self) -> Output:
+        """Convert to Output."""
+        return Output(**{k: getattr(self, k) for k in self.__slots__})
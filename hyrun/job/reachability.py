@@ -0,0 +1,179 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class ReachabilityIndex:
+    """Transitive closure of a DAG stored as integer bitsets.
+
+    Every node gets a bit position, and the ancestors and descendants of
+    a node are Python ints with the bits of those nodes set. Checking
+    reachability is a shift and a mask. Listing ancestors or descendants
+    scans the bitset once, O(V) but in C, plus the size of the result.
+    Adding an edge ORs the new reachability into the affected nodes.
+    Removing an edge or node recomputes only the ancestors of its source
+    and the descendants of its target.
+
+    Parameters
+    ----------
+    graph : graph
+        networkx.DiGraph-like graph (`nodes`, `succ`, `pred`), only read.
+
+    """
+
+    def __init__(self, graph):
+        """Initialize index."""
+        self.graph = graph
+        self._pos: Dict[Any, int] = {}
+        self._labels: List[Any] = []
+        self._free: List[int] = []
+        self._desc: Dict[Any, int] = {}
+        self._anc: Dict[Any, int] = {}
+        self.rebuild()
+
+    def rebuild(self):
+        """Build index from scratch in topological order."""
+        self._pos, self._labels, self._free = {}, [], []
+        self._desc, self._anc = {}, {}
+        g = self.graph
+        order = _topological_order(g)
+        for n in order:
+            self.add_node(n)
+        anc, desc, pos = self._anc, self._desc, self._pos
+        for n in order:
+            for u in g.pred[n]:
+                anc[n] |= anc[u] | (1 << pos[u])
+        for n in reversed(order):
+            for v in g.succ[n]:
+                desc[n] |= desc[v] | (1 << pos[v])
+
+    def __contains__(self, node) -> bool:
+        """Check if node is indexed."""
+        return node in self._pos
+
+    def add_node(self, node):
+        """Add node without edges."""
+        if node in self._pos:
+            return
+        if self._free:
+            i = self._free.pop()
+            self._labels[i] = node
+        else:
+            i = len(self._labels)
+            self._labels.append(node)
+        self._pos[node] = i
+        self._desc[node] = 0
+        self._anc[node] = 0
+
+    def add_edge(self, u, v):
+        """Update index after edge u -> v was added to the graph."""
+        self.add_node(u)
+        self.add_node(v)
+        pos, anc, desc = self._pos, self._anc, self._desc
+        new_desc = desc[v] | (1 << pos[v])
+        new_anc = anc[u] | (1 << pos[u])
+        for a in self._iter_bits(anc[u] | (1 << pos[u])):
+            desc[a] |= new_desc
+        for d in self._iter_bits(desc[v] | (1 << pos[v])):
+            anc[d] |= new_anc
+
+    def remove_edge(self, u, v):
+        """Update index after edge u -> v was removed from the graph."""
+        self._recompute_desc(self._anc[u] | (1 << self._pos[u]))
+        self._recompute_anc(self._desc[v] | (1 << self._pos[v]))
+
+    def remove_node(self, node):
+        """Update index after node and its edges were removed."""
+        i = self._pos.pop(node)
+        mask = ~(1 << i)
+        ancestors = self._anc.pop(node)
+        descendants = self._desc.pop(node)
+        for n in self._iter_bits(ancestors):
+            self._desc[n] &= mask
+        for n in self._iter_bits(descendants):
+            self._anc[n] &= mask
+        self._labels[i] = None
+        self._free.append(i)
+        self._recompute_desc(ancestors)
+        self._recompute_anc(descendants)
+
+    def is_ancestor(self, u, v) -> bool:
+        """Check if u is an ancestor of v."""
+        return bool(self._anc[v] >> self._pos[u] & 1)
+
+    def ancestors(self, node) -> List[Any]:
+        """Get ancestors of node."""
+        return list(self._iter_bits(self._anc[node]))
+
+    def descendants(self, node) -> List[Any]:
+        """Get descendants of node."""
+        return list(self._iter_bits(self._desc[node]))
+
+    def ancestors_of(self, nodes: Iterable) -> List[Any]:
+        """Get union of the ancestors of nodes."""
+        return list(self._iter_bits(self._union(self._anc, nodes)))
+
+    def descendants_of(self, nodes: Iterable) -> List[Any]:
+        """Get union of the descendants of nodes."""
+        return list(self._iter_bits(self._union(self._desc, nodes)))
+
+    def _union(self, sets: Dict[Any, int], nodes: Iterable) -> int:
+        """Get union of the bitsets of nodes."""
+        bits = 0
+        for n in nodes:
+            bits |= sets[n]
+        return bits
+
+    def _iter_bits(self, bits: int) -> Iterator:
+        """Iterate over the nodes of a bitset.
+
+        Costs one O(V) pass over the binary digits in C. Stripping the
+        lowest bit with `bits & -bits` instead costs O(V) per node, as
+        every operation copies the big int.
+        """
+        labels = self._labels
+        digits = bin(bits)[:1:-1]
+        i = digits.find('1')
+        while i != -1:
+            yield labels[i]
+            i = digits.find('1', i + 1)
+
+    def _recompute_desc(self, bits: int):
+        """Recompute descendants of the nodes in bits."""
+        g, pos, desc = self.graph, self._pos, self._desc
+        nodes = list(self._iter_bits(bits))
+        for n in reversed(_topological_order(g, nodes)):
+            value = 0
+            for v in g.succ[n]:
+                value |= desc[v] | (1 << pos[v])
+            desc[n] = value
+
+    def _recompute_anc(self, bits: int):
+        """Recompute ancestors of the nodes in bits."""
+        g, pos, anc = self.graph, self._pos, self._anc
+        nodes = list(self._iter_bits(bits))
+        for n in _topological_order(g, nodes):
+            value = 0
+            for u in g.pred[n]:
+                value |= anc[u] | (1 << pos[u])
+            anc[n] = value
+
+
+def _topological_order(graph, nodes: Optional[List] = None) -> list:
+    """Get topological order of (a subset of) the nodes of a graph."""
+    subset = set(graph.nodes if nodes is None else nodes)
+    pred = graph.pred
+    indegree = {n: sum(1 for u in pred[n] if u in subset) for n in subset}
+    stack = [n for n in (graph.nodes if nodes is None else nodes)
+             if indegree[n] == 0]
+    order = []
+    succ = graph.succ
+    while stack:
+        n = stack.pop()
+        order.append(n)
+        for v in succ[n]:
+            if v in indegree:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    stack.append(v)
+    if len(order) != len(subset):
+        raise ValueError('Graph contains a cycle')
+    return order
@@ -0,0 +1,164 @@
+from collections import Counter
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .status import job_status_map
+
+status_colors = {0: 'white', 10: 'lightyellow', 20: 'lightblue',
+                 30: 'palegreen', 40: 'salmon'}
+box_width, box_height, margin = 120, 36, 24
+
+
+def aggregate(graph, generations: List[list],
+              collapse: bool = True) -> Tuple[Dict[tuple, int], Counter]:
+    """Group nodes by topological layer and status.
+
+    Parameters
+    ----------
+    graph : graph
+        networkx.DiGraph-like graph.
+    generations : list
+        Topological generations of the graph.
+    collapse : bool
+        If False, every node is its own group.
+
+    Returns
+    -------
+    tuple
+        Mapping from group (layer, status, node or None) to the number of
+        its nodes, and counts of the edges between groups.
+
+    """
+    graph_nodes = graph.nodes
+    group_of: Dict[Any, tuple] = {}
+    groups: Counter = Counter()
+    for layer, nodes in enumerate(generations):
+        for n in nodes:
+            status = graph_nodes[n].get('status')
+            group = (layer, status, None if collapse else n)
+            group_of[n] = group
+            groups[group] += 1
+    edges: Counter = Counter((group_of[u], group_of[v])
+                             for u, v in graph.edges)
+    return dict(groups), edges
+
+
+def _label(group: tuple, count: int) -> str:
+    """Get label of a group."""
+    _, status, node = group
+    if node is not None:
+        node = str(node)
+        return f'{node[:7]}...' if len(node) > 7 else node
+    return f'{status or "-"} ({count})'
+
+
+def _color(group: tuple) -> str:
+    """Get fill color of a group."""
+    return status_colors.get(job_status_map.get(group[1], 0), 'white')
+
+
+def _ids(groups: Dict[tuple, int]) -> Dict[tuple, str]:
+    """Get identifiers of groups in layer and status order."""
+    ordered = sorted(groups, key=lambda g: (g[0], str(g[1]), str(g[2])))
+    return {g: f'g{i}' for i, g in enumerate(ordered)}
+
+
+def _quote(text: str) -> str:
+    """Quote text as DOT string, escaping backslashes and quotes."""
+    text = text.replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + text.replace('\n', '\\n') + '"'
+
+
+def to_dot(groups: Dict[tuple, int], edges: Counter,
+           title: Optional[str] = None) -> str:
+    """Get DOT source of aggregated graph."""
+    ids = _ids(groups)
+    lines = ['digraph {',
+             f'  label={_quote(title or "Job Graph")};',
+             '  rankdir=TB;',
+             '  node [shape=box, style=filled];']
+    by_layer: Dict[int, list] = {}
+    for group, i in ids.items():
+        by_layer.setdefault(group[0], []).append(i)
+        label = _quote(_label(group, groups[group]))
+        lines.append(f'  {i} [label={label}, '
+                     f'fillcolor="{_color(group)}"];')
+    for members in by_layer.values():
+        lines.append(f'  {{rank=same; {"; ".join(members)};}}')
+    for (gu, gv), count in edges.items():
+        attrs = f' [label="{count}"]' if count > 1 else ''
+        lines.append(f'  {ids[gu]} -> {ids[gv]}{attrs};')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def to_svg(groups: Dict[tuple, int], edges: Counter,
+           title: Optional[str] = None) -> str:
+    """Get SVG of aggregated graph, one row per topological layer."""
+    ids = _ids(groups)
+    rows: Dict[int, list] = {}
+    for group in ids:
+        rows.setdefault(group[0], []).append(group)
+    columns = max((len(r) for r in rows.values()), default=0)
+    width = columns * (box_width + margin) + margin
+    height = len(rows) * (box_height + 2 * margin) + 2 * margin
+    pos = {}
+    for layer, row in rows.items():
+        offset = (width - len(row) * (box_width + margin) + margin) / 2
+        for i, group in enumerate(row):
+            pos[group] = (offset + i * (box_width + margin),
+                          2 * margin + layer * (box_height + 2 * margin))
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+           f'height="{height:.0f}" font-family="sans-serif" '
+           'font-size="12">',
+           f'<text x="{margin}" y="{margin}" font-weight="bold">'
+           f'{escape(title or "Job Graph")}</text>']
+    for (gu, gv), count in edges.items():
+        (x1, y1), (x2, y2) = pos[gu], pos[gv]
+        out.append(f'<line x1="{x1 + box_width / 2:.1f}" '
+                   f'y1="{y1 + box_height:.1f}" '
+                   f'x2="{x2 + box_width / 2:.1f}" y2="{y2:.1f}" '
+                   f'stroke="gray" stroke-width="{min(1 + count / 10, 8):.1f}"'
+                   f'><title>{count}</title></line>')
+    for group, (x, y) in pos.items():
+        out.append(f'<g id="{ids[group]}"><rect x="{x:.1f}" y="{y:.1f}" '
+                   f'width="{box_width}" height="{box_height}" '
+                   f'fill="{_color(group)}" stroke="black"/>'
+                   f'<text x="{x + box_width / 2:.1f}" '
+                   f'y="{y + box_height / 2 + 4:.1f}" text-anchor="middle">'
+                   f'{escape(_label(group, groups[group]))}</text></g>')
+    out.append('</svg>')
+    return '\n'.join(out) + '\n'
+
+
+def render(graph, generations: List[list], filename=None,
+           file_format: Optional[str] = None, collapse: bool = True,
+           title: Optional[str] = None) -> Optional[str]:
+    """Render graph headless as SVG or DOT.
+
+    Nodes are collapsed into one box per topological layer and status,
+    labelled with the number of nodes, and parallel edges between boxes
+    into one edge. The cost is linear in the size of the graph.
+
+    Parameters
+    ----------
+    filename : str or Path, optional
+        File to write to. If not given, the rendered text is returned.
+    file_format : str, optional
+        'svg' or 'dot', defaults to the file suffix or 'svg'.
+
+    """
+    if file_format is None and filename is not None:
+        file_format = Path(filename).suffix.lstrip('.').lower() or None
+    file_format = file_format or 'svg'
+    formats = {'svg': to_svg, 'dot': to_dot, 'gv': to_dot}
+    if file_format not in formats:
+        raise ValueError(f'Unsupported render format: {file_format}. '
+                         f'Available formats: {list(formats)}')
+    groups, edges = aggregate(graph, generations, collapse)
+    text = formats[file_format](groups, edges, title)
+    if filename is None:
+        return text
+    Path(filename).write_text(text)
+    return None
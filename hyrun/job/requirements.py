@@ -0,0 +1,127 @@
+import operator
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Mapping, Union
+
+run_operators = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+elements = ['node', 'edge']
+_missing = object()
+
+
+def get_property(attrs: Mapping, prop: str) -> Any:
+    """Get property from attributes, falling back to the referenced job.
+
+    The job is a dict if the graph was read from a file.
+    """
+    value = attrs.get(prop, _missing)
+    if value is _missing:
+        job = attrs.get('job')
+        if isinstance(job, Mapping):
+            return job.get(prop)
+        return getattr(job, prop, None)
+    return value
+
+
+def has_property(attrs: Mapping, prop: str) -> bool:
+    """Check if attributes or the referenced job have a property."""
+    if prop in attrs:
+        return True
+    job = attrs.get('job')
+    return prop in job if isinstance(job, Mapping) else hasattr(job, prop)
+
+
+@dataclass(frozen=True)
+class RunRequirement:
+    """Compiled run requirement of a JobGraph.
+
+    The requirement reads `element.prop <op> value`, e.g. the default
+    `node.status == 'COMPLETED'`. The operator is resolved once, so that
+    evaluating the requirement is a single function call.
+    """
+
+    element: str = 'node'
+    prop: str = 'status'
+    op: str = '=='
+    value: Any = None
+    func: Callable = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Post init."""
+        if self.element not in elements:
+            raise ValueError(f'Unsupported element: {self.element}')
+        func = run_operators.get(self.op)
+        if func is None:
+            raise ValueError(f'Unsupported operator: {self.op}')
+        object.__setattr__(self, 'func', func)
+
+    @classmethod
+    def from_dict(cls, cond: Mapping) -> 'RunRequirement':
+        """Create requirement from dictionary."""
+        return cls(element=cond.get('element', 'node'),
+                   prop=cond.get('property', 'status'),
+                   op=cond.get('operator', '=='),
+                   value=cond.get('value'))
+
+    def to_dict(self) -> dict:
+        """Convert requirement to dictionary."""
+        return {'element': self.element, 'property': self.prop,
+                'operator': self.op, 'value': self.value}
+
+    def __call__(self, attrs: Mapping) -> bool:
+        """Evaluate requirement on node or edge attributes."""
+        return self.func(get_property(attrs, self.prop), self.value)
+
+
+@dataclass(frozen=True)
+class RunRequirements:
+    """Compiled set of run requirements."""
+
+    requirements: tuple = ()
+    node_requirements: tuple = field(init=False, repr=False, compare=False)
+    edge_requirements: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Post init."""
+        object.__setattr__(self, 'node_requirements',
+                           tuple(r for r in self.requirements
+                                 if r.element == 'node'))
+        object.__setattr__(self, 'edge_requirements',
+                           tuple(r for r in self.requirements
+                                 if r.element == 'edge'))
+
+    def __iter__(self):
+        """Iterate over requirements."""
+        return iter(self.requirements)
+
+    def __len__(self) -> int:
+        """Get number of requirements."""
+        return len(self.requirements)
+
+    def node_fulfilled(self, attrs: Mapping) -> bool:
+        """Check if a node itself already meets a node requirement."""
+        return any(r(attrs) for r in self.node_requirements)
+
+    def edge_fulfilled(self, u_attrs: Mapping, edge_attrs: Mapping) -> bool:
+        """Check if dependency u -> v meets all requirements."""
+        return (all(r(u_attrs) for r in self.node_requirements)
+                and all(r(edge_attrs) for r in self.edge_requirements))
+
+
+def compile_requirements(
+        requirements: Union[RunRequirements,
+                            List[Union[dict, RunRequirement]]]
+        ) -> RunRequirements:
+    """Compile run requirements given as dictionaries."""
+    if isinstance(requirements, RunRequirements):
+        return requirements
+    if isinstance(requirements, (dict, RunRequirement)):
+        requirements = [requirements]
+    return RunRequirements(tuple(
+        r if isinstance(r, RunRequirement) else RunRequirement.from_dict(r)
+        for r in requirements))
@@ -0,0 +1,204 @@
+import gc
+import gzip
+import io
+import json
+import re
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from datetime import date, time, timedelta
+from enum import Enum
+from itertools import chain, islice
+from pathlib import PurePath
+from typing import IO, Any, Iterable, Iterator, Optional, Tuple
+
+file_formats = {'.json': 'json',
+                '.jsonl': 'jsonl', '.ndjson': 'jsonl',
+                '.msgpack': 'msgpack', '.mpk': 'msgpack'}
+compressions = {'.gz': 'gzip', '.gzip': 'gzip',
+                '.zst': 'zstd', '.zstd': 'zstd'}
+magic_numbers = {b'\x1f\x8b': 'gzip', b'\x28\xb5\x2f\xfd': 'zstd'}
+header_tag = 'hyrun.JobGraph'
+header_version = 1
+
+
+def infer_format(filename) -> Tuple[str, Optional[str]]:
+    """Get file format and compression from file name suffixes."""
+    suffixes = [s.lower() for s in PurePath(filename).suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in compressions:
+        compression = compressions[suffixes.pop()]
+    file_format = file_formats.get(suffixes[-1] if suffixes else '', 'json')
+    return file_format, compression
+
+
+def sniff_compression(filename) -> Optional[str]:
+    """Get compression from the magic number of a file."""
+    with open(filename, 'rb') as f:
+        head = f.read(4)
+    for magic, compression in magic_numbers.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def encode(obj: Any) -> Any:
+    """Convert objects not supported by json/msgpack."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} '
+                    'is not serializable')
+
+
+def encode_content(obj: Any) -> Any:
+    """Convert objects to a stable representation of their content.
+
+    Extends `encode` by enums, dates, named functions and classes, and by
+    the repr of other objects. Objects whose repr contains a memory
+    address or that are anonymous functions raise a TypeError, as they
+    differ between otherwise identical runs.
+    """
+    try:
+        return encode(obj)
+    except TypeError:
+        pass
+    if isinstance(obj, Enum):
+        return f'{type(obj).__qualname__}.{obj.name}'
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if callable(obj) and hasattr(obj, '__qualname__'):
+        if '<' in obj.__qualname__:
+            raise TypeError(f'Anonymous {obj.__qualname__} has no stable '
+                            'representation')
+        return f'{getattr(obj, "__module__", None)}.{obj.__qualname__}'
+    text = repr(obj)
+    if _address.search(text):
+        raise TypeError(f'Object of type {type(obj).__name__} '
+                        'has no stable representation')
+    return text
+
+
+_address = re.compile(r'0x[0-9a-fA-F]{6,}')
+
+
+def open_file(filename, mode: str, compression: Optional[str] = None) -> IO:
+    """Open file in binary mode, optionally (de)compressing on the fly."""
+    if compression is None:
+        return open(filename, mode + 'b')
+    if compression == 'gzip':
+        return gzip.open(filename, mode + 'b', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstd compression requires the zstandard '
+                              'package: pip install zstandard')
+        f = open(filename, mode + 'b')
+        if mode == 'w':
+            return zstandard.ZstdCompressor().stream_writer(f)
+        return io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(f))
+    raise ValueError(f'Unsupported compression: {compression}')
+
+
+def gen_records(graph, **header) -> Iterator:
+    """Generate header, node and edge records of a graph.
+
+    The header `{'format': ..., 'nodes': n, 'edges': m, **header}` is
+    followed by n node records `[node, attributes]` and m edge records
+    `[i, j, attributes]`, where i and j are positions of the nodes in the
+    stream. The graph is thus written node by node without repeating node
+    labels for every edge.
+    """
+    yield {'format': header_tag, 'version': header_version,
+           'nodes': graph.number_of_nodes(),
+           'edges': graph.number_of_edges(), **header}
+    index = {}
+    for i, (n, attrs) in enumerate(graph.nodes(data=True)):
+        index[n] = i
+        yield [n, attrs]
+    for u, v, attrs in graph.edges(data=True):
+        yield [index[u], index[v], attrs]
+
+
+@contextmanager
+def paused_gc():
+    """Pause the cyclic garbage collector.
+
+    The collector would otherwise run many times while millions of
+    attribute dicts are created, none of which are garbage.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_graph(records: Iterator, graph) -> dict:
+    """Add nodes and edges from records to graph, return the header."""
+    header = next(records)
+    nodes = islice(records, header['nodes'])
+    edges = islice(records, header['edges'])
+    labels: list = []
+
+    def gen_nodes():
+        for n, attrs in nodes:
+            labels.append(n)
+            yield n, attrs
+
+    with paused_gc():
+        graph.add_nodes_from(gen_nodes())
+        graph.add_edges_from((labels[i], labels[j], attrs)
+                             for i, j, attrs in edges)
+    return header
+
+
+def dump_records(records: Iterable, f: IO, file_format: str):
+    """Write records to binary file object."""
+    if file_format == 'msgpack':
+        packer = _import_msgpack().Packer(default=encode, use_bin_type=True)
+        for record in records:
+            f.write(packer.pack(record))
+    elif file_format == 'jsonl':
+        dumps = json.JSONEncoder(default=encode, separators=(',', ':'),
+                                 check_circular=False).encode
+        for record in records:
+            f.write(dumps(record).encode() + b'\n')
+    else:
+        raise ValueError(f'Unsupported streaming format: {file_format}')
+
+
+def load_records(f: IO, file_format: str) -> Iterator:
+    """Read records from binary file object, checking the header."""
+    if file_format == 'msgpack':
+        records = iter(_import_msgpack().Unpacker(f, raw=False,
+                                                  strict_map_key=False))
+    elif file_format == 'jsonl':
+        records = (json.loads(line) for line in f if line.strip())
+    else:
+        raise ValueError(f'Unsupported streaming format: {file_format}')
+    header = next(records, None)
+    if not isinstance(header, dict) or header.get('format') != header_tag:
+        raise ValueError('File does not contain a hyrun JobGraph')
+    if header.get('version', 0) > header_version:
+        raise ValueError('JobGraph file version '
+                         f'{header["version"]} is not supported')
+    return chain([header], records)
+
+
+def _import_msgpack():
+    """Import msgpack."""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError('msgpack format requires the msgpack package: '
+                          'pip install msgpack')
+    return msgpack
@@ -0,0 +1,154 @@
+from typing import Any, Dict, List, Optional
+
+_hole = object()
+
+
+class TopologyCache:
+    """Topological order and generations of a graph, kept across edits.
+
+    Both are computed on first access. The order is then maintained
+    incrementally with the algorithm of Pearce and Kelly: an edge u -> v
+    that contradicts the order only reorders the nodes between v and u
+    that are reachable from v or reach u, and an edge closing a cycle is
+    found on the way and rejected before it is added. The generations
+    are updated in place where that is cheap and marked stale otherwise:
+
+    - Adding a node appends it to the order and to generation 0.
+    - Adding an edge u -> v keeps the generations if v lies below u.
+    - Removing a node or an edge keeps the order and marks the
+      generations stale, as nodes below it may move up.
+
+    Parameters
+    ----------
+    graph : graph
+        networkx.DiGraph-like graph, only read.
+    backend : module
+        Module providing `topological_sort` and `topological_generations`
+        for the graph.
+
+    """
+
+    def __init__(self, graph, backend):
+        """Initialize cache."""
+        self.graph = graph
+        self.backend = backend
+        # nodes by position, removed nodes leave holes until compaction
+        self._slots: Optional[List[Any]] = None
+        self._holes = 0
+        self._pos: Dict[Any, int] = {}
+        self._order: Optional[List[Any]] = None
+        self._generations: Optional[List[List[Any]]] = None
+        self._level: Dict[Any, int] = {}
+
+    def order(self) -> List[Any]:
+        """Get topological order (not a copy)."""
+        if self._slots is None:
+            self._order = list(self.backend.topological_sort(self.graph))
+            self._slots = list(self._order)
+            self._holes = 0
+            self._pos = {n: i for i, n in enumerate(self._slots)}
+        elif self._order is None:
+            self._order = [n for n in self._slots if n is not _hole]
+        return self._order
+
+    def position(self, node) -> int:
+        """Get position of node in the topological order.
+
+        Positions increase along the order but need not be contiguous.
+        """
+        self.order()
+        return self._pos[node]
+
+    def generations(self) -> List[List[Any]]:
+        """Get topological generations (not a copy)."""
+        if self._generations is None:
+            self._generations = [
+                list(g) for g in
+                self.backend.topological_generations(self.graph)]
+            self._level = {n: i for i, g in enumerate(self._generations)
+                           for n in g}
+        return self._generations
+
+    def insert_edge(self, u, v):
+        """Reorder nodes for edge u -> v before it is added to the graph.
+
+        Raises
+        ------
+        ValueError
+            If the edge would close a cycle.
+
+        """
+        if u == v:
+            raise ValueError(f'Edge {u} -> {v} would create a cycle')
+        self.order()
+        pos = self._pos
+        if u not in pos or v not in pos or pos[u] < pos[v]:
+            return
+        lower, upper = pos[v], pos[u]
+        succ, pred = self.graph.succ, self.graph.pred
+        forward = self._search(v, succ, lambda n: pos[n] < upper, u)
+        if forward is None:
+            raise ValueError(f'Edge {u} -> {v} would create a cycle')
+        backward = self._search(u, pred, lambda n: pos[n] > lower)
+        nodes = (sorted(backward, key=pos.__getitem__)
+                 + sorted(forward, key=pos.__getitem__))
+        for n, i in zip(nodes, sorted(pos[n] for n in nodes)):
+            pos[n] = i
+            self._slots[i] = n
+        self._order = None
+
+    @staticmethod
+    def _search(start, adjacency, inside, target=None) -> Optional[list]:
+        """Get nodes reachable from start within bounds, None at target."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for w in adjacency[stack.pop()]:
+                if w == target:
+                    return None
+                if w not in seen and inside(w):
+                    seen.add(w)
+                    stack.append(w)
+        return list(seen)
+
+    def add_node(self, node):
+        """Update cache after node without edges was added."""
+        if self._slots is not None and node not in self._pos:
+            self._pos[node] = len(self._slots)
+            self._slots.append(node)
+            if self._order is not None:
+                self._order.append(node)
+        if self._generations is not None and node not in self._level:
+            if not self._generations:
+                self._generations.append([])
+            self._generations[0].append(node)
+            self._level[node] = 0
+
+    def add_edge(self, u, v):
+        """Update cache after edge u -> v was added."""
+        self.add_node(u)
+        self.add_node(v)
+        if self._slots is not None and self._pos[u] > self._pos[v]:
+            # added without insert_edge
+            self._slots = None
+        if (self._generations is not None
+                and self._level[u] >= self._level[v]):
+            self._generations = None
+
+    def remove_node(self, node):
+        """Update cache after node and its edges were removed."""
+        if self._slots is not None:
+            self._slots[self._pos.pop(node)] = _hole
+            self._holes += 1
+            self._order = None
+            if self._holes > len(self._slots) // 2:
+                self._slots = [n for n in self._slots if n is not _hole]
+                self._pos = {n: i for i, n in enumerate(self._slots)}
+                self._holes = 0
+        # the former successors of the node are not known anymore
+        self._generations = None
+
+    def remove_edge(self, u, v):
+        """Update cache after edge u -> v was removed."""
+        # the order stays valid, v may move to an earlier generation
+        self._generations = None
@@ -0,0 +1,95 @@
+from collections.abc import Set
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator
+
+
+class NodeSetView(Set):
+    """Read-only live view of a set of JobGraph nodes.
+
+    The view holds no nodes itself, it reads the buckets returned by
+    `buckets()` (dicts keyed by node, e.g. the status index of a JobGraph)
+    on every access. Creating a view is O(1) and it always reflects the
+    current state of the graph. Iteration runs over a snapshot taken when
+    it starts, so the graph may be changed while iterating, e.g.
+    `for n in g.frontier(): g.mark_status(n, 'SUBMITTED')`.
+    """
+
+    __slots__ = ('_buckets', '_graph')
+
+    def __init__(self, buckets: Callable[[], Iterable[dict]], graph=None):
+        """Initialize view."""
+        self._buckets = buckets
+        self._graph = graph
+
+    def __contains__(self, node: Any) -> bool:
+        """Check if node is in view."""
+        return any(node in bucket for bucket in self._buckets())
+
+    def __iter__(self) -> Iterator:
+        """Iterate over snapshot of the nodes in view."""
+        return iter(list(chain.from_iterable(self._buckets())))
+
+    def __len__(self) -> int:
+        """Get number of nodes in view."""
+        return sum(len(bucket) for bucket in self._buckets())
+
+    def __repr__(self) -> str:
+        """Get representation of view."""
+        return f'{type(self).__name__}({list(self)})'
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> set:
+        """Return plain sets from set operations."""
+        return set(it)
+
+    def with_descendants(self) -> 'ClosureView':
+        """Get view of the nodes and all their descendants."""
+        return ClosureView(self, self._graph)
+
+    def subgraph(self):
+        """Get read-only graph induced by the nodes of the view."""
+        return self._graph.graph.subgraph(list(self))
+
+
+class ClosureView(NodeSetView):
+    """Read-only live view of nodes and their descendants.
+
+    Iterating the view walks the successors of the base nodes, the cost is
+    proportional to the size of the closure, not of the graph.
+    """
+
+    __slots__ = ('_base',)
+
+    def __init__(self, base: NodeSetView, graph):
+        """Initialize view."""
+        super().__init__(self._closure, graph)
+        self._base = base
+
+    def _closure(self) -> Iterable[dict]:
+        """Get closure of the base nodes as a single bucket."""
+        succ = self._graph.graph.succ
+        seen = dict.fromkeys(self._base)
+        stack = list(seen)
+        while stack:
+            for v in succ[stack.pop()]:
+                if v not in seen:
+                    seen[v] = None
+                    stack.append(v)
+        return (seen,)
+
+    def __contains__(self, node: Any) -> bool:
+        """Check if node or one of its ancestors is a base node."""
+        if node not in self._graph.graph.nodes:
+            return False
+        pred = self._graph.graph.pred
+        seen = {node}
+        stack = [node]
+        while stack:
+            u = stack.pop()
+            if u in self._base:
+                return True
+            for w in pred[u]:
+                if w not in seen:
+                    seen.add(w)
+                    stack.append(w)
+        return False
@@ -2,8 +2,17 @@ from .job import JobGraph, job, get_workflow
 from hytools.logger import get_logger
 
 
-def run(*args, **kwargs):
-    """Run."""
-    logger = kwargs.pop('logger') or get_logger(print_level='DEBUG')
-    workflow = get_workflow(*args, **kwargs)
-    print(workflow)
\ No newline at end of file
+def run(*args, previous=None, **kwargs):
+    """Run.
+
+    If `previous` (JobGraph or file written by `JobGraph.write`) is
+    given, nodes unchanged since that run reuse its results and only the
+    changed nodes and their descendants are run, see `JobGraph.reuse`.
+    """
+    logger = kwargs.pop('logger', None) or get_logger(print_level='DEBUG')
+    workflow = get_workflow(*args, logger=logger, **kwargs)
+    if previous is not None:
+        previous = get_workflow(previous, logger=logger)
+        reused = workflow.reuse(previous)
+        logger.info(f'Reusing results of {len(reused)} unchanged jobs')
+    print(workflow)
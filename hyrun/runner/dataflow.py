@@ -0,0 +1,201 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from hytools.logger import LoggerDummy
+
+from hyrun.job.graph import JobGraph
+from hyrun.job.status import job_status_map
+
+finished_level = job_status_map['COMPLETED']
+
+
+@dataclass
+class DataflowExecutor:
+    """Barrier-free executor of a JobGraph.
+
+    A node is dispatched as soon as its predecessors satisfy the run
+    requirements of the graph, independent of the topological generation it
+    belongs to. Slow nodes thus only delay their own descendants.
+
+    Parameters
+    ----------
+    graph : JobGraph
+        Workflow to execute, statuses are updated in place.
+    submit : callable
+        `submit(node, attrs)` dispatches a node and may return its new
+        status, defaults to 'SUBMITTED'.
+    poll : callable
+        `poll(nodes)` returns a mapping from (a subset of) the given
+        in-flight nodes to their current status.
+    max_in_flight : int
+        Maximum number of dispatched but unfinished nodes, 0 is unbounded.
+    poll_interval, max_poll_interval, backoff : float
+        Waiting time between polls grows by `backoff` up to
+        `max_poll_interval` while no node finishes.
+    leases : LeaseManager, optional
+        Share the graph with other workers, only nodes leased by this
+        worker are dispatched.
+
+    """
+
+    graph: JobGraph
+    submit: Callable[[Any, dict], Optional[str]]
+    poll: Callable[[list], Mapping[Any, str]]
+    max_in_flight: int = 0
+    poll_interval: float = 1.0
+    max_poll_interval: float = 60.0
+    backoff: float = 2.0
+    by_priority: bool = True
+    logger: Any = None
+    sleep: Callable[[float], Any] = time.sleep
+    leases: Any = None
+    in_flight: Dict[Any, str] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        """Post init."""
+        if self.max_in_flight < 0:
+            raise ValueError('max_in_flight must be non-negative')
+        self.logger = self.logger or LoggerDummy()
+
+    @property
+    def capacity(self) -> int:
+        """Get number of nodes that can still be dispatched."""
+        if not self.max_in_flight:
+            return len(self.graph.graph.nodes)
+        return max(self.max_in_flight - len(self.in_flight), 0)
+
+    def dispatch(self, limit: Optional[int] = None) -> list:
+        """Submit ready nodes up to the in-flight bound and `limit`.
+
+        Nodes that become ready because `submit` returned a final status
+        are submitted in the same call.
+        """
+        dispatched: list = []
+        while True:
+            capacity = self.capacity
+            if limit is not None:
+                capacity = min(capacity, limit - len(dispatched))
+            batch = self._dispatch_ready(capacity)
+            dispatched.extend(batch)
+            if all(node in self.in_flight for node in batch):
+                return dispatched
+
+    def _dispatch_ready(self, capacity: int) -> list:
+        """Submit up to `capacity` ready nodes."""
+        if capacity <= 0:
+            return []
+        nodes = self.graph.graph.nodes
+        dispatched = []
+        for node in self.graph.ready_nodes(by_priority=self.by_priority):
+            if len(dispatched) >= capacity:
+                break
+            if node in self.in_flight or not self._claim(node):
+                continue
+            self.logger.debug(f'Dispatching node {node}')
+            status = self.submit(node, nodes[node]) or 'SUBMITTED'
+            self.graph.mark_status(node, status)
+            dispatched.append(node)
+            if not self._finished(status):
+                self.in_flight[node] = status
+            elif self.leases is not None:
+                self.leases.release(node, status)
+        return dispatched
+
+    def _claim(self, node) -> bool:
+        """Lease node, applying its status if another worker ran it."""
+        if self.leases is None:
+            return True
+        status = self.leases.finished(node)
+        if status is not None:
+            self.logger.debug(f'Node {node} finished elsewhere with {status}')
+            self.graph.mark_status(node, status)
+            return False
+        return self.leases.acquire(node)
+
+    def demand(self) -> int:
+        """Get number of ready nodes waiting for dispatch."""
+        return sum(1 for n in self.graph.ready_nodes()
+                   if n not in self.in_flight)
+
+    def pending(self) -> bool:
+        """Check if nodes are in flight or ready, e.g. leased elsewhere."""
+        return bool(self.in_flight) or self.demand() > 0
+
+    def update(self, statuses: Mapping[Any, str]) -> list:
+        """Apply polled statuses, return nodes that finished."""
+        finished = []
+        for node, status in statuses.items():
+            if node not in self.in_flight or status == self.in_flight[node]:
+                continue
+            self.graph.mark_status(node, status)
+            if self._finished(status):
+                self.logger.debug(f'Node {node} finished with {status}')
+                del self.in_flight[node]
+                finished.append(node)
+                if self.leases is not None:
+                    self.leases.release(node, status)
+            else:
+                self.in_flight[node] = status
+        return finished
+
+    def refresh(self) -> list:
+        """Poll in-flight nodes once, return nodes that finished.
+
+        With `leases`, nodes taken over by another worker are no longer in
+        flight and wait for its result.
+        """
+        finished = []
+        if self.in_flight:
+            finished = self.update(self.poll(list(self.in_flight)))
+        if self.leases is not None:
+            for node in self.leases.renew(list(self.in_flight)):
+                del self.in_flight[node]
+                self.graph.mark_status(node, None)
+        return finished
+
+    def step(self) -> list:
+        """Poll in-flight nodes once and dispatch newly ready ones."""
+        finished = self.refresh()
+        self.dispatch()
+        return finished
+
+    def run(self, running: Optional[Iterable] = None) -> Dict[Any, str]:
+        """Execute graph until no node is in flight or ready.
+
+        Nodes in `running` were dispatched earlier and are polled again.
+        Nodes whose dependencies failed are never dispatched. With
+        `leases`, the executor also waits for ready nodes leased by other
+        workers. Returns the final status of all nodes.
+        """
+        graph_nodes = self.graph.graph.nodes
+        for node in running or []:
+            self.in_flight[node] = graph_nodes[node].get('status')
+            if self.leases is not None:
+                self.leases.acquire(node)
+        self.dispatch()
+        poll_until_done(self)
+        return {n: graph_nodes[n].get('status') for n in graph_nodes}
+
+    @staticmethod
+    def _finished(status: Optional[str]) -> bool:
+        """Check if status is final."""
+        return job_status_map.get(status, 0) >= finished_level
+
+
+def poll_until_done(runner):
+    """Step runner until nothing is pending.
+
+    The runner provides `pending()`, `step()` returning the finished nodes
+    and the `poll_interval`, `max_poll_interval`, `backoff` and `sleep`
+    settings. The waiting time between steps grows by `backoff` while no
+    node finishes.
+    """
+    interval = runner.poll_interval
+    while runner.pending():
+        runner.sleep(interval)
+        if runner.step():
+            interval = runner.poll_interval
+        else:
+            interval = min(interval * runner.backoff,
+                           runner.max_poll_interval)
@@ -0,0 +1,133 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+from hytools.logger import LoggerDummy
+
+from .dataflow import DataflowExecutor, poll_until_done
+
+
+@dataclass
+class FairShareScheduler:
+    """Dispatch the ready nodes of several workflows with fair shares.
+
+    Every workflow is driven by its own DataflowExecutor, whose
+    `max_in_flight` caps the in-flight jobs of that workflow. The
+    scheduler hands out the free slots of the shared `max_in_flight`
+    bound one by one, always to the workflow with the fewest in-flight
+    jobs per unit of weight that has ready nodes. Workflows with equal
+    usage take turns. Idle shares go to the workflows that can use them,
+    so the shared bound is filled while any workflow has work.
+
+    Parameters
+    ----------
+    max_in_flight : int
+        Maximum number of in-flight jobs of all workflows, 0 is unbounded.
+    poll_interval, max_poll_interval, backoff : float
+        Poll settings as for `DataflowExecutor`, shared by all workflows.
+
+    """
+
+    max_in_flight: int = 0
+    poll_interval: float = 1.0
+    max_poll_interval: float = 60.0
+    backoff: float = 2.0
+    logger: Any = None
+    sleep: Callable[[float], Any] = time.sleep
+    executors: Dict[Any, DataflowExecutor] = field(default_factory=dict,
+                                                   init=False)
+    weights: Dict[Any, float] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        """Post init."""
+        if self.max_in_flight < 0:
+            raise ValueError('max_in_flight must be non-negative')
+        self.logger = self.logger or LoggerDummy()
+        self._turn = 0
+        self._last: Dict[Any, int] = {}
+
+    def add(self, name, executor: DataflowExecutor, weight: float = 1.0):
+        """Add workflow driven by executor."""
+        if weight <= 0:
+            raise ValueError('weight must be positive')
+        if name in self.executors:
+            raise ValueError(f'Workflow {name} already exists')
+        self.executors[name] = executor
+        self.weights[name] = float(weight)
+        self._last[name] = 0
+
+    def remove(self, name) -> DataflowExecutor:
+        """Remove workflow, its in-flight nodes are no longer polled."""
+        self.weights.pop(name)
+        self._last.pop(name)
+        return self.executors.pop(name)
+
+    @property
+    def in_flight(self) -> int:
+        """Get number of in-flight jobs of all workflows."""
+        return sum(len(e.in_flight) for e in self.executors.values())
+
+    def allocate(self) -> Dict[Any, int]:
+        """Share free slots among workflows with ready nodes."""
+        free = (self.max_in_flight - self.in_flight if self.max_in_flight
+                else None)
+        heap = []
+        room = {}
+        for name, executor in self.executors.items():
+            room[name] = min(executor.demand(), executor.capacity)
+            if room[name] > 0:
+                usage = len(executor.in_flight) / self.weights[name]
+                heapq.heappush(heap, (usage, self._last[name], name))
+        slots = {name: 0 for name in room}
+        while heap and (free is None or free > 0):
+            _, _, name = heapq.heappop(heap)
+            slots[name] += 1
+            room[name] -= 1
+            self._turn += 1
+            self._last[name] = self._turn
+            if free is not None:
+                free -= 1
+            if room[name] > 0:
+                executor = self.executors[name]
+                usage = ((len(executor.in_flight) + slots[name])
+                         / self.weights[name])
+                heapq.heappush(heap, (usage, self._last[name], name))
+        return {name: n for name, n in slots.items() if n}
+
+    def pending(self) -> bool:
+        """Check if any workflow has nodes in flight or ready."""
+        return any(e.pending() for e in self.executors.values())
+
+    def dispatch(self) -> Dict[Any, list]:
+        """Dispatch ready nodes of all workflows by their shares.
+
+        Slots freed by nodes that finished on submission are shared again.
+        """
+        dispatched: Dict[Any, list] = {}
+        while True:
+            batch = {name: self.executors[name].dispatch(limit=n)
+                     for name, n in self.allocate().items()}
+            for name, nodes in batch.items():
+                dispatched.setdefault(name, []).extend(nodes)
+            if all(node in self.executors[name].in_flight
+                   for name, nodes in batch.items() for node in nodes):
+                return dispatched
+
+    def step(self) -> list:
+        """Poll in-flight nodes of all workflows once and dispatch."""
+        finished = [(name, node) for name, executor in self.executors.items()
+                    for node in executor.refresh()]
+        self.dispatch()
+        return finished
+
+    def run(self) -> Dict[Any, Dict[Any, str]]:
+        """Execute all workflows until none has nodes in flight or ready.
+
+        Returns the final status of the nodes of every workflow.
+        """
+        self.dispatch()
+        poll_until_done(self)
+        return {name: {n: e.graph.graph.nodes[n].get('status')
+                       for n in e.graph.graph.nodes}
+                for name, e in self.executors.items()}
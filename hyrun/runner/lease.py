@@ -0,0 +1,182 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from hytools.logger import LoggerDummy
+
+from hyrun.job.status import job_status_map
+
+finished_level = job_status_map['COMPLETED']
+
+
+class MemoryLeaseStore:
+    """Lease records of one process, shared by threads.
+
+    Lease records are dicts with the keys `owner`, `expires` (time stamp)
+    and `status` (final status of the node, None while running).
+    `compare_and_set` is atomic, so leases are exclusive.
+    """
+
+    def __init__(self):
+        """Initialize store."""
+        self._records: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get lease record."""
+        record = self._records.get(key)
+        return dict(record) if record is not None else None
+
+    def compare_and_set(self, key: str, expected: Optional[dict],
+                        record: dict) -> bool:
+        """Replace lease record if it still equals `expected`."""
+        with self._lock:
+            if self._records.get(key) != expected:
+                return False
+            self._records[key] = dict(record)
+            return True
+
+
+class DatabaseLeaseStore:
+    """Lease records in an SQLite database shared by several processes.
+
+    `database` is the path of the database file, e.g. on a file system
+    shared by the hosts, or an sqlite3 connection. New records are
+    inserted under a unique key and existing records are replaced by an
+    update conditioned on the expected record. Both succeed only if a row
+    changed, which the database decides atomically, so leases are
+    exclusive across processes and hosts.
+    """
+
+    table = 'hyrun_leases'
+
+    def __init__(self, database, timeout: float = 30.0):
+        """Initialize store, creating the lease table."""
+        if not isinstance(database, sqlite3.Connection):
+            database = sqlite3.connect(str(database), timeout=timeout,
+                                       check_same_thread=False)
+        self.connection = database
+        self._lock = threading.Lock()
+        with self._lock, self.connection:
+            self.connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} '
+                '(key TEXT PRIMARY KEY, owner TEXT, expires REAL, '
+                'status TEXT)')
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get lease record."""
+        with self._lock:
+            row = self.connection.execute(
+                f'SELECT owner, expires, status FROM {self.table} '
+                'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('owner', 'expires', 'status'), row))
+
+    def compare_and_set(self, key: str, expected: Optional[dict],
+                        record: dict) -> bool:
+        """Replace lease record if it still equals `expected`."""
+        values = (record['owner'], record['expires'], record['status'])
+        with self._lock, self.connection:
+            if expected is None:
+                cursor = self.connection.execute(
+                    f'INSERT OR IGNORE INTO {self.table} '
+                    '(key, owner, expires, status) VALUES (?, ?, ?, ?)',
+                    (key, *values))
+            else:
+                cursor = self.connection.execute(
+                    f'UPDATE {self.table} '
+                    'SET owner = ?, expires = ?, status = ? '
+                    'WHERE key = ? AND owner IS ? AND expires IS ? '
+                    'AND status IS ?',
+                    (*values, key, expected['owner'], expected['expires'],
+                     expected['status']))
+        return cursor.rowcount == 1
+
+
+@dataclass
+class LeaseManager:
+    """Claim JobGraph nodes for one of several workers via leases.
+
+    A worker may only dispatch a node while it holds an unexpired lease
+    on it. Leases are renewed while the node runs and marked with the
+    final status once it finishes, so other workers learn the outcome
+    and never run the node again. If a worker crashes, its leases expire
+    after `ttl` seconds and the nodes are claimed by another worker.
+
+    Parameters
+    ----------
+    store : MemoryLeaseStore or DatabaseLeaseStore
+        Lease records shared by all workers.
+    owner : str
+        Name of this worker, defaults to host name and process id.
+    ttl : float
+        Lease time in seconds.
+
+    """
+
+    store: Any
+    owner: Optional[str] = None
+    ttl: float = 300.0
+    logger: Any = None
+    clock: Callable[[], float] = time.time
+    held: Dict[Any, dict] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        """Post init."""
+        if self.ttl <= 0:
+            raise ValueError('ttl must be positive')
+        self.owner = self.owner or f'{socket.gethostname()}:{os.getpid()}'
+        self.logger = self.logger or LoggerDummy()
+
+    def finished(self, node) -> Optional[str]:
+        """Get final status of a node recorded by any worker."""
+        record = self.store.get(str(node))
+        return record['status'] if record else None
+
+    def acquire(self, node) -> bool:
+        """Try to lease a node that is not leased or whose lease expired."""
+        record = self.store.get(str(node))
+        now = self.clock()
+        if record is not None and (
+                record['status'] is not None
+                or (record['owner'] != self.owner
+                    and record['expires'] > now)):
+            return False
+        new = {'owner': self.owner, 'expires': now + self.ttl,
+               'status': None}
+        if not self.store.compare_and_set(str(node), record, new):
+            return False
+        self.held[node] = new
+        return True
+
+    def renew(self, nodes: Optional[Iterable] = None) -> List[Any]:
+        """Extend held leases, return nodes whose lease was lost."""
+        lost = []
+        expires = self.clock() + self.ttl
+        for node in list(self.held if nodes is None else nodes):
+            record = self.held.get(node)
+            new = {**(record or {}), 'expires': expires}
+            if record is None or not self.store.compare_and_set(
+                    str(node), record, new):
+                self.logger.warning(f'Lost lease on node {node}')
+                self.held.pop(node, None)
+                lost.append(node)
+                continue
+            self.held[node] = new
+        return lost
+
+    def release(self, node, status: Optional[str] = None):
+        """Give up lease on node, recording its status if it is final."""
+        record = self.held.pop(node, None)
+        if record is None:
+            return
+        final = job_status_map.get(status, 0) >= finished_level
+        new = {**record, 'expires': self.clock(),
+               'status': status if final else None}
+        if not self.store.compare_and_set(str(node), record, new):
+            self.logger.warning(f'Lost lease on node {node}')
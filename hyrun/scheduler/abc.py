@@ -64,7 +64,7 @@ class Scheduler(ABC):
         output = connection.execute(cmd)
         if output.returncode != 0:
             raise RuntimeError(f'Job submission failed: {output.stderr}')
-        return self.parse_submit_output(output.stdout))
+        return self.parse_submit_output(output.stdout)
 
 
 
@@ -0,0 +1,58 @@
+from typing import Iterable, Optional
+
+from hyrun.job.status import job_status_map
+
+failed_statuses = [s for s, level in job_status_map.items()
+                   if level > job_status_map['COMPLETED'] and s != 'SKIPPED']
+
+
+def get_dependency_type(requirements) -> Optional[str]:
+    """Map JobGraph run requirements to a SLURM dependency type.
+
+    Parameters
+    ----------
+    requirements : RunRequirements
+        Compiled run requirements of a JobGraph.
+
+    Returns
+    -------
+    str or None
+        'afterok' for `status == 'COMPLETED'`, 'afternotok' for failed
+        statuses and None if there are no requirements (children do not
+        wait for their parents).
+
+    Raises
+    ------
+    ValueError
+        If the requirements can not be expressed as SLURM dependency.
+        Ordering operators on the status are rejected, as the graph
+        compares statuses as strings, not by their progress.
+
+    """
+    if not len(requirements):
+        return None
+    if requirements.edge_requirements:
+        raise ValueError('Edge run requirements can not be expressed as '
+                         'SLURM dependencies')
+    types = set()
+    for r in requirements.node_requirements:
+        if r.prop != 'status':
+            raise ValueError(f'Run requirement on {r.prop} can not be '
+                             'expressed as SLURM dependency')
+        if r.op == '==' and r.value == 'COMPLETED':
+            types.add('afterok')
+        elif ((r.op == '==' and r.value in failed_statuses)
+              or (r.op == '!=' and r.value == 'COMPLETED')):
+            types.add('afternotok')
+        else:
+            raise ValueError(f'Run requirement status {r.op} {r.value} can '
+                             'not be expressed as SLURM dependency')
+    if len(types) > 1:
+        raise ValueError('Run requirements map to different SLURM '
+                         f'dependency types: {sorted(types)}')
+    return types.pop()
+
+
+def format_dependency(dependency_type: str, job_ids: Iterable) -> str:
+    """Get value of the sbatch --dependency option."""
+    return ':'.join([dependency_type, *map(str, job_ids)])
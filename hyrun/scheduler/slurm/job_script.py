@@ -10,8 +10,14 @@ def get_job_script(job, **kwargs) -> str:
     """Generate SLURM job script for running the `program`."""
     njobs = range(len(job.tasks))
     rs = job.tasks[0]  # reference run_settings
-    job_time = max([t.job_time.total_seconds()
-                    for t in job.tasks])
+    # tasks of fused chains, packed nodes and grouped tasks run one after
+    # another
+    metadata = job.metadata or {}
+    total = (sum if any(metadata.get(key)
+                        for key in ('fused', 'packed', 'grouped'))
+             else max)
+    job_time = total([t.job_time.total_seconds()
+                      for t in job.tasks])
     slurm_job_time = timedelta_to_slurmtime(timedelta(seconds=job_time))
     job_name = kwargs.get('job_name') or gen_job_name(job)
     sdir = rs.get_full_dir_path(dirname='submit_dir_remote')
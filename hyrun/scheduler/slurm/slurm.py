@@ -2,22 +2,23 @@ import datetime
 import json
 from dataclasses import replace
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from hashlib import sha256
 from string import Template
 from subprocess import CompletedProcess
 
 from hytools.logger import LoggerDummy
 
+from hyrun.job.bundle import ssh_kws
+from hyrun.job.job import get_job
+from hyrun.job.status import job_status_map
 from hyrun.remote import connect_to_remote, rsync
 
 from ..abc import Scheduler
+from .dependency import format_dependency, get_dependency_type
 from .job_script import get_job_script as gjs
 from .job_script import gen_job_name
 
-ssh_kws = ['host', 'user', 'port', 'config', 'gateway', 'forward_agent',
-           'connect_timeout', 'connect_kwargs', 'inline_ssh_env']
-
 
 class SlurmScheduler(Scheduler):
     """Slurm scheduler."""
@@ -130,7 +131,7 @@ class SlurmScheduler(Scheduler):
                                           'cpus_per_task',
                                           'ntasks',
                                           'slurm_account',
-                                          'submit_dir_remote'
+                                          'submit_dir_remote',
                                           'work_dir_remote']
         first_task = job.tasks[0]
         for k in keys_to_be_identical:
@@ -291,21 +292,125 @@ class SlurmScheduler(Scheduler):
         return {headers[i]: data[i][1] for i in range(len(headers))
                 if i < len(data)}
 
-    def submit(self, job, connection, **kwargs) -> Union[str, int]:
+    def submit(self, job, connection=None, **kwargs) -> Union[str, int]:
         """Submit job."""
-        # gen submit command, run it if there is an eecutor and return parsed   output
+        # gen submit command, run it if there is a connection and return
+        # parsed output
         cmd = self.get_submit_cmd(job, **kwargs)
-        if executor is None:
+        if connection is None:
             return cmd
-        output = executor.run(cmd, hide='stdout')
+        output = connection.run(cmd, hide='stdout')
         return self.parse_submit_output(output.stdout)
-    
+
     def get_submit_cmd(self, job, **kwargs):
-        """Submit job."""
+        """Submit job.
+
+        The dependency and the nice value are passed on the command line
+        rather than in the job script, so that the job script (and its
+        hash) does not depend on the job ids of the parents or on the
+        position of the job in the graph.
+        """
         file = job.tasks[0].run_settings.get_full_file_path(
             file=job.job_script.name, dirname='submit_dir_remote'
             )
-        return f'sbatch {file}'
+        options = ''
+        if kwargs.get('dependency'):
+            options += (f'--dependency={kwargs["dependency"]} '
+                        '--kill-on-invalid-dep=yes ')
+        if kwargs.get('nice'):
+            options += f'--nice={int(kwargs["nice"])} '
+        if kwargs.get('parsable'):
+            options += '--parsable '
+        return f'sbatch {options}{file}'
+
+    def get_graph_submit_script(self, graph, nodes=None,
+                                max_nice: int = 10000) -> Tuple[str, list]:
+        """Get shell script submitting a JobGraph with native dependencies.
+
+        Parameters
+        ----------
+        graph : JobGraph
+            Workflow living on the cluster of this scheduler.
+        nodes : iterable, optional
+            Submit only these nodes, defaults to all nodes.
+        max_nice : int
+            Nice value of the least critical jobs, jobs on the critical
+            path get 0 (see `JobGraph.nice_values`). 0 disables nice values.
+
+        Returns
+        -------
+        str, list
+            Script printing `<position> <job id>` per submitted job and
+            the submitted nodes in submission order.
+
+        Nodes that were submitted before are not resubmitted, their job
+        ids are used as dependencies. Nodes that can never run, because a
+        parent finished without meeting the run requirements or was not
+        submitted, are skipped.
+
+        """
+        dependency_type = get_dependency_type(graph._requirements)
+        graph_nodes = graph.graph.nodes
+        finished = job_status_map['COMPLETED']
+        variables: dict = {}
+        submitted = []
+        nice = graph.nice_values(max_nice) if max_nice else {}
+        lines = ['set -eo pipefail']
+        for node in graph.submission_order(nodes):
+            attrs = graph_nodes[node]
+            if job_status_map.get(attrs.get('status'), 0) > 0:
+                continue
+            parents = []
+            for u in graph.graph.predecessors(node):
+                u_attrs = graph_nodes[u]
+                level = job_status_map.get(u_attrs.get('status'), 0)
+                if u in variables:
+                    parents.append(f'${variables[u]}')
+                elif level >= finished and graph._edge_fulfilled(u, node):
+                    continue
+                elif 0 < level < finished and u_attrs.get('job_id'):
+                    parents.append(str(u_attrs['job_id']))
+                else:
+                    self.logger.warning(f'Skipping {node}, its dependency '
+                                        f'{u} can not be met')
+                    break
+            else:
+                dependency = (format_dependency(dependency_type, parents)
+                              if parents and dependency_type else None)
+                job = attrs.get('job') or get_job(dict(attrs))
+                cmd = self.get_submit_cmd(job, dependency=dependency,
+                                          nice=nice.get(node), parsable=True)
+                variables[node] = f'job{len(submitted)}'
+                lines.append(f'{variables[node]}=$({cmd} | cut -d";" -f1)')
+                lines.append(f'echo "{len(submitted)} ${variables[node]}"')
+                submitted.append(node)
+        return '\n'.join(lines) + '\n', submitted
+
+    def submit_graph(self, graph, connection=None, nodes=None,
+                     max_nice: int = 10000, **kwargs):
+        """Submit a JobGraph up front using sbatch --dependency chains.
+
+        All jobs are submitted in a single remote command. Without a
+        connection the submission script is returned. Otherwise job ids
+        and status 'SUBMITTED' are written to the graph and a mapping from
+        node to job id is returned. Jobs off the critical path get a
+        higher nice value (see `get_graph_submit_script`).
+        """
+        script, submitted = self.get_graph_submit_script(graph, nodes,
+                                                         max_nice)
+        if connection is None:
+            return script
+        c = connection.run(script, hide='stdout', warn=True)
+        job_ids = {}
+        for line in c.stdout.strip().splitlines():
+            i, job_id = line.split()
+            job_ids[submitted[int(i)]] = int(job_id)
+            graph.update_node_attrs(submitted[int(i)], job_id=int(job_id),
+                                    status='SUBMITTED')
+        if not c.ok:
+            raise RuntimeError(f'Submitted {len(job_ids)} of '
+                               f'{len(submitted)} jobs: {c.stderr.strip()}')
+        return job_ids
     
     def parse_submit_output(self, output: str) -> Optional[str]:
         """Parse submit output."""
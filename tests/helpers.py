@@ -0,0 +1,12 @@
+class DummyJob:
+    """Dummy job class for testing.
+
+    Has a hash and a status, further attributes are given as keyword
+    arguments.
+    """
+
+    def __init__(self, hash, status=None, **attrs):
+        self.hash = hash
+        self.status = status
+        for key, value in attrs.items():
+            setattr(self, key, value)
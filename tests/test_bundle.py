@@ -0,0 +1,216 @@
+import unittest
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from hyrun.job import CompactJob, Job
+from hyrun.job.bundle import (find_chains, fuse_chains, group_tasks,
+                               job_time, pack_nodes, resource_signature)
+from hyrun.job.get_workflow import get_workflow, normalize_input
+from hyrun.job.graph import JobGraph
+
+
+@dataclass
+class DummyTask:
+    """Dummy task class for testing."""
+
+    program: str
+    scheduler: dict = field(default_factory=lambda: {'name': 'slurm'})
+    cpus_per_task: int = 1
+    job_time: Any = None
+    work_dir_remote: Any = None
+    gateway: Any = None
+
+
+class TestBundle(unittest.TestCase):
+    """Test chain fusion."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.jobs = {n: Job(tasks=[DummyTask(n)]) for n in 'abcde'}
+        self.jobs['e'].tasks[0].cpus_per_task = 8
+        h = {n: job.hash for n, job in self.jobs.items()}
+        self.h = h
+        # a -> b -> c -> d -> e, x -> c
+        self.x = Job(tasks=[DummyTask('x')])
+        self.g = JobGraph(jobs=list(self.jobs.values()) + [self.x],
+                          dependencies=[(h['a'], h['b']), (h['b'], h['c']),
+                                        (h['c'], h['d']), (h['d'], h['e']),
+                                        (self.x.hash, h['c'])])
+
+    def test_resource_signature(self):
+        """Test if resources determine the signature."""
+        self.assertEqual(resource_signature(self.jobs['a']),
+                         resource_signature(self.jobs['b']))
+        self.assertNotEqual(resource_signature(self.jobs['a']),
+                            resource_signature(self.jobs['e']))
+
+    def test_find_chains(self):
+        """Test if chains stop at joins and resource changes."""
+        h = self.h
+        self.assertEqual(find_chains(self.g),
+                         [[h['a'], h['b']], [h['c'], h['d']]])
+        self.g.mark_status(h['a'], 'COMPLETED')
+        self.assertEqual(find_chains(self.g), [[h['c'], h['d']]])
+
+    def test_fuse_chains(self):
+        """Test if chains are replaced by multi-task jobs."""
+        h = self.h
+        fused = fuse_chains(self.g)
+        self.assertEqual(len(self.g), 4)
+        self.assertEqual(list(fused.values()),
+                         [[h['a'], h['b']], [h['c'], h['d']]])
+        ab, cd = fused
+        job = self.g.graph.nodes[cd]['job']
+        self.assertEqual([t.program for t in job.tasks], ['c', 'd'])
+        self.assertEqual(job.metadata['fused'], [h['c'], h['d']])
+        self.assertEqual(set(self.g.graph.edges),
+                         {(ab, cd), (self.x.hash, cd), (cd, h['e'])})
+        self.assertEqual(set(self.g.ready_nodes()), {ab, self.x.hash})
+
+    def test_no_fusion_for_other_requirements(self):
+        """Test if chains are kept when failures must propagate."""
+        self.g.run_requirements = [{'operator': '>=', 'value': 'COMPLETED'}]
+        self.assertEqual(fuse_chains(self.g), {})
+        self.assertEqual(len(self.g), 6)
+
+
+class TestPack(unittest.TestCase):
+    """Test walltime bin-packing."""
+
+    def setUp(self):
+        """Set up the test case."""
+        times = {'a': 50, 'b': 30, 'c': 30, 'd': 20, 'e': 20, 'f': 10,
+                 'g': 100, 'h': None}
+        self.jobs = {n: Job(tasks=[DummyTask(n, job_time=t)])
+                     for n, t in times.items()}
+        self.jobs['i'] = Job(tasks=[DummyTask('i', cpus_per_task=8,
+                                              job_time=timedelta(seconds=5))])
+        self.child = Job(tasks=[DummyTask('child', job_time=1)])
+        self.h = {n: job.hash for n, job in self.jobs.items()}
+        self.g = JobGraph(jobs=list(self.jobs.values()) + [self.child],
+                          dependencies=[(self.h['f'], self.child.hash)])
+
+    def test_job_time(self):
+        """Test if task times add up."""
+        self.assertEqual(job_time(self.jobs['i']), 5.0)
+        self.assertIsNone(job_time(self.jobs['h']))
+        self.assertEqual(job_time(Job(tasks=[DummyTask('x', job_time=1),
+                                             DummyTask('y', job_time=2)])),
+                         3.0)
+
+    def test_pack_nodes(self):
+        """Test if ready nodes are packed first-fit decreasing."""
+        h = self.h
+        packed = pack_nodes(self.g, target_time=60)
+        self.assertEqual(sorted(map(sorted, packed.values())),
+                         sorted([sorted([h['a'], h['f']]),
+                                 sorted([h['b'], h['c']]),
+                                 sorted([h['d'], h['e']])]))
+        self.assertEqual(len(self.g), 7)
+        for node, nodes in packed.items():
+            job = self.g.graph.nodes[node]['job']
+            self.assertEqual(job.metadata['packed'], nodes)
+            self.assertLessEqual(job_time(job), 60)
+        af = next(n for n, nodes in packed.items() if h['f'] in nodes)
+        self.assertEqual(list(self.g.graph.successors(af)),
+                         [self.child.hash])
+        self.assertIn(self.child.hash, self.g.graph.nodes)
+
+    def test_pack_remote_dirs(self):
+        """Test if tasks with different remote directories are not packed."""
+        jobs = [Job(tasks=[DummyTask(f'w{i}', job_time=1,
+                                     work_dir_remote=f'/w{i % 2}')])
+                for i in range(4)]
+        g = JobGraph(jobs=jobs)
+        packed = pack_nodes(g, target_time=60)
+        self.assertEqual(sorted(map(sorted, packed.values())),
+                         sorted([sorted([jobs[0].hash, jobs[2].hash]),
+                                 sorted([jobs[1].hash, jobs[3].hash])]))
+
+    def test_pack_runtimes(self):
+        """Test if measured runtimes take precedence."""
+        h = self.h
+        packed = pack_nodes(self.g, nodes=[h['g'], h['h'], h['a']],
+                            target_time=60,
+                            runtimes={h['g']: 10, h['h']: 10})
+        self.assertEqual(sorted(map(sorted, packed.values())),
+                         [sorted([h['a'], h['g']])])
+
+    def test_pack_dependent(self):
+        """Test if dependent nodes are rejected before changing the graph."""
+        h = self.h
+        nodes = set(self.g.graph.nodes)
+        self.assertRaises(ValueError, pack_nodes, self.g,
+                          nodes=[h['a'], h['f'], self.child.hash],
+                          target_time=60)
+        self.assertEqual(set(self.g.graph.nodes), nodes)
+        self.assertIn((h['f'], self.child.hash), self.g.graph.edges)
+
+
+class TestGroup(unittest.TestCase):
+    """Test grouping of tasks by resource signature."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.tasks = [DummyTask('a'), DummyTask('b', cpus_per_task=4),
+                      DummyTask('c'), DummyTask('d', cpus_per_task=4),
+                      DummyTask('e', scheduler={'name': 'local'})]
+
+    def test_group_tasks(self):
+        """Test if tasks sharing resources end up in one job."""
+        jobs = group_tasks(self.tasks)
+        self.assertEqual([[t.program for t in j.tasks] for j in jobs],
+                         [['a', 'c'], ['b', 'd'], ['e']])
+        self.assertEqual([j.metadata['grouped'] for j in jobs], [2, 2, 1])
+        jobs = group_tasks(self.tasks, max_tasks=1)
+        self.assertEqual(len(jobs), 5)
+
+    def test_group_signature(self):
+        """Test if tasks group by content, not by object identity."""
+        class Connection:
+            """Connection without stable repr."""
+
+            def __init__(self, host):
+                self.host = host
+
+        shared = object()
+        tasks = [DummyTask('a', gateway=Connection('x')),
+                 DummyTask('b', gateway=Connection('x')),
+                 DummyTask('c', gateway=shared),
+                 DummyTask('d', gateway=shared),
+                 DummyTask('e', gateway=object())]
+        jobs = group_tasks(tasks)
+        self.assertEqual([[t.program for t in j.tasks] for j in jobs],
+                         [['a', 'b'], ['c', 'd'], ['e']])
+
+    def test_group_tasks_time(self):
+        """Test if grouped jobs stay within the walltime."""
+        tasks = [DummyTask(str(i), job_time=timedelta(minutes=40))
+                 for i in range(5)]
+        jobs = group_tasks(tasks, max_time=3600)
+        self.assertEqual([len(j.tasks) for j in jobs], [1] * 5)
+        jobs = group_tasks(tasks, max_time=2 * 3600)
+        self.assertEqual([len(j.tasks) for j in jobs], [3, 2])
+        self.assertEqual([job_time(j) for j in jobs], [7200, 4800])
+        jobs = group_tasks(tasks + [DummyTask('x')], max_time=2 * 3600)
+        self.assertEqual([len(j.tasks) for j in jobs], [3, 2, 1])
+        graph = get_workflow(tasks, bundle=True, max_tasks=2)
+        self.assertEqual(len(graph), 3)
+
+    def test_normalize_input(self):
+        """Test if mixed bundles are split instead of rejected."""
+        jobs = normalize_input([self.tasks[:2], Job(tasks=[self.tasks[2]])])
+        self.assertEqual([[t.program for t in j.tasks] for j in jobs],
+                         [['a'], ['b'], ['c']])
+        self.assertRaises(TypeError, normalize_input, self.tasks)
+        graph = get_workflow(self.tasks, bundle=True)
+        self.assertEqual(len(graph), 3)
+        compact = CompactJob(job_id=1, hash='compact')
+        jobs = normalize_input([compact] + self.tasks, bundle=True)
+        self.assertIs(jobs[0], compact)
+        self.assertEqual(len(jobs), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+import networkx as nx
+
+from hyrun.job import compact
+
+
+class TestCompactDiGraph(unittest.TestCase):
+    """Test the array-backed graph backend."""
+
+    def setUp(self):
+        """Set up a small diamond graph."""
+        self.g = compact.DiGraph()
+        self.g.add_node('a', status='COMPLETED')
+        self.g.add_edges_from([('a', 'b'), ('a', 'c', {'weight': 2.0}),
+                               ('b', 'd'), ('c', 'd')])
+
+    def test_views(self):
+        """Test node and edge views."""
+        self.assertEqual(list(self.g.nodes), ['a', 'b', 'c', 'd'])
+        self.assertEqual(len(self.g.edges), 4)
+        self.assertIn(('a', 'c'), self.g.edges)
+        self.assertNotIn(('c', 'a'), self.g.edges)
+        self.assertEqual(self.g.edges['a', 'c']['weight'], 2.0)
+        self.assertEqual(dict(self.g.nodes['a']), {'status': 'COMPLETED'})
+        self.assertEqual(self.g.nodes['b'].get('status'), None)
+        self.assertEqual(dict(self.g.pred['d']), {'b': {}, 'c': {}})
+
+    def test_attributes(self):
+        """Test column-wise attribute storage."""
+        self.g.nodes['b']['status'] = 'RUNNING'
+        self.assertEqual(self.g.nodes['b']['status'], 'RUNNING')
+        del self.g.nodes['b']['status']
+        self.assertNotIn('status', self.g.nodes['b'])
+        with self.assertRaises(KeyError):
+            self.g.nodes['e']
+
+    def test_algorithms(self):
+        """Test traversals against networkx."""
+        h = self.g.to_networkx()
+        for n in self.g.nodes:
+            self.assertEqual(compact.ancestors(self.g, n),
+                             nx.ancestors(h, n))
+            self.assertEqual(compact.descendants(self.g, n),
+                             nx.descendants(h, n))
+        self.assertEqual(list(compact.topological_generations(self.g)),
+                         [['a'], ['b', 'c'], ['d']])
+        self.g.add_edge('d', 'a')
+        with self.assertRaises(nx.NetworkXUnfeasible):
+            list(compact.topological_sort(self.g))
+
+    def test_remove(self):
+        """Test removal of nodes and edges."""
+        self.g.remove_edge('a', 'b')
+        self.assertEqual(list(self.g.successors('a')), ['c'])
+        self.g.remove_node('c')
+        self.assertEqual(list(self.g.predecessors('d')), ['b'])
+        self.assertEqual(len(self.g), 3)
+        self.assertEqual(len(self.g.edges), 1)
+        self.g.compact()
+        self.assertEqual(list(self.g.edges), [('b', 'd')])
+
+    def test_many_edges(self):
+        """Test pending edges are merged into the CSR arrays."""
+        g = compact.DiGraph()
+        n = 3000
+        g.add_edges_from((i, i + 1) for i in range(n))
+        self.assertEqual(len(g.edges), n)
+        self.assertEqual(len(compact.descendants(g, 0)), n)
+        self.assertEqual(list(g.successors(n - 1)), [n])
+
+    def test_round_trip(self):
+        """Test conversion from and to networkx."""
+        g = compact.from_networkx(self.g.to_networkx())
+        self.assertEqual(list(g.nodes(data=True)),
+                         list(self.g.nodes(data=True)))
+        self.assertEqual(list(g.edges(data=True)),
+                         list(self.g.edges(data=True)))
+        g = compact.relabel_nodes(g, {'a': 'x'})
+        self.assertEqual(list(g.successors('x')), ['b', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
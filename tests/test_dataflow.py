@@ -0,0 +1,108 @@
+import unittest
+
+from hyrun.job.graph import JobGraph
+from hyrun.runner.dataflow import DataflowExecutor
+
+from .helpers import DummyJob
+
+
+class FakeScheduler:
+    """Scheduler finishing every job after a given number of polls."""
+
+    def __init__(self, durations, failing=()):
+        self.durations = durations
+        self.failing = failing
+        self.remaining = {}
+        self.submitted = []
+        self.max_in_flight = 0
+
+    def submit(self, node, attrs):
+        """Submit node."""
+        self.submitted.append(node)
+        self.remaining[node] = self.durations.get(node, 1)
+        self.max_in_flight = max(self.max_in_flight, len(self.remaining))
+
+    def poll(self, nodes):
+        """Advance time by one poll."""
+        statuses = {}
+        for node in nodes:
+            self.remaining[node] -= 1
+            if self.remaining[node] > 0:
+                statuses[node] = 'RUNNING'
+                continue
+            del self.remaining[node]
+            statuses[node] = ('FAILED' if node in self.failing
+                              else 'COMPLETED')
+        return statuses
+
+
+class TestDataflowExecutor(unittest.TestCase):
+    """Test the DataflowExecutor class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.g = JobGraph(jobs=[DummyJob(n) for n in 'abcde'],
+                          dependencies=[('a', 'b'), ('b', 'c'),
+                                        ('d', 'e')])
+        self.sleeps = []
+
+    def executor(self, scheduler, **kwargs):
+        """Create executor using fake scheduler."""
+        return DataflowExecutor(self.g, scheduler.submit, scheduler.poll,
+                                sleep=self.sleeps.append, **kwargs)
+
+    def test_no_barrier(self):
+        """Test if fast branches do not wait for slow nodes."""
+        scheduler = FakeScheduler({'d': 10})
+        result = self.executor(scheduler).run()
+        self.assertEqual(set(result.values()), {'COMPLETED'})
+        # a -> b -> c finish while d is still running
+        self.assertEqual(scheduler.submitted, ['a', 'd', 'b', 'c', 'e'])
+
+    def test_max_in_flight(self):
+        """Test if the number of dispatched nodes is bounded."""
+        scheduler = FakeScheduler({})
+        self.executor(scheduler, max_in_flight=1).run()
+        self.assertEqual(scheduler.max_in_flight, 1)
+        self.assertEqual(len(scheduler.submitted), 5)
+
+    def test_failure(self):
+        """Test if descendants of failed nodes are not dispatched."""
+        scheduler = FakeScheduler({}, failing={'a'})
+        result = self.executor(scheduler).run()
+        self.assertEqual(result['a'], 'FAILED')
+        self.assertEqual(result['b'], 'SKIPPED')
+        self.assertEqual(result['c'], 'SKIPPED')
+        self.assertEqual(result['e'], 'COMPLETED')
+        self.assertNotIn('b', scheduler.submitted)
+
+    def test_synchronous_submit(self):
+        """Test if nodes finished by submit release their descendants."""
+        submitted = []
+
+        def submit(node, attrs):
+            submitted.append(node)
+            return 'COMPLETED'
+
+        executor = DataflowExecutor(self.g, submit, lambda nodes: {},
+                                    sleep=self.sleeps.append)
+        result = executor.run()
+        self.assertEqual(set(result.values()), {'COMPLETED'})
+        self.assertEqual(sorted(submitted), list('abcde'))
+        self.assertEqual(self.sleeps, [])
+        self.g.add_node(DummyJob('f'))
+        executor.max_in_flight = 1
+        self.assertEqual(executor.run()['f'], 'COMPLETED')
+
+    def test_backoff(self):
+        """Test if the poll interval grows while nothing finishes."""
+        scheduler = FakeScheduler({'a': 4, 'd': 4})
+        for node in 'bce':
+            self.g.remove_node(node)
+        self.executor(scheduler, poll_interval=1.0, backoff=2.0,
+                      max_poll_interval=3.0).run()
+        self.assertEqual(self.sleeps, [1.0, 2.0, 3.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
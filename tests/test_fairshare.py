@@ -0,0 +1,108 @@
+import unittest
+
+from hyrun.job.graph import JobGraph
+from hyrun.runner.dataflow import DataflowExecutor
+from hyrun.runner.fairshare import FairShareScheduler
+from hyrun.runner.lease import LeaseManager, MemoryLeaseStore
+
+from .helpers import DummyJob
+
+
+class FakeCluster:
+    """Cluster finishing every job after one poll."""
+
+    def __init__(self):
+        self.running = set()
+        self.submitted = []
+        self.max_running = 0
+
+    def submit(self, node, attrs):
+        """Submit node."""
+        self.running.add(node)
+        self.submitted.append(node)
+        self.max_running = max(self.max_running, len(self.running))
+
+    def poll(self, nodes):
+        """Finish polled nodes."""
+        self.running.difference_update(nodes)
+        return {node: 'COMPLETED' for node in nodes}
+
+
+class TestFairShareScheduler(unittest.TestCase):
+    """Test the FairShareScheduler class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.cluster = FakeCluster()
+        self.scheduler = FairShareScheduler(max_in_flight=3,
+                                            sleep=lambda t: None)
+
+    def add(self, name, n, weight=1.0, **kwargs):
+        """Add workflow of n independent nodes."""
+        graph = JobGraph(jobs=[DummyJob(f'{name}{i}') for i in range(n)])
+        executor = DataflowExecutor(graph, self.cluster.submit,
+                                    self.cluster.poll, **kwargs)
+        self.scheduler.add(name, executor, weight=weight)
+        return executor
+
+    def test_weights(self):
+        """Test if free slots follow the weights."""
+        self.add('a', 10, weight=2.0)
+        self.add('b', 10)
+        self.assertEqual(self.scheduler.allocate(), {'a': 2, 'b': 1})
+        self.scheduler.dispatch()
+        self.assertEqual(self.scheduler.in_flight, 3)
+        self.assertEqual(self.scheduler.allocate(), {})
+
+    def test_caps_and_idle_shares(self):
+        """Test if per-workflow caps hold and idle shares are used."""
+        self.add('a', 10)
+        self.add('b', 10, max_in_flight=1)
+        self.add('c', 0, weight=5.0)
+        self.assertEqual(self.scheduler.allocate(), {'a': 2, 'b': 1})
+        self.assertRaises(ValueError, self.scheduler.add, 'c',
+                          self.scheduler.executors['a'])
+
+    def test_run(self):
+        """Test if all workflows finish within the shared bound."""
+        self.add('a', 10)
+        self.add('b', 4)
+        result = self.scheduler.run()
+        self.assertEqual(set(result['a'].values()), {'COMPLETED'})
+        self.assertEqual(set(result['b'].values()), {'COMPLETED'})
+        self.assertEqual(self.cluster.max_running, 3)
+        # b is not starved by a
+        self.assertLess(self.cluster.submitted.index('b3'), 10)
+
+    def test_synchronous_submit(self):
+        """Test if workflows finished on submission run to the end."""
+        graph = JobGraph(jobs=[DummyJob('a'), DummyJob('b')],
+                         dependencies=[('a', 'b')])
+        sleeps = []
+        self.scheduler.sleep = sleeps.append
+        self.scheduler.add('w', DataflowExecutor(
+            graph, lambda node, attrs: 'COMPLETED', lambda nodes: {}))
+        self.add('x', 4)
+        result = self.scheduler.run()
+        self.assertEqual(result['w'], {'a': 'COMPLETED', 'b': 'COMPLETED'})
+        self.assertEqual(set(result['x'].values()), {'COMPLETED'})
+        self.assertFalse(self.scheduler.pending())
+
+    def test_lease_waiting(self):
+        """Test if nodes leased by another worker are waited for."""
+        store = MemoryLeaseStore()
+        other = LeaseManager(store, owner='other')
+        other.acquire('a')
+        self.scheduler.sleep = lambda t: other.release('a', 'COMPLETED')
+        graph = JobGraph(jobs=[DummyJob('a'), DummyJob('b')],
+                         dependencies=[('a', 'b')])
+        self.scheduler.add('w', DataflowExecutor(
+            graph, self.cluster.submit, self.cluster.poll,
+            leases=LeaseManager(store, owner='me')))
+        result = self.scheduler.run()
+        self.assertEqual(result['w'], {'a': 'COMPLETED', 'b': 'COMPLETED'})
+        self.assertEqual(self.cluster.submitted, ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,27 @@
+import tempfile
 import unittest
+from pathlib import Path
 
 from hyrun.job.graph import JobGraph
+from hyrun.job.job import Job
+from hyrun.job.output import Output
 
+from .helpers import DummyJob
 
-class DummyJob:
-    """Dummy job class for testing."""
 
-    def __init__(self, hash, status='pending', db_id=None):
-        self.name = hash
-        self.hash = hash
-        self.status = status
-        self.db_id = db_id
+def pending_job(hash, **attrs):
+    """Get dummy job, pending and without db_id by default."""
+    return DummyJob(hash, **{'status': 'pending', 'db_id': None, **attrs})
 
 
 class TestJobGraph(unittest.TestCase):
     """Test the JobGraph class."""
 
+    backend = 'networkx'
+
     def setUp(self):
         """Set up the test case."""
-        self.jobs = [DummyJob(f'job{i}') for i in range(3)]
+        self.jobs = [pending_job(f'job{i}') for i in range(3)]
         self.dependencies = [
             (self.jobs[0].hash, self.jobs[1].hash),
             (self.jobs[1].hash, self.jobs[2].hash)
@@ -30,7 +33,8 @@ class TestJobGraph(unittest.TestCase):
         self.g = JobGraph(
             jobs=self.jobs,
             dependencies=self.dependencies,
-            weights=self.weights)
+            weights=self.weights,
+            backend=self.backend)
 
     def test_nodes_added(self):
         """Test if nodes are added to the graph."""
@@ -54,12 +58,38 @@ class TestJobGraph(unittest.TestCase):
         self.assertEqual(set(self.g.graph.nodes), set(g2.graph.nodes))
         self.assertEqual(set(self.g.graph.edges), set(g2.graph.edges))
 
+    def test_getitem_read_only(self):
+        """Test if attributes are only changed through the graph."""
+        self.assertEqual(self.g['job0']['status'], 'pending')
+        self.assertEqual(self.g['job0', 'job1']['weight'], 0.5)
+        with self.assertRaises(TypeError):
+            self.g['job0']['status'] = 'COMPLETED'
+        with self.assertRaises(TypeError):
+            self.g['job0', 'job1']['weight'] = 2.0
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(self.g['job0']['status'], 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+
     def test_remove_node(self):
         """Test if a node can be removed from the graph."""
         node = self.jobs[0].hash
         self.g.remove_node(node)
         self.assertNotIn(node, self.g.graph.nodes)
 
+    def test_add_without_hash(self):
+        """Test if jobs without hash do not replace existing nodes."""
+        g = JobGraph(jobs=[Job(job_id=i) for i in range(3)],
+                     backend=self.backend)
+        self.assertEqual(sorted(g.graph.nodes), [0, 1, 2])
+        g.remove_node(0)
+        node = g.add_nodes_from([Job(job_id=99)])[0]
+        self.assertNotIn(node, (1, 2))
+        g.add_node(Job(job_id=100))
+        self.assertEqual(len(g.graph.nodes), 4)
+        self.assertEqual(sorted(attrs['job_id'] for _, attrs
+                                in g.graph.nodes(data=True)),
+                         [1, 2, 99, 100])
+
     def test_remove_edge(self):
         """Test if an edge can be removed from the graph."""
         u, v = self.dependencies[0]
@@ -73,6 +103,454 @@ class TestJobGraph(unittest.TestCase):
         # topo order should start with jobs[0].hash
         self.assertEqual(topo[0], self.jobs[0].hash)
 
+    def test_ready_nodes(self):
+        """Test if the ready queue follows status changes."""
+        self.assertEqual(self.g.ready_nodes(), ['job0'])
+        self.g.mark_status('job0', 'RUNNING')
+        self.assertEqual(self.g.ready_nodes(), [])
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        self.g.mark_status('job0', 'FAILED')
+        self.assertEqual(self.g.ready_nodes(), [])
+
+    def test_are_ready_to_run(self):
+        """Test bulk evaluation of run requirements."""
+        self.g.mark_status('job0', 'COMPLETED')
+        ready = self.g.are_ready_to_run()
+        self.assertEqual(ready, {'job0': False, 'job1': True, 'job2': False})
+        for node, value in ready.items():
+            self.assertEqual(self.g.is_ready_to_run(node), value)
+        self.assertEqual(self.g.are_ready_to_run(['nope']), {'nope': False})
+
+    def test_edge_run_requirements(self):
+        """Test run requirements on edge properties."""
+        self.g.run_requirements = [{'element': 'edge', 'property': 'weight',
+                                    'operator': '>=', 'value': 1.0}]
+        self.assertEqual(set(self.g.ready_nodes()), {'job0', 'job2'})
+        self.assertFalse(self.g.is_ready_to_run('job1'))
+
+    def test_ready_nodes_after_edit(self):
+        """Test if the ready queue follows graph edits."""
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        self.g.add_node(pending_job('job3'))
+        self.g.add_edge('job1', 'job3')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        self.g.remove_edge('job1', 'job2')
+        self.assertEqual(set(self.g.ready_nodes()), {'job1', 'job2'})
+        self.g.remove_node('job1')
+        self.assertEqual(set(self.g.ready_nodes()), {'job2', 'job3'})
+
+    def test_critical_path_priorities(self):
+        """Test if priorities follow the longest weighted path to a sink."""
+        self.g.add_node(pending_job('job3'))
+        self.g.set_weights([('job0', 'job3', 0.1)])
+        prio = self.g.prioritize()
+        self.assertEqual(prio, {'job0': 1.5, 'job1': 1.0, 'job2': 0.0,
+                                'job3': 0.0})
+        self.assertEqual(self.g.graph.nodes['job1']['priority'], 1.0)
+        self.assertEqual(self.g.submission_order(),
+                         ['job0', 'job1', 'job2', 'job3'])
+        self.assertEqual(self.g.nice_values(max_nice=100),
+                         {'job0': 0, 'job1': 33, 'job2': 100, 'job3': 100})
+        # edits invalidate the stored priorities
+        self.g.update_edge_attrs('job0', 'job3', weight=3.0)
+        self.assertEqual(self.g.nice_values(max_nice=100)['job1'], 67)
+        self.g.add_node(pending_job('job4'))
+        self.g.add_edge('job4', 'job0')
+        self.assertEqual(self.g.nice_values(max_nice=100)['job0'], 25)
+        self.assertEqual(self.g.graph.nodes['job4']['priority'], 4.0)
+
+    def test_ready_nodes_by_priority(self):
+        """Test if ready nodes on the critical path come first."""
+        for i in range(3, 6):
+            self.g.add_node(pending_job(f'job{i}'))
+        self.g.set_weights([('job3', 'job4', 5.0)])
+        self.g.prioritize()
+        self.assertEqual(self.g.ready_nodes(by_priority=True),
+                         ['job3', 'job0', 'job5'])
+        self.assertEqual(self.g.submission_order(['job0', 'job3', 'job4']),
+                         ['job3', 'job0', 'job4'])
+
+    def test_deduplicate(self):
+        """Test if jobs with the same hash are executed once."""
+        duplicate = pending_job('job1')
+        self.g.add_node(duplicate)
+        self.assertEqual(len(self.g), 3)
+        self.assertEqual(self.g.duplicates('job1'), [duplicate])
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        self.g.update_node_attrs('job1', status='COMPLETED', outputs=['x'])
+        self.assertEqual(duplicate.status, 'COMPLETED')
+        self.assertFalse(hasattr(duplicate, 'outputs'))
+
+    def test_deduplicate_advanced(self):
+        """Test if a duplicate further along updates the node."""
+        self.g.update_node_attrs('job1', db_id=5)
+        duplicate = pending_job('job1', status='COMPLETED')
+        duplicate.job_id = 11
+        self.g.add_node(duplicate)
+        self.assertEqual(self.g.graph.nodes['job1']['status'], 'COMPLETED')
+        self.assertEqual(self.g.lookup('job_id', 11), 'job1')
+        self.assertEqual(self.g.graph.nodes['job1']['db_id'], 5)
+        self.assertEqual(self.jobs[1].status, 'COMPLETED')
+        behind = pending_job('job1', status='RUNNING')
+        self.g.add_nodes_from([behind])
+        self.assertEqual(behind.status, 'COMPLETED')
+
+    def test_deduplicate_add(self):
+        """Test if merged workflows share identical jobs."""
+        self.g.mark_status('job0', 'COMPLETED')
+        duplicate = pending_job('job0')
+        other = JobGraph(jobs=[duplicate, pending_job('job3')],
+                         dependencies=[('job0', 'job3')],
+                         backend=self.backend)
+        merged = self.g + other
+        self.assertEqual(len(merged), 4)
+        self.assertEqual(merged.graph.nodes['job0']['status'], 'COMPLETED')
+        self.assertEqual(set(merged.ready_nodes()), {'job1', 'job3'})
+        merged.add_node(duplicate)
+        self.assertEqual(duplicate.status, 'COMPLETED')
+
+    def test_add_nodes_from(self):
+        """Test bulk insertion of jobs by reference."""
+        jobs = [pending_job('job3'), pending_job('job4'), pending_job('job1')]
+        jobs[0].extra, jobs[1].extra = 'a', 'b'
+        self.g.add_nodes_from(jobs)
+        self.g.add_edges_from([('job3', 'job4', 2.0), {'job2': 'job3'},
+                               ('job0', 'job1', 5.0)])
+        self.assertEqual(len(self.g), 5)
+        self.assertIs(self.g.graph.nodes['job3']['job'], jobs[0])
+        self.assertNotIn('name', self.g.graph.nodes['job3'])
+        self.assertEqual(self.g.duplicates('job1'), [jobs[2]])
+        self.assertEqual(self.g.graph.edges['job3', 'job4']['weight'], 2.0)
+        self.assertEqual(self.g.graph.edges['job0', 'job1']['weight'], 0.5)
+        self.g.mark_status('job3', 'COMPLETED')
+        self.assertEqual(jobs[0].status, 'COMPLETED')
+        # properties which are not copied are looked up on the job
+        self.g.run_requirements = [{'property': 'extra', 'value': 'a'}]
+        self.assertFalse(self.g.is_ready_to_run('job3'))
+        self.assertTrue(self.g.is_ready_to_run('job4'))
+
+    def test_status_views(self):
+        """Test if status views follow status changes and graph edits."""
+        pending = self.g.nodes_with_status('pending')
+        done = self.g.nodes_with_status('COMPLETED', 'FAILED')
+        frontier = self.g.frontier()
+        self.assertEqual(set(pending), {'job0', 'job1', 'job2'})
+        self.assertEqual(len(done), 0)
+        self.assertEqual(list(frontier), ['job0'])
+        self.g.mark_status('job0', 'FAILED')
+        self.assertEqual(set(pending), set())
+        self.assertEqual(set(self.g.nodes_with_status('SKIPPED')),
+                         {'job1', 'job2'})
+        self.assertIn('job0', done)
+        self.assertEqual(set(done.with_descendants()),
+                         {'job0', 'job1', 'job2'})
+        self.assertIn('job2', done.with_descendants())
+        self.assertEqual(len(frontier), 0)
+        self.g.add_node(pending_job('job3'))
+        self.g.add_nodes_from([pending_job('job4', status='FAILED')])
+        self.g.add_edge('job3', 'job5')
+        self.assertEqual(set(pending), {'job3'})
+        self.assertEqual(set(done), {'job0', 'job4'})
+        self.assertEqual(set(self.g.nodes_with_status(None)), {'job5'})
+        self.g.remove_node('job4')
+        self.assertEqual(set(done), {'job0'})
+        self.assertEqual(set(done.subgraph().nodes), {'job0'})
+        self.assertEqual(set(frontier), {'job3'})
+
+    def test_views_mutation(self):
+        """Test if the graph can be changed while iterating a view."""
+        self.g.add_nodes_from([pending_job(f'job{i}') for i in range(3, 6)])
+        frontier = self.g.frontier()
+        for n in frontier:
+            self.g.mark_status(n, 'SUBMITTED')
+        self.assertEqual(len(frontier), 0)
+        submitted = self.g.nodes_with_status('SUBMITTED')
+        self.assertEqual(set(submitted), {'job0', 'job3', 'job4', 'job5'})
+        for n in submitted:
+            self.g.mark_status(n, 'COMPLETED')
+        self.assertEqual(len(submitted), 0)
+        self.assertEqual(list(frontier), ['job1'])
+        for n in self.g.nodes_with_status('COMPLETED').with_descendants():
+            self.g.remove_node(n)
+        self.assertEqual(len(self.g), 0)
+
+    def test_secondary_indexes(self):
+        """Test lookup by db_id and job_id and reconciling reports."""
+        self.g.update_node_attrs('job0', job_id=100)
+        self.g.update_node_attrs('job1', job_id=101, db_id=7)
+        self.assertEqual(self.g.lookup('job_id', '100'), 'job0')
+        self.assertEqual(self.g.lookup('db_id', 7), 'job1')
+        self.g.update_node_attrs('job1', db_id=8)
+        self.assertIsNone(self.g.lookup('db_id', 7))
+        self.assertEqual(self.g.lookup('db_id', 8), 'job1')
+        with self.assertRaises(ValueError):
+            self.g.lookup('status', 'pending')
+        job = pending_job('job3')
+        job.job_id = 103
+        self.g.add_nodes_from([job])
+        self.assertEqual(self.g.lookup('job_id', 103), 'job3')
+        changed = self.g.reconcile({'100': 'COMPLETED', 101: 'pending',
+                                    999: 'RUNNING'})
+        self.assertEqual(changed, ['job0'])
+        self.assertEqual(self.g.ready_nodes(), ['job1', 'job3'])
+        self.assertEqual(set(self.g.nodes_with_status('COMPLETED')),
+                         {'job0'})
+        self.g.remove_node('job0')
+        self.assertIsNone(self.g.lookup('job_id', 100))
+
+    def test_skip_propagation(self):
+        """Test if failures skip descendants and resubmission undoes it."""
+        self.g.add_node(pending_job('job3'))
+        self.g.add_edge('job3', 'job2')
+        self.g.mark_status('job0', 'COMPLETED')
+        self.g.mark_status('job1', 'TIMEOUT')
+        self.assertEqual(self.g.graph.nodes['job2']['status'], 'SKIPPED')
+        self.assertEqual(self.g.skipped_by('job2'), {'job1'})
+        self.g.mark_status('job3', 'FAILED')
+        self.assertEqual(self.g.skipped_by('job2'), {'job1', 'job3'})
+        self.assertEqual(self.g.ready_nodes(), [])
+        self.g.mark_status('job1', 'PENDING')
+        self.assertEqual(self.g.graph.nodes['job2']['status'], 'SKIPPED')
+        self.g.remove_node('job3')
+        self.assertEqual(self.g.graph.nodes['job2']['status'], 'pending')
+        self.assertEqual(self.g.skipped_by('job2'), set())
+        self.g.mark_status('job1', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job2'])
+        self.g.mark_status('job0', 'FAILED')
+        self.assertEqual(self.g.graph.nodes['job1']['status'], 'COMPLETED')
+        self.g.add_node(pending_job('job4'))
+        self.g.add_edge('job0', 'job4')
+        self.assertEqual(self.g.graph.nodes['job4']['status'], 'SKIPPED')
+
+    def test_skip_propagation_edits(self):
+        """Test if skips follow edge edits, copies and files."""
+        self.g.mark_status('job0', 'FAILED')
+        self.assertEqual(self.g.graph.nodes['job2']['status'], 'SKIPPED')
+        copied = self.g + JobGraph(backend=self.backend)
+        self.assertEqual(copied.skipped_by('job1'), {'job0'})
+        copied.mark_status('job0', 'PENDING')
+        self.assertEqual(copied.graph.nodes['job2']['status'], 'pending')
+        g = JobGraph(jobs=[Job(hash=n) for n in 'abc'],
+                     edges=[('a', 'b'), ('b', 'c')], backend=self.backend)
+        g.mark_status('a', 'FAILED')
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / 'graph.json'
+            g.write(filename)
+            read = JobGraph(backend=self.backend)
+            read.read(filename)
+        self.assertEqual(read.skipped_by('c'), {'b'})
+        read.mark_status('a', 'PENDING')
+        self.assertIsNone(read.graph.nodes['c']['status'])
+        self.g.remove_edge('job0', 'job1')
+        self.assertEqual(self.g.graph.nodes['job1']['status'], 'pending')
+        self.assertEqual(self.g.graph.nodes['job2']['status'], 'pending')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        g = JobGraph(jobs=[pending_job('a', status='FAILED'),
+                           pending_job('b')],
+                     edges=[('a', 'b')], backend=self.backend)
+        self.assertEqual(g.graph.nodes['b']['status'], 'SKIPPED')
+        g = JobGraph(jobs=[pending_job('a', status='FAILED'),
+                           pending_job('b')],
+                     weights=[('a', 'b', 2.0)], backend=self.backend)
+        self.assertEqual(g.skipped_by('b'), {'a'})
+
+    def test_topology_cache(self):
+        """Test if cached topological order and generations follow edits."""
+        def check():
+            topo = self.g.topological
+            pos = {n: i for i, n in enumerate(topo)}
+            self.assertEqual(set(topo), set(self.g.graph.nodes))
+            for u, v in self.g.graph.edges:
+                self.assertLess(pos[u], pos[v])
+            generations = self.g._get_topo().generations()
+            level = {n: i for i, g in enumerate(generations) for n in g}
+            self.assertEqual(set(level), set(self.g.graph.nodes))
+            for v in self.g.graph.nodes:
+                preds = list(self.g.graph.predecessors(v))
+                self.assertEqual(level[v], max((level[u] + 1 for u in preds),
+                                               default=0))
+
+        self.assertEqual(self.g.map_topology, {0: 0, 1: 1, 2: 2})
+        version = self.g.version
+        self.assertIs(self.g._get_topo().order(), self.g._get_topo().order())
+        self.g.add_node(pending_job('job3'))
+        self.assertGreater(self.g.version, version)
+        check()
+        self.g.add_edge('job2', 'job3')
+        check()
+        self.assertRaises(ValueError, self.g.add_edge, 'job3', 'job1')
+        self.assertNotIn(('job3', 'job1'), self.g.graph.edges)
+        check()
+        self.g.add_node(pending_job('job4'))
+        self.g.add_edge('job4', 'job0')
+        check()
+        self.assertEqual(self.g.map_topology[4], 0)
+        self.g.remove_edge('job0', 'job1')
+        check()
+        self.g.remove_node('job2')
+        check()
+
+    def test_cycle_detection(self):
+        """Test if edges closing a cycle are rejected on insertion."""
+        import random
+        rng = random.Random(0)
+        nodes = [f'n{i}' for i in range(30)]
+        self.g.add_nodes_from([pending_job(n) for n in nodes])
+        for _ in range(200):
+            u, v = rng.sample(nodes, 2)
+            if u in self.g.descendants(v):
+                self.assertRaises(ValueError, self.g.add_edge, u, v)
+            else:
+                self.g.add_edge(u, v)
+            pos = {n: i for i, n in enumerate(self.g.topological)}
+            for a, b in self.g.graph.edges:
+                self.assertLess(pos[a], pos[b])
+        self.assertRaises(ValueError, self.g.add_edge, 'job2', 'job0')
+        self.assertRaises(ValueError, self.g.add_edges_from,
+                          [('job2', 'new'), ('new', 'job0')])
+        self.assertNotIn('new', self.g.graph.nodes)
+        self.assertNotIn(('job2', 'new'), self.g.graph.edges)
+        self.assertEqual(self.g.topological[0], 'job0')
+        self.assertRaises(ValueError, JobGraph, jobs=self.jobs,
+                          dependencies=self.dependencies + [('job2', 'job0')],
+                          backend=self.backend)
+
+    def test_weights_cycle(self):
+        """Test if weighted edges closing a cycle are rejected."""
+        self.assertRaises(ValueError, JobGraph, jobs=self.jobs,
+                          weights=[('job0', 'job1', 1), ('job1', 'job0', 2)],
+                          backend=self.backend)
+        edges = set(self.g.graph.edges)
+        weight = self.g['job0', 'job1'].get('weight')
+        self.assertRaises(ValueError, self.g.set_weights,
+                          [('job0', 'job1', 3), ('job2', 'job0', 1)])
+        self.assertEqual(set(self.g.graph.edges), edges)
+        self.assertEqual(self.g['job0', 'job1'].get('weight'), weight)
+        self.g.set_weights([{('job0', 'job1'): 3}])
+        self.assertEqual(self.g['job0', 'job1']['weight'], 3)
+
+    def test_merge(self):
+        """Test in-place merge and difference keeping attributes."""
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertIsNone(self.g.lookup('db_id', 7))
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        sweep = JobGraph(jobs=[pending_job('job0'),
+                               pending_job('job3', db_id=7)],
+                         dependencies=[('job0', 'job3')],
+                         backend=self.backend)
+        sweep.set_weights([('job0', 'job3', 2.0)])
+        master = self.g
+        master += sweep
+        self.assertIs(master, self.g)
+        self.assertEqual(len(master), 4)
+        self.assertEqual(master.lookup('db_id', 7), 'job3')
+        self.assertEqual(master.graph.nodes['job0']['status'], 'COMPLETED')
+        self.assertEqual(master.graph.edges['job0', 'job3']['weight'], 2.0)
+        self.assertEqual(set(master.ready_nodes()), {'job1', 'job3'})
+        self.assertEqual(master.duplicates('job0')[0].status, 'COMPLETED')
+        diff = master - sweep
+        self.assertEqual(set(diff.edges), {('job0', 'job1'), ('job1', 'job2')})
+        self.assertEqual(diff.graph.nodes['job3']['db_id'], 7)
+        self.assertEqual(diff.graph.nodes['job0']['status'], 'COMPLETED')
+        self.assertEqual(len(master.edges), 3)
+
+    def test_merge_keeps_ids(self):
+        """Test if merging a node without ids keeps the ids of the node."""
+        self.g.update_node_attrs('job0', status='COMPLETED', db_id=7,
+                                 job_id=99)
+        daily = JobGraph(jobs=[pending_job('job0', status='COMPLETED'),
+                               pending_job('job1', status='RUNNING')],
+                         backend=self.backend)
+        daily.update_node_attrs('job1', job_id=5)
+        for merged in (self.g + daily, self.g.__copy__().__iadd__(daily)):
+            self.assertEqual(merged.graph.nodes['job0']['db_id'], 7)
+            self.assertEqual(merged.graph.nodes['job0']['job_id'], 99)
+            self.assertEqual(merged.lookup('db_id', 7), 'job0')
+            self.assertEqual(merged.graph.nodes['job1']['status'], 'RUNNING')
+            self.assertEqual(merged.lookup('job_id', 5), 'job1')
+
+    def test_reuse(self):
+        """Test if only changed nodes and their descendants are rerun."""
+        for node in self.g.nodes:
+            self.g.update_node_attrs(node, status='COMPLETED', job_id=1)
+        jobs = ([pending_job(f'job{i}') for i in range(3)]
+                + [pending_job('new')])
+        g = JobGraph(jobs=jobs,
+                     dependencies=[('job0', 'job1'), ('new', 'job2'),
+                                   ('job1', 'job2')],
+                     backend=self.backend)
+        self.assertEqual(g.fingerprints()['job1'],
+                         self.g.fingerprints()['job1'])
+        self.assertNotEqual(g.fingerprints()['job2'],
+                            self.g.fingerprints()['job2'])
+        self.assertEqual(g.reuse(self.g), ['job0', 'job1'])
+        self.assertEqual(jobs[1].status, 'COMPLETED')
+        self.assertEqual(g.graph.nodes['job1']['job_id'], 1)
+        self.assertEqual(jobs[2].status, 'pending')
+        self.g.mark_status('job0', 'FAILED')
+        g = JobGraph(jobs=jobs[:3], dependencies=self.dependencies,
+                     backend=self.backend)
+        self.assertEqual(g.reuse(self.g), [])
+
+    def test_reuse_file(self):
+        """Test if outputs reused from a file are Output objects."""
+        previous = JobGraph(jobs=[Job(job_script='a', status='COMPLETED',
+                                      outputs=[Output(stdout='out')])],
+                            backend=self.backend)
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / 'graph.json'
+            previous.write(filename)
+            previous = JobGraph(backend=self.backend)
+            previous.read(filename)
+        job = Job(job_script='a')
+        g = JobGraph(jobs=[job], backend=self.backend)
+        self.assertEqual(g.reuse(previous), [job.hash])
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.outputs, [Output(stdout='out')])
+
+    def test_generator(self):
+        """Test if generator nodes expand into children on completion."""
+        def expand(node, attrs):
+            self.assertEqual(attrs['status'], 'COMPLETED')
+            return [pending_job('c0'), pending_job('c1'), pending_job('c2')], [
+                ('c0', 'c2'), ('c1', 'c2')]
+
+        self.g.add_generator('job0', expand)
+        self.assertEqual(self.g.ready_nodes(), ['job0'])
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(len(self.g), 6)
+        self.assertEqual(set(self.g.ready_nodes()), {'c0', 'c1'})
+        self.assertEqual(set(self.g.direct_ancestors('job1')),
+                         {'job0', 'c2'})
+        self.g.mark_status('c0', 'COMPLETED')
+        self.g.mark_status('c1', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['c2'])
+        self.g.mark_status('c2', 'COMPLETED')
+        self.assertEqual(self.g.ready_nodes(), ['job1'])
+        self.g.mark_status('job0', 'PENDING')
+        self.g.mark_status('job0', 'COMPLETED')
+        self.assertEqual(len(self.g), 6)
+
+
+class TestCompactJobGraph(TestJobGraph):
+    """Test the JobGraph class with the compact backend."""
+
+    backend = 'compact'
+
+    def test_to_networkx(self):
+        """Test if the networkx view matches the compact graph."""
+        g = self.g.to_networkx()
+        self.assertEqual(list(g.nodes), self.g.nodes)
+        self.assertEqual(set(g.edges), set(self.g.edges))
+        self.assertEqual(g.nodes['job1']['status'], 'pending')
+        self.assertIs(self.g.to_networkx(), g)
+        self.g.mark_status('job1', 'COMPLETED')
+        self.assertEqual(self.g.to_networkx().nodes['job1']['status'],
+                         'COMPLETED')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,16 @@
+import copy
+import json
+import pickle
 import unittest
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from datetime import date
+from enum import Enum
 
-from hyrun.job.job import Job, check_common_dataclass, get_job
+from hyrun.job.get_workflow import get_workflow
+from hyrun.job.job import (CompactJob, Job, check_common_dataclass,
+                           empty_dict, empty_list, get_job)
+from hyrun.job.output import CompactOutput, Output
+from hyrun.job.serialize import encode
 
 
 @dataclass
@@ -83,6 +92,81 @@ class TestJob(unittest.TestCase):
         # hash should be set in __post_init__ if job_script is present
         self.assertIsNotNone(job.hash)
 
+    def test_job_hash_content(self):
+        """Test that identical jobs get the same hash."""
+        self.assertEqual(Job(job_script='echo hello').hash,
+                         Job(job_script='echo hello', job_id=3).hash)
+        self.assertNotEqual(Job(job_script='echo hello').hash,
+                            Job(job_script='echo world').hash)
+        self.assertIsNone(Job().hash)
+
+    def test_job_hash_stable(self):
+        """Test if the hash only uses a stable encoding of the content."""
+        tasks = [{'name': 'a', 'logger': object()},
+                 {'name': 'a', 'logger': object()}]
+        self.assertEqual(Job(tasks=tasks[0]).hash, Job(tasks=tasks[1]).hash)
+        job = Job(tasks=[{'connection': object()}])
+        self.assertIsNone(job.hash)
+        self.assertIsNone(Job(tasks=[{'f': lambda: 1}]).hash)
+
+    def test_job_hash_non_json(self):
+        """Test if tasks with non-JSON content are hashed."""
+        class Mode(Enum):
+            """Mode of a task."""
+
+            X = 1
+            Y = 2
+
+        def content(**kwargs):
+            """Get task content."""
+            return [{'f': print, 'mode': Mode.X, 'day': date(2024, 1, 1),
+                     **kwargs}]
+
+        self.assertEqual(Job(tasks=content()).hash, Job(tasks=content()).hash)
+        self.assertIsNotNone(Job(tasks=content()).hash)
+        self.assertNotEqual(Job(tasks=content()).hash,
+                            Job(tasks=content(mode=Mode.Y)).hash)
+        self.assertNotEqual(Job(tasks=content()).hash,
+                            Job(tasks=content(f=len)).hash)
+        graph = get_workflow([Job(tasks=[{'f': object()}]),
+                              Job(tasks=[{'f': object()}])])
+        self.assertEqual(len(graph), 2)
+
+
+class TestCompactJob(unittest.TestCase):
+    """Test CompactJob and CompactOutput classes."""
+
+    def test_compact(self):
+        """Test slots, shared containers and interned status."""
+        a = CompactJob(job_script='echo hello', status=''.join('DONE'))
+        b = CompactJob(job_id=1)
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertFalse(hasattr(CompactOutput(), '__dict__'))
+        self.assertIs(a.metadata, b.metadata)
+        self.assertIs(a.tasks, b.outputs)
+        self.assertIs(a.status, 'DONE')
+        self.assertRaises(TypeError, a.outputs.append, CompactOutput())
+        self.assertRaises(TypeError, a.metadata.update, x=1)
+        a.outputs = [CompactOutput(returncode=0)]
+        self.assertIs(b.outputs, empty_list)
+        for c in (copy.deepcopy(b), pickle.loads(pickle.dumps(b))):
+            self.assertEqual(c, b)
+            self.assertIs(c.metadata, empty_dict)
+
+    def test_compatible(self):
+        """Test if CompactJob serialises and hashes like Job."""
+        job = Job(job_script='echo hello', status='DONE',
+                  metadata={'a': 1}, outputs=[Output(stdout='hi')])
+        compact = CompactJob.from_job(job)
+        self.assertEqual(compact.hash, job.hash)
+        self.assertIsInstance(compact.outputs[0], CompactOutput)
+        self.assertEqual(asdict(compact), asdict(job))
+        self.assertEqual(json.dumps(compact, default=encode),
+                         json.dumps(job, default=encode))
+        self.assertEqual(compact.to_job(), job)
+        self.assertIs(get_job(compact), compact)
+        self.assertEqual(asdict(CompactJob()), asdict(Job()))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,155 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from hyrun.job.graph import JobGraph
+from hyrun.runner.dataflow import DataflowExecutor
+from hyrun.runner.lease import (DatabaseLeaseStore, LeaseManager,
+                                MemoryLeaseStore)
+
+from .helpers import DummyJob
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        """Get time."""
+        return self.now
+
+
+class TestLeaseManager(unittest.TestCase):
+    """Test the LeaseManager class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.store = self.new_store()
+        self.clock = Clock()
+        self.a = LeaseManager(self.store, owner='a', ttl=10,
+                              clock=self.clock)
+        self.b = LeaseManager(self.worker_store(), owner='b', ttl=10,
+                              clock=self.clock)
+
+    def new_store(self):
+        """Create lease store."""
+        return MemoryLeaseStore()
+
+    def worker_store(self):
+        """Get lease store as seen by another worker."""
+        return self.store
+
+    def test_acquire(self):
+        """Test if leases are exclusive until they expire."""
+        self.assertTrue(self.a.acquire('n'))
+        self.assertFalse(self.b.acquire('n'))
+        self.clock.now = 5
+        self.assertEqual(self.a.renew(), [])
+        self.clock.now = 12
+        self.assertFalse(self.b.acquire('n'))
+        self.clock.now = 16
+        self.assertTrue(self.b.acquire('n'))
+        self.assertEqual(self.a.renew(), ['n'])
+        self.assertEqual(self.a.held, {})
+
+    def test_release(self):
+        """Test if final statuses are shared and block new leases."""
+        self.a.acquire('n')
+        self.a.release('n', 'RUNNING')
+        self.assertIsNone(self.b.finished('n'))
+        self.assertTrue(self.b.acquire('n'))
+        self.b.release('n', 'COMPLETED')
+        self.assertEqual(self.a.finished('n'), 'COMPLETED')
+        self.assertFalse(self.a.acquire('n'))
+
+    def test_shared_workflow(self):
+        """Test if two workers run every node exactly once."""
+        submitted = []
+        running = {}
+
+        def submit(node, attrs):
+            submitted.append(node)
+            running[node] = 2
+
+        def poll(nodes):
+            statuses = {}
+            for node in nodes:
+                running[node] -= 1
+                statuses[node] = 'COMPLETED' if not running[node] else None
+            return {n: s for n, s in statuses.items() if s}
+
+        executors = []
+        for owner in 'ab':
+            graph = JobGraph(jobs=[DummyJob(n) for n in 'abcdef'],
+                             dependencies=[('a', 'b'), ('a', 'c'),
+                                           ('b', 'd'), ('c', 'd')])
+            leases = LeaseManager(self.worker_store(), owner=owner,
+                                  clock=self.clock)
+            executors.append(DataflowExecutor(graph, submit, poll,
+                                              max_in_flight=2,
+                                              leases=leases))
+        for executor in executors:
+            executor.dispatch()
+        for _ in range(20):
+            for executor in executors:
+                executor.step()
+        self.assertEqual(sorted(submitted), list('abcdef'))
+        for executor in executors:
+            self.assertEqual(executor.in_flight, {})
+            self.assertFalse(executor.pending())
+            self.assertEqual(executor.graph.nodes_with_status('COMPLETED'),
+                             set('abcdef'))
+
+
+class TestDatabaseLeaseStore(TestLeaseManager):
+    """Test leases shared through an SQLite database."""
+
+    def new_store(self):
+        """Create lease store in a temporary database file."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filename = Path(tmpdir.name) / 'leases.db'
+        return self.worker_store()
+
+    def worker_store(self):
+        """Connect another worker to the database file."""
+        store = DatabaseLeaseStore(self.filename)
+        self.addCleanup(store.connection.close)
+        return store
+
+    def test_competing_claims(self):
+        """Test if only one of two competing claimers succeeds."""
+        stores = [self.store, self.worker_store()]
+        records = [{'owner': owner, 'expires': 10.0, 'status': None}
+                   for owner in 'ab']
+        self.assertEqual([s.get('n') for s in stores], [None, None])
+        self.assertEqual([s.compare_and_set('n', None, r)
+                          for s, r in zip(stores, records)], [True, False])
+        expected = stores[1].get('n')
+        self.assertEqual(expected, records[0])
+        # both take over the expired lease of a
+        records = [{**r, 'expires': 20.0} for r in records]
+        self.assertEqual([s.compare_and_set('n', expected, r)
+                          for s, r in zip(stores[::-1], records[::-1])],
+                         [True, False])
+        self.assertEqual(self.store.get('n'), records[1])
+
+    def test_threads(self):
+        """Test if concurrent claimers get disjoint nodes."""
+        nodes = [str(i) for i in range(50)]
+        claimed = {}
+
+        def claim(owner):
+            leases = LeaseManager(self.worker_store(), owner=owner)
+            claimed[owner] = [n for n in nodes if leases.acquire(n)]
+
+        threads = [threading.Thread(target=claim, args=(owner,))
+                   for owner in 'abcd']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(sum(claimed.values(), []), key=int), nodes)
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import networkx as nx
+
+from hyrun.job.graph import JobGraph
+from hyrun.job.reachability import ReachabilityIndex
+
+from .helpers import DummyJob
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    """Test the ReachabilityIndex class."""
+
+    def assert_matches(self, index, graph):
+        """Assert that the index matches networkx."""
+        for n in graph.nodes:
+            self.assertEqual(set(index.ancestors(n)), nx.ancestors(graph, n))
+            self.assertEqual(set(index.descendants(n)),
+                             nx.descendants(graph, n))
+
+    def test_random_edits(self):
+        """Test incremental updates against networkx."""
+        rng = random.Random(1)
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(30))
+        index = ReachabilityIndex(graph)
+        for _ in range(200):
+            u, v = sorted(rng.sample(range(30), 2))
+            if u not in graph or v not in graph:
+                continue
+            if graph.has_edge(u, v):
+                graph.remove_edge(u, v)
+                index.remove_edge(u, v)
+            else:
+                graph.add_edge(u, v)
+                index.add_edge(u, v)
+        self.assert_matches(index, graph)
+        for n in rng.sample(range(30), 10):
+            graph.remove_node(n)
+            index.remove_node(n)
+        self.assert_matches(index, graph)
+        graph.add_edge(100, 0)
+        index.add_edge(100, 0)
+        self.assert_matches(index, graph)
+        self.assert_matches(ReachabilityIndex(graph), graph)
+
+    def test_job_graph(self):
+        """Test JobGraph queries backed by the index."""
+        g = JobGraph(jobs=[DummyJob(n) for n in 'abcd'],
+                     dependencies=[('a', 'b'), ('b', 'c')],
+                     reachability=True)
+        self.assertEqual(g.descendants('a'), ['b', 'c'])
+        self.assertTrue(g.is_ancestor('a', 'c'))
+        g.add_edge('c', 'd')
+        self.assertEqual(set(g.ancestors('d')), {'a', 'b', 'c'})
+        g.remove_edge('a', 'b')
+        self.assertFalse(g.is_ancestor('a', 'c'))
+        g.remove_edge('b', 'c', remove_descendants=True)
+        self.assertEqual(set(g.nodes), {'a', 'b'})
+        self.assertEqual(g.descendants('b'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
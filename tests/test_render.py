@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from hyrun.job.graph import JobGraph
+
+from .helpers import DummyJob
+
+
+class TestRender(unittest.TestCase):
+    """Test headless rendering of a JobGraph."""
+
+    def setUp(self):
+        """Set up the test case."""
+        leaves = [f'leaf{i}' for i in range(100)]
+        self.g = JobGraph(jobs=[DummyJob(n) for n in ['root', *leaves]],
+                          dependencies=[('root', n) for n in leaves])
+        self.g.mark_status('root', 'COMPLETED')
+        for n in leaves[:40]:
+            self.g.mark_status(n, 'RUNNING')
+
+    def test_dot(self):
+        """Test if nodes are collapsed by layer and status."""
+        dot = self.g.render(file_format='dot')
+        self.assertIn('label="COMPLETED (1)"', dot)
+        self.assertIn('label="RUNNING (40)"', dot)
+        self.assertIn('label="- (60)"', dot)
+        self.assertEqual(dot.count('->'), 2)
+        self.assertIn('[label="60"]', dot)
+
+    def test_dot_quoting(self):
+        """Test if titles and labels follow DOT quoting rules."""
+        dot = self.g.render(file_format='dot', title='a "b" & c\\d')
+        self.assertIn('label="a \\"b\\" & c\\\\d";', dot)
+        g = JobGraph(jobs=[DummyJob('x"\\y')])
+        dot = g.render(file_format='dot', collapse=False)
+        self.assertIn('[label="x\\"\\\\y"', dot)
+
+    def test_svg(self):
+        """Test if a valid SVG is written."""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / 'graph.svg'
+            self.assertIsNone(self.g.render(filename))
+            root = ET.parse(filename).getroot()
+        rects = root.findall('.//{http://www.w3.org/2000/svg}rect')
+        self.assertEqual(len(rects), 3)
+        svg = self.g.render(collapse=False)
+        self.assertEqual(svg.count('<rect'), 101)
+        self.assertRaises(ValueError, self.g.render, file_format='png')
@@ -0,0 +1,49 @@
+import unittest
+
+from hyrun.job.requirements import (RunRequirement, RunRequirements,
+                                    compile_requirements)
+
+
+class TestRunRequirements(unittest.TestCase):
+    """Test compiled run requirements."""
+
+    def test_compile_from_dict(self):
+        """Test that dictionaries are compiled to requirements."""
+        reqs = compile_requirements([{'element': 'edge',
+                                      'property': 'weight',
+                                      'operator': '>=',
+                                      'value': 0.5}])
+        self.assertIsInstance(reqs, RunRequirements)
+        self.assertEqual(len(reqs), 1)
+        self.assertEqual(reqs.edge_requirements[0].prop, 'weight')
+        self.assertIs(compile_requirements(reqs), reqs)
+
+    def test_unsupported_operator(self):
+        """Test that unknown operators are rejected at compile time."""
+        with self.assertRaises(ValueError):
+            compile_requirements({'operator': '=~'})
+        with self.assertRaises(ValueError):
+            RunRequirement(element='graph')
+
+    def test_evaluate(self):
+        """Test evaluation on node and edge attributes."""
+        reqs = compile_requirements([
+            {'element': 'node', 'property': 'status', 'value': 'COMPLETED'},
+            {'element': 'edge', 'property': 'weight', 'operator': '>',
+             'value': 0.1}])
+        self.assertTrue(reqs.node_fulfilled({'status': 'COMPLETED'}))
+        self.assertFalse(reqs.node_fulfilled({'status': 'RUNNING'}))
+        self.assertTrue(reqs.edge_fulfilled({'status': 'COMPLETED'},
+                                            {'weight': 0.5}))
+        self.assertFalse(reqs.edge_fulfilled({'status': 'COMPLETED'},
+                                             {'weight': 0.0}))
+
+    def test_round_trip(self):
+        """Test conversion back to dictionary."""
+        d = {'element': 'node', 'property': 'db_id', 'operator': '!=',
+             'value': None}
+        self.assertEqual(RunRequirement.from_dict(d).to_dict(), d)
+
+
+if __name__ == '__main__':
+    unittest.main()
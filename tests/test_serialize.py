@@ -0,0 +1,84 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+from hyrun.job import get_workflow
+from hyrun.job.graph import JobGraph
+from hyrun.job.serialize import infer_format
+
+has_msgpack = importlib.util.find_spec('msgpack') is not None
+has_zstd = importlib.util.find_spec('zstandard') is not None
+
+
+class TestSerialize(unittest.TestCase):
+    """Test writing and reading of JobGraphs."""
+
+    def setUp(self):
+        """Set up a small graph."""
+        self.g = JobGraph(run_requirements=[{'element': 'edge',
+                                             'property': 'weight',
+                                             'operator': '>',
+                                             'value': 0.0}])
+        for i in range(4):
+            self.g.graph.add_node(f'job{i}', hash=f'job{i}', status=None,
+                                  db_id=i)
+        for i in range(3):
+            self.g.graph.add_edge(f'job{i}', f'job{i + 1}', weight=0.5 * i)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def round_trip(self, name, **kwargs):
+        """Write and read graph."""
+        filename = Path(self.tmpdir.name) / name
+        self.g.write(filename)
+        g = get_workflow(filename, **kwargs)
+        self.assertEqual(list(g.graph.nodes(data=True)),
+                         list(self.g.graph.nodes(data=True)))
+        self.assertEqual(list(g.graph.edges(data=True)),
+                         list(self.g.graph.edges(data=True)))
+        return g
+
+    def test_infer_format(self):
+        """Test format and compression from file suffix."""
+        self.assertEqual(infer_format('wf.json'), ('json', None))
+        self.assertEqual(infer_format('wf.msgpack.zst'), ('msgpack', 'zstd'))
+        self.assertEqual(infer_format('wf.jsonl.gz'), ('jsonl', 'gzip'))
+        self.assertEqual(infer_format('wf'), ('json', None))
+
+    def test_json(self):
+        """Test node-link json, plain and compressed."""
+        self.round_trip('wf.json')
+        self.round_trip('wf.json.gz')
+
+    def test_jsonl(self):
+        """Test streamed json lines keep run requirements."""
+        g = self.round_trip('wf.jsonl.gz', backend='compact')
+        self.assertEqual(g.backend, 'compact')
+        self.assertEqual(g.run_requirements, self.g.run_requirements)
+
+    @unittest.skipUnless(has_msgpack, 'msgpack not installed')
+    def test_msgpack(self):
+        """Test streamed msgpack."""
+        self.round_trip('wf.msgpack')
+        self.assertIsInstance(self.g.write(file_format='msgpack'), bytes)
+
+    @unittest.skipUnless(has_msgpack and has_zstd,
+                         'msgpack or zstandard not installed')
+    def test_msgpack_zstd(self):
+        """Test streamed msgpack with zstd compression."""
+        self.round_trip('wf.msgpack.zst')
+
+    def test_invalid_file(self):
+        """Test that foreign files are rejected."""
+        filename = Path(self.tmpdir.name) / 'wf.jsonl'
+        filename.write_text('{"nodes": []}\n')
+        with self.assertRaises(ValueError):
+            JobGraph().read(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from types import SimpleNamespace
+
+from hyrun.job.graph import JobGraph
+from hyrun.job.requirements import compile_requirements
+from hyrun.scheduler.slurm.dependency import (format_dependency,
+                                              get_dependency_type)
+from hyrun.scheduler.slurm.slurm import SlurmScheduler
+
+from .helpers import DummyJob
+
+
+class DummyRunSettings:
+    """Dummy run settings for testing."""
+
+    def get_full_file_path(self, file=None, dirname=None):
+        """Get path of file."""
+        return f'/remote/{file}'
+
+
+class DummyScriptJob(DummyJob):
+    """Dummy job with job script and run settings."""
+
+    def __init__(self, hash, status=None, job_id=None):
+        super().__init__(hash, status=status, job_id=job_id)
+        self.job_script = SimpleNamespace(name=f'{hash}.sh')
+        self.tasks = [SimpleNamespace(run_settings=DummyRunSettings())]
+
+
+class DummyConnection:
+    """Connection executing the submit script with fake job ids."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def run(self, cmd, **kwargs):
+        """Run command."""
+        self.scripts.append(cmd)
+        n = cmd.count('sbatch')
+        stdout = '\n'.join(f'{i} {1000 + i}' for i in range(n))
+        return SimpleNamespace(ok=True, stdout=stdout, stderr='')
+
+
+class TestSlurmDependency(unittest.TestCase):
+    """Test submission of JobGraphs with SLURM dependencies."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.scheduler = SlurmScheduler()
+        self.g = JobGraph(jobs=[DummyScriptJob(n) for n in 'abcd'],
+                          dependencies=[('a', 'c'), ('b', 'c'),
+                                        ('c', 'd')])
+
+    def test_dependency_type(self):
+        """Test mapping of run requirements to dependency types."""
+        for requirement, expected in [
+                ({'value': 'COMPLETED'}, 'afterok'),
+                ({'value': 'FAILED'}, 'afternotok'),
+                ({'operator': '!=', 'value': 'COMPLETED'}, 'afternotok')]:
+            self.assertEqual(get_dependency_type(
+                compile_requirements([requirement])), expected)
+        self.assertIsNone(get_dependency_type(compile_requirements([])))
+        with self.assertRaises(ValueError):
+            get_dependency_type(compile_requirements(
+                [{'property': 'db_id', 'value': 1}]))
+        with self.assertRaises(ValueError):
+            get_dependency_type(compile_requirements(
+                [{'operator': '>=', 'value': 'COMPLETED'}]))
+        self.assertEqual(format_dependency('afterok', [1, 2]),
+                         'afterok:1:2')
+
+    def test_submit_cmd(self):
+        """Test if the dependency is passed to sbatch."""
+        cmd = self.scheduler.get_submit_cmd(DummyScriptJob('a'),
+                                            dependency='afterok:1')
+        self.assertEqual(cmd, 'sbatch --dependency=afterok:1 '
+                         '--kill-on-invalid-dep=yes /remote/a.sh')
+        cmd = self.scheduler.get_submit_cmd(DummyScriptJob('a'), nice=10)
+        self.assertEqual(cmd, 'sbatch --nice=10 /remote/a.sh')
+
+    def test_submit_graph(self):
+        """Test if the whole graph is submitted at once."""
+        connection = DummyConnection()
+        job_ids = self.scheduler.submit_graph(self.g, connection=connection)
+        self.assertEqual(len(connection.scripts), 1)
+        script = connection.scripts[0]
+        self.assertIn('--dependency=afterok:$job0:$job1', script)
+        self.assertIn('--dependency=afterok:$job2', script)
+        # jobs off the critical path are nice to the others
+        self.assertNotIn('--nice', script.splitlines()[1])
+        self.assertIn('--nice=5000 ', script)
+        self.assertIn('--nice=10000 ', script)
+        self.assertEqual(job_ids, {'a': 1000, 'b': 1001, 'c': 1002,
+                                   'd': 1003})
+        self.assertEqual(self.g.lookup('job_id', 1002), 'c')
+        self.assertEqual(self.g.graph.nodes['d']['status'], 'SUBMITTED')
+
+    def test_submit_partial_graph(self):
+        """Test resubmission with finished and running parents."""
+        self.g.update_node_attrs('a', status='COMPLETED')
+        self.g.update_node_attrs('b', status='RUNNING', job_id=42)
+        script, submitted = self.scheduler.get_graph_submit_script(self.g)
+        self.assertEqual(submitted, ['c', 'd'])
+        self.assertIn('--dependency=afterok:42 ', script)
+        self.g.update_node_attrs('b', status='FAILED')
+        script, submitted = self.scheduler.get_graph_submit_script(self.g)
+        self.assertEqual(submitted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()